@@ -4,16 +4,65 @@ Native requests backend is default; aria2 backend is optional.
 """
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Deque, List, Optional, Tuple
 import os
 import shutil
 import subprocess
+import threading
 import time
 import requests
 
 from ..models.download_job import DownloadJob
+from ..utils.file_utils import atomic_finalize, partial_download_path
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+FADVISE_WINDOW = 64 << 20
+SEGMENTED_MIN_SIZE = 16 << 20
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _set_progress(job: DownloadJob) -> None:
+    progress = (job.downloaded_bytes * 100) // job.total_bytes if job.total_bytes > 0 else 0
+    if progress != job.progress:
+        job.progress = progress
+
+
+def _update_rates(job: DownloadJob, elapsed: float) -> None:
+    if job.total_bytes > 0:
+        _set_progress(job)
+    if elapsed > 0:
+        job.speed_kbps = (job.downloaded_bytes / 1024) / elapsed
+
+
+def _preallocate(fd: int, size: int) -> bool:
+    """Reserve the full file size up front; returns False if nothing was reserved."""
+    try:
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(fd, 0, size)
+        else:
+            os.ftruncate(fd, size)
+        return True
+    except OSError:
+        return False
+
+
+def _drop_cached_pages(fd: int, length: int) -> None:
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, 0, length, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
 
 
 @dataclass
@@ -29,6 +78,9 @@ class DownloadBackend:
     def is_available(self) -> bool:
         return True
 
+    def refresh(self) -> None:
+        """Drop any cached availability state."""
+
     def download(
         self,
         job: DownloadJob,
@@ -36,6 +88,8 @@ class DownloadBackend:
         emit_progress: Callable[[DownloadJob], None],
         is_cancelled: Callable[[], bool],
         is_paused: Callable[[], bool],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        segments: int = 1,
     ) -> DownloadBackendResult:
         raise NotImplementedError
 
@@ -43,6 +97,9 @@ class DownloadBackend:
 class NativeRequestsBackend(DownloadBackend):
     name = "native"
 
+    def __init__(self, session: Optional[requests.Session] = None):
+        self._session = session or requests.Session()
+
     def download(
         self,
         job: DownloadJob,
@@ -50,16 +107,48 @@ class NativeRequestsBackend(DownloadBackend):
         emit_progress: Callable[[DownloadJob], None],
         is_cancelled: Callable[[], bool],
         is_paused: Callable[[], bool],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        segments: int = 1,
     ) -> DownloadBackendResult:
         output_path = Path(job.output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
+        part_path = partial_download_path(output_path)
+
+        result = self._download_into(
+            part_path, job, url, emit_progress, is_cancelled, is_paused, chunk_size, segments
+        )
+        if result.completed:
+            atomic_finalize(part_path, output_path)
+        return result
 
-        downloaded_bytes = output_path.stat().st_size if output_path.exists() else 0
-        headers = {}
+    def _download_into(
+        self,
+        output_path: Path,
+        job: DownloadJob,
+        url: str,
+        emit_progress: Callable[[DownloadJob], None],
+        is_cancelled: Callable[[], bool],
+        is_paused: Callable[[], bool],
+        chunk_size: int,
+        segments: int,
+    ) -> DownloadBackendResult:
+        try:
+            downloaded_bytes = os.stat(output_path).st_size
+        except OSError:
+            downloaded_bytes = 0
+        if downloaded_bytes == 0 and segments > 1:
+            result = self._download_segmented(
+                output_path, job, url, emit_progress, is_cancelled, is_paused, chunk_size, segments
+            )
+            if result is not None:
+                return result
+
+        # Ask for the bytes as stored so Content-Length matches what we write.
+        headers = {"Accept-Encoding": "identity"}
         if downloaded_bytes > 0:
             headers["Range"] = f"bytes={downloaded_bytes}-"
 
-        with requests.get(url, stream=True, headers=headers, timeout=30) as response:
+        with self._session.get(url, stream=True, headers=headers, timeout=30) as response:
             response.raise_for_status()
 
             if "Content-Length" in response.headers:
@@ -68,13 +157,26 @@ class NativeRequestsBackend(DownloadBackend):
             else:
                 job.total_bytes = 0
 
+            # Read straight from the socket; only decode if the server compressed anyway.
+            encoding = response.headers.get("Content-Encoding", "").strip().lower()
+            response.raw.decode_content = encoding not in ("", "identity")
+
             job.downloaded_bytes = downloaded_bytes
-            mode = "ab" if downloaded_bytes > 0 else "wb"
-            start_time = time.time()
+            flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if downloaded_bytes > 0 else os.O_TRUNC)
+            flags |= getattr(os, "O_BINARY", 0)
+            start_time = time.monotonic()
             last_update = start_time
+            bytes_since_advise = 0
+
+            # Chunks are already large, so write them with raw syscalls.
+            fd = os.open(str(output_path), flags, 0o644)
+            preallocated = downloaded_bytes == 0 and job.total_bytes > 0 and _preallocate(fd, job.total_bytes)
+            try:
+                while True:
+                    chunk = response.raw.read(chunk_size)
+                    if not chunk:
+                        break
 
-            with open(output_path, mode) as f:
-                for chunk in response.iter_content(chunk_size=8192):
                     if is_cancelled():
                         return DownloadBackendResult(completed=False)
 
@@ -83,28 +185,162 @@ class NativeRequestsBackend(DownloadBackend):
                         if is_cancelled():
                             return DownloadBackendResult(completed=False)
 
-                    if chunk:
-                        f.write(chunk)
+                    _write_all(fd, chunk)
+                    job.downloaded_bytes += len(chunk)
+                    bytes_since_advise += len(chunk)
+                    if bytes_since_advise >= FADVISE_WINDOW:
+                        # Written data is never re-read; let the kernel drop it from the page cache.
+                        _drop_cached_pages(fd, job.downloaded_bytes)
+                        bytes_since_advise = 0
+
+                    now = time.monotonic()
+                    if now - last_update >= 0.5:
+                        _update_rates(job, now - start_time)
+                        emit_progress(job)
+                        last_update = now
+            finally:
+                if preallocated and job.downloaded_bytes < job.total_bytes:
+                    # Drop the reserved tail so resume starts from the real end of data.
+                    try:
+                        os.ftruncate(fd, job.downloaded_bytes)
+                    except OSError:
+                        pass
+                os.close(fd)
+            _update_rates(job, time.monotonic() - start_time)
+
+        return DownloadBackendResult(completed=True)
+
+    def _probe_ranges(self, url: str) -> Tuple[str, int]:
+        """Return (final_url, size) when the server supports byte ranges, else size 0."""
+        try:
+            with self._session.head(
+                url,
+                allow_redirects=True,
+                headers={"Accept-Encoding": "identity"},
+                timeout=30,
+            ) as response:
+                if response.status_code >= 400:
+                    return url, 0
+                if response.headers.get("Accept-Ranges", "").strip().lower() != "bytes":
+                    return url, 0
+                if response.headers.get("Content-Encoding", "").strip().lower() not in ("", "identity"):
+                    return url, 0
+                return response.url or url, int(response.headers.get("Content-Length", 0) or 0)
+        except (requests.RequestException, ValueError):
+            return url, 0
+
+    def _download_segmented(
+        self,
+        output_path: Path,
+        job: DownloadJob,
+        url: str,
+        emit_progress: Callable[[DownloadJob], None],
+        is_cancelled: Callable[[], bool],
+        is_paused: Callable[[], bool],
+        chunk_size: int,
+        segments: int,
+    ) -> Optional[DownloadBackendResult]:
+        """
+        Fetch disjoint byte ranges over parallel connections into one file.
+        Returns None when the server cannot serve ranges so the caller falls
+        back to the single-stream path.
+        """
+        if not hasattr(os, "pwrite"):
+            return None
+        final_url, size = self._probe_ranges(url)
+        if size < SEGMENTED_MIN_SIZE:
+            return None
+
+        part = -(-size // segments)
+        bounds = [(start, min(size, start + part) - 1) for start in range(0, size, part)]
+        written: List[int] = [0] * len(bounds)
+        lock = threading.Lock()
+        stop = threading.Event()
+        range_refused = threading.Event()
+
+        def fetch(index: int) -> None:
+            first, last = bounds[index]
+            headers = {"Accept-Encoding": "identity", "Range": f"bytes={first}-{last}"}
+            with self._session.get(final_url, stream=True, headers=headers, timeout=30) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    range_refused.set()
+                    stop.set()
+                    return
+                offset = first + written[index]
+                while offset <= last and not stop.is_set():
+                    while is_paused() and not stop.is_set():
+                        time.sleep(0.1)
+                    chunk = response.raw.read(min(chunk_size, last - offset + 1))
+                    if not chunk:
+                        raise IOError(f"Connection closed at byte {offset} of segment {first}-{last}")
+                    view = memoryview(chunk)
+                    while view:
+                        count = os.pwrite(fd, view, offset)
+                        view = view[count:]
+                        offset += count
+                    with lock:
+                        written[index] += len(chunk)
                         job.downloaded_bytes += len(chunk)
-                        if job.total_bytes > 0:
-                            job.progress = int((job.downloaded_bytes / job.total_bytes) * 100)
-                        elapsed = time.time() - start_time
-                        if elapsed > 0:
-                            job.speed_kbps = (job.downloaded_bytes / 1024) / elapsed
 
-                        now = time.time()
-                        if now - last_update >= 0.5:
-                            emit_progress(job)
-                            last_update = now
+        job.total_bytes = size
+        job.downloaded_bytes = 0
+        start_time = time.monotonic()
+        fd = os.open(str(output_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+        complete = False
+        try:
+            if not _preallocate(fd, size):
+                os.ftruncate(fd, size)
+            with ThreadPoolExecutor(max_workers=len(bounds), thread_name_prefix="dl-seg") as pool:
+                futures = [pool.submit(fetch, i) for i in range(len(bounds))]
+                while not all(f.done() for f in futures):
+                    if is_cancelled() or any(f.done() and f.exception() for f in futures):
+                        stop.set()
+                    time.sleep(0.5)
+                    _update_rates(job, time.monotonic() - start_time)
+                    emit_progress(job)
+                errors = [f.exception() for f in futures if f.exception() is not None]
+            if range_refused.is_set():
+                os.ftruncate(fd, 0)
+                job.downloaded_bytes = 0
+                return None
+            if is_cancelled():
+                return DownloadBackendResult(completed=False)
+            if errors:
+                raise errors[0]
+            complete = True
+        finally:
+            if not complete:
+                # Keep only the contiguous prefix so a later resume stays correct.
+                prefix = 0
+                for (first, last), count in zip(bounds, written):
+                    prefix += count
+                    if count < last - first + 1:
+                        break
+                try:
+                    os.ftruncate(fd, prefix)
+                except OSError:
+                    pass
+            os.close(fd)
 
+        _update_rates(job, time.monotonic() - start_time)
         return DownloadBackendResult(completed=True)
 
 
 class Aria2Backend(DownloadBackend):
     name = "aria2"
 
+    def __init__(self):
+        self._available: Optional[bool] = None
+
     def is_available(self) -> bool:
-        return shutil.which("aria2c") is not None
+        if self._available is None:
+            self._available = shutil.which("aria2c") is not None
+        return self._available
+
+    def refresh(self) -> None:
+        """Forget the cached PATH lookup, e.g. after aria2 was installed."""
+        self._available = None
 
     def download(
         self,
@@ -113,12 +349,15 @@ class Aria2Backend(DownloadBackend):
         emit_progress: Callable[[DownloadJob], None],
         is_cancelled: Callable[[], bool],
         is_paused: Callable[[], bool],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        segments: int = 1,
     ) -> DownloadBackendResult:
         if not self.is_available():
             return DownloadBackendResult(completed=False, error="aria2c not found")
 
-        output_path = Path(job.output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        final_path = Path(job.output_path)
+        final_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path = partial_download_path(final_path)
         cmd = [
             "aria2c",
             "--allow-overwrite=true",
@@ -134,10 +373,15 @@ class Aria2Backend(DownloadBackend):
         ]
 
         proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
-        start = time.time()
+        # Drain stderr continuously so a chatty aria2 never blocks on a full pipe.
+        stderr_tail: Deque[bytes] = deque(maxlen=200)
+        drain = threading.Thread(target=self._drain, args=(proc.stderr, stderr_tail), daemon=True)
+        drain.start()
+        start = time.monotonic()
         last_size = 0
         last_tick = start
         warned_pause = False
+        delay = 0.25
 
         try:
             while proc.poll() is None:
@@ -150,29 +394,50 @@ class Aria2Backend(DownloadBackend):
                     emit_progress(job)
                     warned_pause = True
 
+                delta = 0
                 if output_path.exists():
                     size = output_path.stat().st_size
                     job.downloaded_bytes = size
                     if job.total_bytes and job.total_bytes > 0:
-                        job.progress = int((size / job.total_bytes) * 100)
-                    now = time.time()
+                        _set_progress(job)
+                    now = time.monotonic()
                     dt = max(0.001, now - last_tick)
                     delta = max(0, size - last_size)
                     job.speed_kbps = (delta / 1024) / dt
                     last_size = size
                     last_tick = now
                     emit_progress(job)
-                time.sleep(0.5)
+
+                # Poll less often while the file is not growing; wake as soon as aria2 exits.
+                delay = min(1.0, max(0.25, delay * 1.25 if delta == 0 else delay * 0.8))
+                try:
+                    proc.wait(timeout=delay)
+                except subprocess.TimeoutExpired:
+                    pass
 
             if proc.returncode != 0:
-                stderr = proc.stderr.read().decode("utf-8", errors="ignore") if proc.stderr else ""
-                return DownloadBackendResult(completed=False, error=f"aria2 failed ({proc.returncode}): {stderr[:300]}")
+                drain.join(timeout=1.0)
+                stderr = b"".join(stderr_tail).decode("utf-8", errors="ignore").strip()
+                return DownloadBackendResult(completed=False, error=f"aria2 failed ({proc.returncode}): {stderr[-300:]}")
 
-            if output_path.exists():
-                job.downloaded_bytes = output_path.stat().st_size
+            try:
+                job.downloaded_bytes = os.stat(output_path).st_size
                 job.progress = 100
+            except OSError:
+                pass
+            atomic_finalize(output_path, final_path)
             emit_progress(job)
             return DownloadBackendResult(completed=True)
         finally:
             if proc.poll() is None:
                 proc.terminate()
+
+    @staticmethod
+    def _drain(stream, tail: Deque[bytes]) -> None:
+        if stream is None:
+            return
+        try:
+            for line in iter(stream.readline, b""):
+                tail.append(line)
+        finally:
+            stream.close()
@@ -5,15 +5,55 @@ Manages concurrent downloads with pause/resume/cancel and event-driven updates
 import threading
 import time
 import os
+import re
+from dataclasses import replace
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
 
 from ..models.download_job import DownloadJob, JobStatus
+from ..utils.file_utils import partial_download_path
 from .event_bus import EventBus, Events
-from .download_backends import NativeRequestsBackend, Aria2Backend
+from .download_backends import DEFAULT_CHUNK_SIZE, NativeRequestsBackend, Aria2Backend
 from .request_context import SessionContext, get_session, set_session
 
+_TERMINAL_STATUSES = frozenset({JobStatus.COMPLETED, JobStatus.ERROR, JobStatus.CANCELLED})
+
+
+class ResizableSemaphore:
+    """Counting semaphore whose limit can change while slots are held."""
+
+    def __init__(self, limit: int):
+        self._limit = max(1, int(limit))
+        self._count = 0
+        self._cond = threading.Condition(threading.Lock())
+
+    def acquire(self):
+        with self._cond:
+            while self._count >= self._limit:
+                self._cond.wait()
+            self._count += 1
+
+    def release(self):
+        with self._cond:
+            self._count -= 1
+            self._cond.notify()
+
+    def resize(self, limit: int):
+        with self._cond:
+            self._limit = max(1, int(limit))
+            self._cond.notify_all()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
 
 class DownloadManager:
     """Manages download queue with concurrency control"""
@@ -24,14 +64,29 @@ class DownloadManager:
         self.max_concurrent = max_concurrent
         self.settings = settings
         
+        # Copy-on-write: writers swap in a new dict under _lock, readers never lock.
         self.jobs: Dict[str, DownloadJob] = {}
-        self._lock = threading.RLock()
-        self._semaphore = threading.Semaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._semaphore = ResizableSemaphore(max_concurrent)
+        # Persistent workers; the semaphore still enforces the live concurrency limit.
+        self._executor_size = max(1, int(max_concurrent))
+        self._executor = ThreadPoolExecutor(max_workers=self._executor_size, thread_name_prefix="dl-")
+        # Shared across jobs so keep-alive connections are reused.
+        self._session = requests.Session()
         self._backends = {
-            "native": NativeRequestsBackend(),
+            "native": NativeRequestsBackend(session=self._session),
             "aria2": Aria2Backend(),
         }
         self._selected_backend = self._detect_selected_backend()
+
+        # Latest-wins progress slots drained by one emitter thread, so download
+        # threads never block on subscriber work.
+        self._progress_slots: Dict[str, DownloadJob] = {}
+        self._progress_lock = threading.Lock()
+        self._progress_ready = threading.Event()
+        self._progress_stop = False
+        self._progress_thread = threading.Thread(target=self._progress_emitter, name="dl-progress", daemon=True)
+        self._progress_thread.start()
     
     def queue_download(
         self,
@@ -63,26 +118,18 @@ class DownloadManager:
         )
         
         with self._lock:
-            self.jobs[job_id] = job
+            self.jobs = {**self.jobs, job_id: job}
         
         self.event_bus.emit(Events.DOWNLOAD_QUEUED, {"job": job})
 
         # Propagate request context into background download thread so per-profile
         # RealDebrid tokens and settings remain isolated.
-        ctx = get_session()
-        ctx_snapshot = SessionContext(
-            user_id=ctx.user_id,
-            username=ctx.username,
-            role=ctx.role or "user",
-            profile_id=ctx.profile_id,
-        )
+        # SessionContext is frozen, so the current one can be shared as-is.
+        ctx_snapshot = get_session()
+        if not ctx_snapshot.role:
+            ctx_snapshot = replace(ctx_snapshot, role="user")
 
-        # Start download in background thread
-        threading.Thread(
-            target=self._process_job,
-            args=(job, ctx_snapshot),
-            daemon=True
-        ).start()
+        self._executor.submit(self._process_job, job, ctx_snapshot)
 	        
         return job
 	    
@@ -91,11 +138,24 @@ class DownloadManager:
         if ctx_snapshot is not None:
             set_session(ctx_snapshot)
         with self._semaphore:
+            if job.is_cancelled:
+                # Cancelled (e.g. by shutdown) while waiting for a slot; its event was emitted then.
+                return
             try:
+                last_status = {"message": None, "at": 0.0}
+
                 def _status_update(message: str):
+                    # Skip repeats of the same message within a second.
+                    now = time.monotonic()
+                    if message == last_status["message"] and now - last_status["at"] < 1.0:
+                        return
+                    last_status["message"] = message
+                    last_status["at"] = now
                     job.status_detail = message
                     self.event_bus.emit(Events.DOWNLOAD_PROGRESS, {"job": job})
 
+                poll_schedule = self._rd_poll_schedule()
+
                 # Resolve magnet if needed
                 if job.magnet:
                     if not self.rd_client.is_authenticated():
@@ -104,7 +164,11 @@ class DownloadManager:
                     job.status_detail = "Preparing magnet..."
                     self.event_bus.emit(Events.DOWNLOAD_STARTED, {"job": job})
                     
-                    urls = self.rd_client.resolve_magnet(job.magnet, status_callback=_status_update)
+                    urls = self.rd_client.resolve_magnet(
+                        job.magnet,
+                        status_callback=_status_update,
+                        poll_schedule=poll_schedule,
+                    )
                     if not urls:
                         raise Exception("Failed to resolve magnet link")
                     
@@ -120,7 +184,11 @@ class DownloadManager:
                     job.status = JobStatus.RESOLVING
                     job.status_detail = "Preparing torrent..."
                     self.event_bus.emit(Events.DOWNLOAD_STARTED, {"job": job})
-                    urls = self.rd_client.resolve_torrent_url(direct_url, status_callback=_status_update)
+                    urls = self.rd_client.resolve_torrent_url(
+                        direct_url,
+                        status_callback=_status_update,
+                        poll_schedule=poll_schedule,
+                    )
                     if not urls:
                         raise Exception("Failed to resolve torrent link")
                     direct_url = urls[0] if isinstance(urls, list) else urls
@@ -137,6 +205,7 @@ class DownloadManager:
                     job.status = JobStatus.COMPLETED
                     job.status_detail = ""
                     job.end_time = time.time()
+                    self._drop_progress(job)
                     self.event_bus.emit(Events.DOWNLOAD_COMPLETED, {"job": job})
             
             except Exception as e:
@@ -144,19 +213,19 @@ class DownloadManager:
                 job.error = str(e)
                 job.status_detail = ""
                 job.end_time = time.time()
+                self._drop_progress(job)
                 self.event_bus.emit(Events.DOWNLOAD_ERROR, {
                     "job": job,
                     "error": str(e)
                 })
 
+    _TORRENT_RE = re.compile(
+        r"\.torrent(?:$|\?)|/dl\.php\?t=|download\.php\?id=|viewtopic\.php\?t=",
+        re.IGNORECASE,
+    )
+
     def _is_torrent_reference(self, url: str) -> bool:
-        low = (url or "").lower()
-        return (
-            low.endswith(".torrent")
-            or "/dl.php?t=" in low
-            or "download.php?id=" in low
-            or "viewtopic.php?t=" in low
-        )
+        return bool(url and self._TORRENT_RE.search(url))
     
     def _detect_selected_backend(self) -> str:
         selected = "native"
@@ -171,12 +240,70 @@ class DownloadManager:
         if name not in self._backends:
             name = "native"
         self._selected_backend = name
+        self._backends[name].refresh()
         if self.settings is not None:
             self.settings.set("download_backend", name)
 
     def get_download_backend(self) -> str:
         return self._selected_backend
 
+    def _queue_progress(self, job: DownloadJob):
+        with self._progress_lock:
+            self._progress_slots[job.job_id] = job
+        self._progress_ready.set()
+
+    def _drop_progress(self, job: DownloadJob):
+        """Discard the job's pending progress before its terminal event is emitted."""
+        # A batch already taken by the emitter re-checks the status per job, so it skips
+        # this one once the terminal status is set.
+        with self._progress_lock:
+            self._progress_slots.pop(job.job_id, None)
+
+    def _progress_emitter(self):
+        # No lock is held while subscribers run: they may cancel jobs, which drops progress.
+        while True:
+            self._progress_ready.wait()
+            if self._progress_stop:
+                return
+            with self._progress_lock:
+                pending = self._progress_slots
+                self._progress_slots = {}
+                self._progress_ready.clear()
+            for job in pending.values():
+                if job.status in _TERMINAL_STATUSES:
+                    continue
+                self.event_bus.emit(Events.DOWNLOAD_PROGRESS, {"job": job})
+
+    def _rd_poll_schedule(self) -> Optional[List[float]]:
+        if self.settings is None:
+            return None
+        raw = self.settings.get("rd_poll_schedule_seconds")
+        if not isinstance(raw, (list, tuple)):
+            return None
+        try:
+            schedule = [float(v) for v in raw if float(v) > 0]
+        except (TypeError, ValueError):
+            return None
+        return schedule or None
+
+    def _download_chunk_size(self) -> int:
+        if self.settings is None:
+            return DEFAULT_CHUNK_SIZE
+        try:
+            size = int(self.settings.get("download_chunk_size", DEFAULT_CHUNK_SIZE) or DEFAULT_CHUNK_SIZE)
+        except (TypeError, ValueError):
+            return DEFAULT_CHUNK_SIZE
+        return max(64 * 1024, size)
+
+    def _download_segments(self) -> int:
+        if self.settings is None:
+            return 1
+        try:
+            segments = int(self.settings.get("download_segments", 1) or 1)
+        except (TypeError, ValueError):
+            return 1
+        return max(1, min(16, segments))
+
     def _download_file(self, job: DownloadJob, url: str):
         """
         Download file via configured backend.
@@ -193,39 +320,39 @@ class DownloadManager:
         result = backend.download(
             job=job,
             url=url,
-            emit_progress=lambda j: self.event_bus.emit(Events.DOWNLOAD_PROGRESS, {"job": j}),
+            emit_progress=self._queue_progress,
             is_cancelled=lambda: job.is_cancelled,
             is_paused=lambda: job.is_paused,
+            chunk_size=self._download_chunk_size(),
+            segments=self._download_segments(),
         )
         if not result.completed and result.error:
             raise Exception(result.error)
     
     def pause_download(self, job_id: str):
         """Pause a download"""
-        with self._lock:
-            if job_id in self.jobs:
-                job = self.jobs[job_id]
-                job.pause()
-                job.status_detail = ""
-                self.event_bus.emit(Events.DOWNLOAD_PAUSED, {"job": job})
+        job = self.jobs.get(job_id)
+        if job:
+            job.pause()
+            job.status_detail = ""
+            self.event_bus.emit(Events.DOWNLOAD_PAUSED, {"job": job})
     
     def resume_download(self, job_id: str):
         """Resume a paused download"""
-        with self._lock:
-            if job_id in self.jobs:
-                job = self.jobs[job_id]
-                job.resume()
-                job.status_detail = ""
-                self.event_bus.emit(Events.DOWNLOAD_RESUMED, {"job": job})
+        job = self.jobs.get(job_id)
+        if job:
+            job.resume()
+            job.status_detail = ""
+            self.event_bus.emit(Events.DOWNLOAD_RESUMED, {"job": job})
     
     def cancel_download(self, job_id: str):
         """Cancel a download"""
-        with self._lock:
-            if job_id in self.jobs:
-                job = self.jobs[job_id]
-                job.cancel()
-                job.status_detail = ""
-                self.event_bus.emit(Events.DOWNLOAD_CANCELLED, {"job": job})
+        job = self.jobs.get(job_id)
+        if job:
+            job.cancel()
+            job.status_detail = ""
+            self._drop_progress(job)
+            self.event_bus.emit(Events.DOWNLOAD_CANCELLED, {"job": job})
 
     def delete_download(self, job_id: str, delete_file: bool = False):
         """Delete a job from the manager, optionally deleting its file."""
@@ -233,44 +360,59 @@ class DownloadManager:
             job = self.jobs.get(job_id)
             if not job:
                 return
-            if delete_file:
+            remaining = dict(self.jobs)
+            del remaining[job_id]
+            self.jobs = remaining
+        if delete_file:
+            for path in (Path(job.output_path), partial_download_path(job.output_path)):
                 try:
-                    path = Path(job.output_path)
                     if path.exists() and path.is_file():
                         os.remove(path)
                 except Exception:
                     pass
-            del self.jobs[job_id]
-            self.event_bus.emit(Events.DOWNLOAD_DELETED, {"job_id": job_id, "job": job})
+        self.event_bus.emit(Events.DOWNLOAD_DELETED, {"job_id": job_id, "job": job})
 
     def retry_download(self, job_id: str) -> Optional[DownloadJob]:
         """Retry a failed/cancelled job by queueing a new one with same payload."""
-        with self._lock:
-            job = self.jobs.get(job_id)
-            if not job:
-                return None
-            if job.status not in {JobStatus.ERROR, JobStatus.CANCELLED}:
-                return None
-            return self.queue_download(
-                title=f"{job.title} (retry)",
-                output_path=Path(job.output_path),
-                magnet=job.magnet,
-                direct_url=job.direct_url,
-            )
+        job = self.jobs.get(job_id)
+        if not job:
+            return None
+        if job.status not in {JobStatus.ERROR, JobStatus.CANCELLED}:
+            return None
+        return self.queue_download(
+            title=f"{job.title} (retry)",
+            output_path=Path(job.output_path),
+            magnet=job.magnet,
+            direct_url=job.direct_url,
+        )
     
     def get_job(self, job_id: str) -> Optional[DownloadJob]:
         """Get a job by ID"""
-        with self._lock:
-            return self.jobs.get(job_id)
+        return self.jobs.get(job_id)
     
     def get_all_jobs(self) -> Dict[str, DownloadJob]:
-        """Get all jobs"""
-        with self._lock:
-            return self.jobs.copy()
+        """Get all jobs (a shared snapshot; treat as read-only)"""
+        return self.jobs
     
     def set_max_concurrent(self, max_concurrent: int):
         """Update max concurrent downloads"""
         self.max_concurrent = max_concurrent
-        # Note: Changing semaphore value at runtime is complex,
-        # this will take effect for new downloads
-        self._semaphore = threading.Semaphore(max_concurrent)
+        # Running jobs keep their slots; new jobs wait until the count drops below the limit.
+        self._semaphore.resize(max_concurrent)
+        if max_concurrent > self._executor_size:
+            # Executors cannot grow; hand new work to a larger pool and let the old one drain.
+            old = self._executor
+            self._executor_size = int(max_concurrent)
+            self._executor = ThreadPoolExecutor(max_workers=self._executor_size, thread_name_prefix="dl-")
+            old.shutdown(wait=False)
+
+    def shutdown(self, wait: bool = False):
+        """Stop accepting work, cancel unfinished jobs and release the worker pool."""
+        # Queued jobs whose futures are dropped below never reach _process_job, so every
+        # unfinished job goes through cancel_download to get its status and event.
+        for job_id, job in self.jobs.items():
+            if job.status not in _TERMINAL_STATUSES:
+                self.cancel_download(job_id)
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._progress_stop = True
+        self._progress_ready.set()
@@ -2,46 +2,55 @@
 Event Bus - Central event dispatching system
 Provides decoupled communication between components
 """
-from typing import Callable, Dict, List
+from typing import Callable, Dict, Tuple
+import logging
 import threading
 
+logger = logging.getLogger(__name__)
+
 
 class EventBus:
     """Thread-safe event bus for component communication"""
     
     def __init__(self):
-        self._subscribers: Dict[str, List[Callable]] = {}
-        self._lock = threading.RLock()
+        # Copy-on-write: writers swap in a new dict, so emit never needs the lock.
+        self._subscribers: Dict[str, Tuple[Callable, ...]] = {}
+        self._lock = threading.Lock()
     
     def subscribe(self, event_type: str, callback: Callable):
         """Subscribe to an event type"""
         with self._lock:
-            if event_type not in self._subscribers:
-                self._subscribers[event_type] = []
-            if callback not in self._subscribers[event_type]:
-                self._subscribers[event_type].append(callback)
+            current = self._subscribers.get(event_type, ())
+            if callback not in current:
+                self._subscribers = {**self._subscribers, event_type: current + (callback,)}
     
     def unsubscribe(self, event_type: str, callback: Callable):
         """Unsubscribe from an event type"""
         with self._lock:
-            if event_type in self._subscribers:
-                if callback in self._subscribers[event_type]:
-                    self._subscribers[event_type].remove(callback)
+            current = self._subscribers.get(event_type, ())
+            if callback in current:
+                remaining = tuple(cb for cb in current if cb != callback)
+                subscribers = dict(self._subscribers)
+                if remaining:
+                    subscribers[event_type] = remaining
+                else:
+                    subscribers.pop(event_type, None)
+                self._subscribers = subscribers
     
     def emit(self, event_type: str, data=None):
         """Emit an event to all subscribers"""
-        with self._lock:
-            if event_type in self._subscribers:
-                for callback in self._subscribers[event_type][:]:
-                    try:
-                        callback(data)
-                    except Exception as e:
-                        print(f"Error in event handler for {event_type}: {e}")
+        subscribers = self._subscribers.get(event_type)
+        if subscribers:
+            for callback in subscribers:
+                try:
+                    callback(data)
+                except Exception:
+                    logger.exception("Error in event handler for %s", event_type)
     
     def clear(self):
         """Clear all subscriptions"""
         with self._lock:
-            self._subscribers.clear()
+            self._subscribers = {}
 
 
 # Event types
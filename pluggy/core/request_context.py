@@ -9,7 +9,7 @@ from __future__ import annotations
 
 from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Mapping, Optional
 
 
 @dataclass(frozen=True)
@@ -21,8 +21,8 @@ class SessionContext:
 
 
 current_session: ContextVar[SessionContext] = ContextVar("pluggy_current_session", default=SessionContext())
-profile_settings_cache: ContextVar[Optional[Dict[str, Any]]] = ContextVar("pluggy_profile_settings_cache", default=None)
-user_settings_cache: ContextVar[Optional[Dict[str, Any]]] = ContextVar("pluggy_user_settings_cache", default=None)
+profile_settings_cache: ContextVar[Optional[Mapping[str, Any]]] = ContextVar("pluggy_profile_settings_cache", default=None)
+user_settings_cache: ContextVar[Optional[Mapping[str, Any]]] = ContextVar("pluggy_user_settings_cache", default=None)
 
 
 def set_session(ctx: SessionContext) -> None:
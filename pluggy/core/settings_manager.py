@@ -2,14 +2,83 @@
 Settings Manager
 Handles persistent application settings in user home directory
 """
+import atexit
+import copy
+import functools
 import json
+import logging
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
 import threading
+import weakref
+from collections import defaultdict
 
 from .request_context import get_profile_id, get_user_id, profile_settings_cache, user_settings_cache
 
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json produces the same document
+    orjson = None
+
+if orjson is not None:
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+
+    _loads = orjson.loads
+else:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=True).encode('utf-8')
+
+    _loads = json.loads
+
+_MISSING = object()
+
+
+def _detached(value: Any) -> Any:
+    """Copy list/dict values so stored settings are never shared with callers.
+
+    Otherwise editing a get() result in place would already equal the stored value and
+    the following set() would be skipped as a no-op.
+    """
+    return copy.deepcopy(value) if isinstance(value, (list, dict)) else value
+
+
+# Managers with possibly unflushed writes. Weak so an exit hook never keeps one alive.
+_live_managers: "weakref.WeakSet[SettingsManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_managers() -> None:
+    for manager in list(_live_managers):
+        manager.flush()
+
+
+def _flush_if_alive(ref: "weakref.ref[SettingsManager]") -> None:
+    manager = ref()
+    if manager is not None:
+        manager.flush()
+
+
+_SUHR_HTTPS = "https://suhr.ir/"
+_SUHR_HTTP = "http://suhr.ir/"
+
+
+@functools.lru_cache(maxsize=256)
+def _rewrite_suhr(text: str) -> str:
+    # suhr.ir OD works reliably over HTTP; normalize legacy HTTPS seeds.
+    if text.startswith(_SUHR_HTTPS) or text[:len(_SUHR_HTTPS)].lower() == _SUHR_HTTPS:
+        return _SUHR_HTTP + text[len(_SUHR_HTTPS):]
+    return text
+
+
+@functools.lru_cache(maxsize=64)
+def _expand_path_str(text: str) -> str:
+    return str(Path(text).expanduser())
+
 
 class SettingsManager:
     """Manages application settings with persistence"""
@@ -18,33 +87,33 @@ class SettingsManager:
     def _default_download_folder() -> Path:
         return Path.home() / "Downloads"
 
-    REQUIRED_HTTP_SOURCE_TEMPLATES = [
+    REQUIRED_HTTP_SOURCE_TEMPLATES = (
         "http://palined.com/search/?q={query}",
         "https://nmac.to/?s={query}",
         "https://macked.app/?s={query}",
         "https://vstorrent.org/?s={query}",
         "https://audioz.download/?s={query}",
-    ]
-    REQUIRED_HTTP_DISCOVERY_ENGINES = [
+    )
+    REQUIRED_HTTP_DISCOVERY_ENGINES = (
         "https://duckduckgo.com/html/?q={query}",
         "https://html.duckduckgo.com/html/?q={query}",
         "https://www.startpage.com/sp/search?query={query}",
         "https://searx.be/search?q={query}",
-    ]
+    )
 
-    REQUIRED_PIRATEBAY_MIRRORS = [
+    REQUIRED_PIRATEBAY_MIRRORS = (
         "https://www.piratebay.org",
         "https://tpb.party",
         "https://thepiratebay.zone",
         "https://pirateproxylive.org",
         "https://thepiratebay.org",
-    ]
+    )
 
-    REQUIRED_PIRATEBAY_APIS = [
+    REQUIRED_PIRATEBAY_APIS = (
         "https://apibay.org",
-    ]
+    )
 
-    REQUIRED_X1337_MIRRORS = [
+    REQUIRED_X1337_MIRRORS = (
         "https://1337x.to",
         "https://www.1337x.to",
         "https://1337x.st",
@@ -54,22 +123,45 @@ class SettingsManager:
         "https://www.1337xx.to",
         "https://1377x.to",
         "https://www.1377x.to",
-    ]
+    )
 
-    REQUIRED_OD_SEED_URLS = [
+    REQUIRED_OD_SEED_URLS = (
         "http://suhr.ir/plugin/",
         "https://the-eye.eu/public/",
         "https://www.eyeofjustice.com/od/",
         "https://whatintheworld.xyz/",
-    ]
-    REQUIRED_OD_ENGINE_TEMPLATES = [
+    )
+    REQUIRED_OD_ENGINE_TEMPLATES = (
         "https://duckduckgo.com/html/?q={query}",
         "https://www.startpage.com/sp/search?query={query}",
         "https://searx.be/search?q={query}",
-    ]
-    REQUIRED_OD_FILE_EXTENSIONS = [
+    )
+    REQUIRED_OD_FILE_EXTENSIONS = (
         "zip", "rar", "7z", "dmg", "pkg", "exe", "msi", "iso", "torrent", "vst", "vst3", "au", "aax", "dll"
-    ]
+    )
+
+    # Bump whenever REQUIRED_* lists or the checks in _ensure_required_source_urls change.
+    REQUIRED_SCHEMA_VERSION = 4
+    REQUIRED_VERSION_KEY = "_required_version"
+    # Keys inspected by _ensure_required_source_urls; editing one forces a re-check.
+    REQUIRED_CHECK_KEYS = frozenset({
+        "piratebay_mirror_order",
+        "piratebay_api_endpoints",
+        "x1337_mirror_order",
+        "http_sources",
+        "http_discovery_engine_templates",
+        "http_sources_enabled",
+        "od_seed_urls",
+        "od_engine_templates",
+        "od_file_extensions",
+        "od_max_depth",
+        "od_max_subdirs_per_page",
+        "od_fast_return_seconds",
+        "od_fast_return_min_results",
+        "enabled_sources",
+        "sources_bootstrap_completed",
+        "sources_force_enable_v3_completed",
+    })
 
     DEFAULT_SETTINGS = {
         # Search
@@ -87,43 +179,14 @@ class SettingsManager:
             "OpenDirectory": True,
             "Prowlarr": False,
         },
-        "piratebay_mirror_order": [
-            "https://www.piratebay.org",
-            "https://tpb.party",
-            "https://thepiratebay.zone",
-            "https://pirateproxylive.org",
-            "https://thepiratebay.org",
-        ],
-        "piratebay_api_endpoints": [
-            "https://apibay.org",
-        ],
-        "x1337_mirror_order": [
-            "https://1337x.to",
-            "https://www.1337x.to",
-            "https://1337x.st",
-            "https://x1337x.ws",
-            "https://x1337x.eu",
-            "https://1337xx.to",
-            "https://www.1337xx.to",
-            "https://1377x.to",
-            "https://www.1377x.to",
-        ],
+        "piratebay_mirror_order": list(REQUIRED_PIRATEBAY_MIRRORS),
+        "piratebay_api_endpoints": list(REQUIRED_PIRATEBAY_APIS),
+        "x1337_mirror_order": list(REQUIRED_X1337_MIRRORS),
         "http_detail_max_pages": 10,
         "http_links_per_detail": 12,
         "http_sources_enabled": True,
-        "http_sources": [
-            "http://palined.com/search/?q={query}",
-            "https://nmac.to/?s={query}",
-            "https://macked.app/?s={query}",
-            "https://vstorrent.org/?s={query}",
-            "https://audioz.download/?s={query}",
-        ],
-        "http_discovery_engine_templates": [
-            "https://duckduckgo.com/html/?q={query}",
-            "https://html.duckduckgo.com/html/?q={query}",
-            "https://www.startpage.com/sp/search?query={query}",
-            "https://searx.be/search?q={query}",
-        ],
+        "http_sources": list(REQUIRED_HTTP_SOURCE_TEMPLATES),
+        "http_discovery_engine_templates": list(REQUIRED_HTTP_DISCOVERY_ENGINES),
         "http_palined_primary_enabled": True,
         "http_detail_concurrency": 3,
         "http_time_budget_seconds": 50.0,
@@ -187,22 +250,14 @@ class SettingsManager:
         "source_early_return_seconds": 5.0,
         "source_early_return_min_results": 3,
         "source_prefer_http_completion": True,
+        "source_max_inflight": 2,
 
         # Open Directory
         "open_directory_enabled": True,
-        "od_seed_urls": [
-            "http://suhr.ir/plugin/",
-            "https://the-eye.eu/public/",
-            "https://www.eyeofjustice.com/od/",
-            "https://whatintheworld.xyz/",
-        ],
+        "od_seed_urls": list(REQUIRED_OD_SEED_URLS),
         "od_use_search_engines": True,
-        "od_engine_templates": [
-            "https://duckduckgo.com/html/?q={query}",
-            "https://www.startpage.com/sp/search?query={query}",
-            "https://searx.be/search?q={query}",
-        ],
-        "od_file_extensions": ["zip", "rar", "7z", "dmg", "pkg", "exe", "msi", "iso", "torrent", "vst", "vst3", "au", "aax", "dll"],
+        "od_engine_templates": list(REQUIRED_OD_ENGINE_TEMPLATES),
+        "od_file_extensions": list(REQUIRED_OD_FILE_EXTENSIONS),
         "od_max_results": 40,
         "od_max_candidate_pages": 12,
         "od_max_depth": 2,
@@ -221,16 +276,22 @@ class SettingsManager:
         "download_folder": str(_default_download_folder.__func__()),
         "max_concurrent_downloads": 3,
         "download_backend": "native",
+        "download_chunk_size": 1048576,
+        "download_segments": 1,  # >1 opts in to parallel byte-range downloads
         
         # RealDebrid
         "rd_access_token": "",
         "rd_refresh_token": "",
+        "rd_access_token_expires_at": 0.0,
         "rd_public_client_id": "X245A4XAIBGVM",
         "rd_client_id": "X245A4XAIBGVM",
         "rd_client_secret": "",
         "rd_device_code": "",
         "rd_library_source_enabled": True,
         "rd_request_timeout_seconds": 12.0,
+        "rd_poll_schedule_seconds": [1.0, 1.5, 2.0, 3.0, 5.0],
+        "rd_unrestrict_concurrency": 8,
+        "rd_availability_ttl_seconds": 300.0,
         "rd_sharing_mode": "profile",  # "profile" | "shared"
 
         # Prowlarr (optional local integration)
@@ -251,7 +312,40 @@ class SettingsManager:
         "first_run_completed": False,
         "sources_bootstrap_completed": False,
     }
-    
+
+    # Read-only view of the defaults; hand out _fresh_defaults() copies instead.
+    _DEFAULT_TEMPLATE = MappingProxyType(DEFAULT_SETTINGS)
+    # Keys whose default value is a list/dict and must be copied per instance.
+    _MUTABLE_DEFAULT_KEYS = tuple(k for k, v in DEFAULT_SETTINGS.items() if isinstance(v, (list, dict)))
+    # RealDebrid keys that move to user_settings when rd_sharing_mode is "shared".
+    RD_KEYS = frozenset(k for k in DEFAULT_SETTINGS if k.startswith("rd_"))
+
+    @classmethod
+    def _is_rd_key(cls, key: Any) -> bool:
+        if key in cls.RD_KEYS:
+            return True
+        if key in cls._DEFAULT_TEMPLATE:
+            return False
+        # Unknown keys keep the prefix rule.
+        return str(key).startswith("rd_")
+
+    @classmethod
+    def _fresh_defaults(cls) -> Dict[str, Any]:
+        """Return a copy of DEFAULT_SETTINGS that shares no mutable values with it."""
+        out = dict(cls._DEFAULT_TEMPLATE)
+        for key in cls._MUTABLE_DEFAULT_KEYS:
+            out[key] = copy.deepcopy(out[key])
+        return out
+
+    @classmethod
+    def _with_defaults(cls, settings_obj: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Return settings_obj with missing keys filled from the defaults, copying only what is filled."""
+        out = dict(settings_obj or {})
+        for key, value in cls._DEFAULT_TEMPLATE.items():
+            if key not in out:
+                out[key] = copy.deepcopy(value) if isinstance(value, (list, dict)) else value
+        return out
+
     def __init__(self, store=None):
         # Settings stored in user home
         data_dir = str(os.environ.get("PLUGGY_DATA_DIR", "") or "").strip()
@@ -262,45 +356,87 @@ class SettingsManager:
         # Optional SQLite store for multi-user/profile-scoped settings.
         self._store = store
         
-        self._lock = threading.RLock()
+        # _lock guards mutation of _settings and the dirty/timer state. Readers
+        # skip it: writers only ever mutate under the lock, and single dict
+        # reads/copies are atomic under the GIL. _io_lock serializes flushes so
+        # an older payload can never land on disk after a newer one.
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
         self._settings: Dict[str, Any] = {}
+        # Process-wide cache of store-backed settings keyed by ("profile"|"user", id).
+        # Each write bumps the key's generation so stale entries are never served.
+        self._scoped_cache: Dict[Tuple[str, Any], Tuple[int, Mapping[str, Any]]] = {}
+        self._scoped_gen: Dict[Tuple[str, Any], int] = defaultdict(int)
+        self._scoped_lock = threading.Lock()
+        # Last merged profile+user view for RD sharing, keyed by the identity of its inputs.
+        self._shared_view: Optional[Tuple[Mapping[str, Any], Mapping[str, Any], Mapping[str, Any]]] = None
+        # Last profile view handed out by get_all with the schema tag stripped.
+        self._public_slot: Optional[Tuple[Mapping[str, Any], Mapping[str, Any]]] = None
+        # Writes are coalesced: _save marks dirty and a timer flushes to disk.
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_interval = 2.0
+        self._last_serialized: Optional[bytes] = None
+        self._ensured_download_folder: Optional[str] = None
         self._load()
+        _live_managers.add(self)
+
+    def close(self) -> None:
+        """Flush pending writes and stop tracking this manager for the exit hook."""
+        self.flush()
+        _live_managers.discard(self)
 
     def attach_store(self, store) -> None:
         self._store = store
 
     def _load(self):
         """Load settings from file"""
+        loaded = None
+        file_present = True
+        try:
+            raw = self.settings_file.read_bytes()
+            loaded = _loads(raw) if raw else {}
+        except FileNotFoundError:
+            file_present = False
+        except Exception:
+            logger.exception("Error loading settings from %s", self.settings_file)
         with self._lock:
-            if self.settings_file.exists():
-                try:
-                    with open(self.settings_file, 'r') as f:
-                        loaded = json.load(f)
-                        # Merge with defaults (adds new keys if they don't exist)
-                        self._settings = {**self.DEFAULT_SETTINGS, **loaded}
-                        # Deep-merge nested source flags so new sources get default states.
-                        default_sources = self.DEFAULT_SETTINGS.get("enabled_sources", {})
-                        loaded_sources = loaded.get("enabled_sources", {}) if isinstance(loaded, dict) else {}
-                        self._settings["enabled_sources"] = {**default_sources, **loaded_sources}
-                except Exception as e:
-                    print(f"Error loading settings: {e}")
-                    self._settings = self.DEFAULT_SETTINGS.copy()
+            if isinstance(loaded, dict):
+                # Merge with defaults (adds new keys if they don't exist)
+                self._settings = self._with_defaults(loaded)
+                # Deep-merge nested source flags so new sources get default states.
+                default_sources = self._DEFAULT_TEMPLATE.get("enabled_sources", {})
+                loaded_sources = loaded.get("enabled_sources", {})
+                if not isinstance(loaded_sources, dict):
+                    loaded_sources = {}
+                self._settings["enabled_sources"] = {**default_sources, **loaded_sources}
             else:
-                self._settings = self.DEFAULT_SETTINGS.copy()
+                self._settings = self._fresh_defaults()
 
-            changed = self._ensure_required_source_urls()
+            changed = self._ensure_required_source_urls(self._settings)
             changed = self._normalize_download_folder_in(self._settings) or changed
-            if changed and self.settings_file.exists():
+            if changed and file_present:
                 self._save()
-            
-            # Ensure download folder exists
-            Path(self._settings["download_folder"]).mkdir(parents=True, exist_ok=True)
+            download_folder = self._settings["download_folder"]
+
+        # Ensure download folder exists
+        self._ensure_download_folder(download_folder)
+
+    def _ensure_download_folder(self, folder: str) -> None:
+        # Only hit the filesystem when the folder changed since the last check.
+        if folder != self._ensured_download_folder:
+            Path(folder).mkdir(parents=True, exist_ok=True)
+            self._ensured_download_folder = folder
 
     def _sanitize_download_folder(self, value: Any) -> str:
         text = str(value or "").strip()
         if not text:
-            return str(self._default_download_folder())
-        return str(Path(text).expanduser())
+            return self._default_download_folder_str
+        return _expand_path_str(text)
+
+    @functools.cached_property
+    def _default_download_folder_str(self) -> str:
+        return str(self._default_download_folder())
 
     def _normalize_download_folder_in(self, settings_obj: Dict[str, Any]) -> bool:
         if not isinstance(settings_obj, dict):
@@ -312,203 +448,308 @@ class SettingsManager:
 
     def _ensure_required_source_urls_on(self, settings_obj: Dict[str, Any]) -> Dict[str, Any]:
         """Return a sanitized settings dict with required keys/urls merged in."""
-        with self._lock:
-            original = self._settings
-            try:
-                self._settings = dict(settings_obj or {})
-                self._settings = {**self.DEFAULT_SETTINGS, **self._settings}
-                self._ensure_required_source_urls()
-                self._normalize_download_folder_in(self._settings)
-                return dict(self._settings)
-            finally:
-                self._settings = original
-
-    def _load_profile_settings(self, profile_id: str) -> Dict[str, Any]:
+        merged = self._with_defaults(settings_obj)
+        self._ensure_required_source_urls(merged)
+        self._normalize_download_folder_in(merged)
+        return merged
+
+    def _cached_scoped(self, key: Tuple[str, Any]) -> Tuple[int, Optional[Mapping[str, Any]]]:
+        with self._scoped_lock:
+            gen = self._scoped_gen[key]
+            entry = self._scoped_cache.get(key)
+        if entry is not None and entry[0] == gen:
+            return gen, entry[1]
+        return gen, None
+
+    def _fill_scoped(self, key: Tuple[str, Any], gen: int, data: Dict[str, Any]) -> Mapping[str, Any]:
+        # Cached dicts are shared across requests, so only read-only views are handed out.
+        view = MappingProxyType(data)
+        with self._scoped_lock:
+            # A write that raced with the store read has already bumped the generation.
+            if self._scoped_gen[key] == gen:
+                self._scoped_cache[key] = (gen, view)
+        return view
+
+    def _remember_scoped(self, key: Tuple[str, Any], data: Dict[str, Any]) -> Mapping[str, Any]:
+        view = MappingProxyType(data)
+        with self._scoped_lock:
+            gen = self._scoped_gen[key] + 1
+            self._scoped_gen[key] = gen
+            self._scoped_cache[key] = (gen, view)
+        return view
+
+    def invalidate_profile(self, profile_id: str) -> None:
+        """Drop cached settings for a profile whose row was changed outside this manager."""
+        key = ("profile", str(profile_id))
+        with self._scoped_lock:
+            self._scoped_gen[key] += 1
+            self._scoped_cache.pop(key, None)
+
+    def _load_profile_settings(self, profile_id: str) -> Mapping[str, Any]:
         cached = profile_settings_cache.get()
         if cached is not None:
             return cached
         store = self._store
-        base = dict(self.DEFAULT_SETTINGS)
         if store is None:
+            base = MappingProxyType(self._fresh_defaults())
             profile_settings_cache.set(base)
             return base
+        key = ("profile", str(profile_id))
+        gen, hit = self._cached_scoped(key)
+        if hit is not None:
+            profile_settings_cache.set(hit)
+            return hit
         loaded = store.get_profile_settings(profile_id) or {}
-        merged = {**base, **loaded}
-        merged = self._ensure_required_source_urls_on(merged)
-        # Auto-write back if missing row or keys were added by sanitizer.
+        merged = self._ensure_required_source_urls_on(loaded)
+        # Auto-write back if missing row or keys were added by sanitizer. A row whose only
+        # difference is an outdated schema tag is left alone until its next real write.
+        tag = self.REQUIRED_VERSION_KEY
+        stale_tag_only = tag in loaded and {**loaded, tag: merged.get(tag)} == merged
         try:
-            if loaded != merged:
+            if loaded != merged and not stale_tag_only:
                 store.set_profile_settings(profile_id, merged)
         except Exception:
             pass
-        profile_settings_cache.set(merged)
-        return merged
+        view = self._fill_scoped(key, gen, merged)
+        profile_settings_cache.set(view)
+        return view
 
-    def _load_user_settings(self, user_id: int) -> Dict[str, Any]:
+    def _load_user_settings(self, user_id: int) -> Mapping[str, Any]:
         cached = user_settings_cache.get()
         if cached is not None:
             return cached
         store = self._store
         if store is None:
-            user_settings_cache.set({})
-            return {}
+            empty = MappingProxyType({})
+            user_settings_cache.set(empty)
+            return empty
+        key = ("user", int(user_id))
+        gen, hit = self._cached_scoped(key)
+        if hit is not None:
+            user_settings_cache.set(hit)
+            return hit
         loaded = store.get_user_settings(int(user_id)) or {}
-        user_settings_cache.set(loaded)
-        return loaded
+        view = self._fill_scoped(key, gen, loaded)
+        user_settings_cache.set(view)
+        return view
 
-    def _active_settings_dict(self) -> Tuple[Optional[str], Optional[int], Optional[Dict[str, Any]]]:
+    def _active_settings_dict(self) -> Tuple[Optional[str], Optional[int], Optional[Mapping[str, Any]]]:
         profile_id = get_profile_id()
         user_id = get_user_id()
         if profile_id:
             return profile_id, user_id, self._load_profile_settings(profile_id)
         return None, user_id, None
 
-    def _merge_required_url_list(self, key: str, required: list[str]) -> bool:
-        existing = self._settings.get(key, [])
+    def _merge_required_url_list(self, settings_obj: Dict[str, Any], key: str, required: Tuple[str, ...]) -> bool:
+        existing = settings_obj.get(key, [])
         if not isinstance(existing, list):
             existing = []
-        normalized = []
+        # Ordered de-dup via dict keys; REQUIRED_* tuples are already stripped.
+        seen: Dict[str, None] = {}
         for item in existing:
             text = str(item or "").strip()
-            if text and text not in normalized:
-                normalized.append(text)
-        for item in required:
-            text = str(item or "").strip()
-            if text and text not in normalized:
-                normalized.append(text)
+            if text:
+                seen[text] = None
+        seen.update(dict.fromkeys(required))
+        normalized = list(seen)
         changed = normalized != existing
-        self._settings[key] = normalized
+        settings_obj[key] = normalized
         return changed
 
-    def _ensure_required_source_urls(self) -> bool:
+    def _invalidate_required_check(self, settings_obj: Dict[str, Any], keys) -> None:
+        if not self.REQUIRED_CHECK_KEYS.isdisjoint(keys):
+            settings_obj.pop(self.REQUIRED_VERSION_KEY, None)
+
+    def _ensure_required_source_urls(self, settings_obj: Dict[str, Any]) -> bool:
+        # Already checked against this schema and untouched since; nothing can have changed.
+        if settings_obj.get(self.REQUIRED_VERSION_KEY) == self.REQUIRED_SCHEMA_VERSION:
+            return False
+        # An absent tag still needs persisting; a stale one is refreshed on the next real write.
+        tag_was_missing = self.REQUIRED_VERSION_KEY not in settings_obj
         # Keep baseline software sources always available; users can still disable providers.
         changed = False
-        changed = self._merge_required_url_list("piratebay_mirror_order", self.REQUIRED_PIRATEBAY_MIRRORS) or changed
-        changed = self._merge_required_url_list("piratebay_api_endpoints", self.REQUIRED_PIRATEBAY_APIS) or changed
-        changed = self._merge_required_url_list("x1337_mirror_order", self.REQUIRED_X1337_MIRRORS) or changed
-        changed = self._merge_required_url_list("http_sources", self.REQUIRED_HTTP_SOURCE_TEMPLATES) or changed
-        changed = self._merge_required_url_list("http_discovery_engine_templates", self.REQUIRED_HTTP_DISCOVERY_ENGINES) or changed
-        changed = self._merge_required_url_list("od_seed_urls", self.REQUIRED_OD_SEED_URLS) or changed
+        changed = self._merge_required_url_list(settings_obj, "piratebay_mirror_order", self.REQUIRED_PIRATEBAY_MIRRORS) or changed
+        changed = self._merge_required_url_list(settings_obj, "piratebay_api_endpoints", self.REQUIRED_PIRATEBAY_APIS) or changed
+        changed = self._merge_required_url_list(settings_obj, "x1337_mirror_order", self.REQUIRED_X1337_MIRRORS) or changed
+        changed = self._merge_required_url_list(settings_obj, "http_sources", self.REQUIRED_HTTP_SOURCE_TEMPLATES) or changed
+        changed = self._merge_required_url_list(settings_obj, "http_discovery_engine_templates", self.REQUIRED_HTTP_DISCOVERY_ENGINES) or changed
+        changed = self._merge_required_url_list(settings_obj, "od_seed_urls", self.REQUIRED_OD_SEED_URLS) or changed
         # suhr.ir OD works reliably over HTTP; normalize legacy HTTPS seeds.
-        normalized_od = []
-        for raw in list(self._settings.get("od_seed_urls", []) or []):
+        current_od = list(settings_obj.get("od_seed_urls", []) or [])
+        seen_od: Dict[str, None] = {}
+        for raw in current_od:
             text = str(raw or "").strip()
-            if not text:
-                continue
-            lowered = text.lower()
-            if lowered.startswith("https://suhr.ir/"):
-                text = "http://" + text[len("https://"):]
-            if text not in normalized_od:
-                normalized_od.append(text)
-        if normalized_od != list(self._settings.get("od_seed_urls", []) or []):
-            self._settings["od_seed_urls"] = normalized_od
+            if text:
+                seen_od[_rewrite_suhr(text)] = None
+        normalized_od = list(seen_od)
+        if normalized_od != current_od:
+            settings_obj["od_seed_urls"] = normalized_od
             changed = True
-        changed = self._merge_required_url_list("od_engine_templates", self.REQUIRED_OD_ENGINE_TEMPLATES) or changed
-        changed = self._merge_required_url_list("od_file_extensions", self.REQUIRED_OD_FILE_EXTENSIONS) or changed
-        if int(self._settings.get("od_max_depth", 1) or 1) < 2:
-            self._settings["od_max_depth"] = 2
+        changed = self._merge_required_url_list(settings_obj, "od_engine_templates", self.REQUIRED_OD_ENGINE_TEMPLATES) or changed
+        changed = self._merge_required_url_list(settings_obj, "od_file_extensions", self.REQUIRED_OD_FILE_EXTENSIONS) or changed
+        if int(settings_obj.get("od_max_depth", 1) or 1) < 2:
+            settings_obj["od_max_depth"] = 2
             changed = True
-        od_subdirs = int(self._settings.get("od_max_subdirs_per_page", 32) or 32)
+        od_subdirs = int(settings_obj.get("od_max_subdirs_per_page", 32) or 32)
         if od_subdirs <= 0:
-            self._settings["od_max_subdirs_per_page"] = 32
+            settings_obj["od_max_subdirs_per_page"] = 32
             changed = True
         elif od_subdirs > 64:
             # Legacy configs used very high crawl fan-out and can stall queries.
-            self._settings["od_max_subdirs_per_page"] = 32
-            changed = True
-        if float(self._settings.get("od_fast_return_seconds", 0.0) or 0.0) <= 0:
-            self._settings["od_fast_return_seconds"] = 9.0
+            settings_obj["od_max_subdirs_per_page"] = 32
             changed = True
-        if int(self._settings.get("od_fast_return_min_results", 0) or 0) <= 0:
-            self._settings["od_fast_return_min_results"] = 6
+        if float(settings_obj.get("od_fast_return_seconds", 0.0) or 0.0) <= 0:
+            settings_obj["od_fast_return_seconds"] = 9.0
             changed = True
-        if "http_sources_enabled" not in self._settings:
-            self._settings["http_sources_enabled"] = True
+        if int(settings_obj.get("od_fast_return_min_results", 0) or 0) <= 0:
+            settings_obj["od_fast_return_min_results"] = 6
             changed = True
-        # Bootstrap all known providers enabled one time for fresh installs/migrations.
-        if not bool(self._settings.get("sources_bootstrap_completed", False)):
-            source_flags = self._settings.get("enabled_sources", {}) or {}
-            if not isinstance(source_flags, dict):
-                source_flags = {}
-            for source_name in ("RealDebrid Library", "HTTP", "OpenDirectory"):
-                if not bool(source_flags.get(source_name, False)):
-                    source_flags[source_name] = True
-                    changed = True
-            self._settings["enabled_sources"] = source_flags
-            self._settings["sources_bootstrap_completed"] = True
+        if "http_sources_enabled" not in settings_obj:
+            settings_obj["http_sources_enabled"] = True
             changed = True
-        # Force-enable core web sources for runtime stability baseline on migrated configs.
-        if not bool(self._settings.get("sources_force_enable_v3_completed", False)):
-            source_flags = self._settings.get("enabled_sources", {}) or {}
+        # Bootstrap all known providers enabled one time for fresh installs/migrations,
+        # and force-enable core web sources once on configs migrated before v3.
+        bootstrapped = bool(settings_obj.get("sources_bootstrap_completed", False))
+        if not (bootstrapped and bool(settings_obj.get("sources_force_enable_v3_completed", False))):
+            source_flags = settings_obj.get("enabled_sources", {}) or {}
             if not isinstance(source_flags, dict):
                 source_flags = {}
             for source_name in ("RealDebrid Library", "HTTP", "OpenDirectory"):
                 if not bool(source_flags.get(source_name, False)):
                     source_flags[source_name] = True
-                    changed = True
-            self._settings["enabled_sources"] = source_flags
-            self._settings["sources_force_enable_v3_completed"] = True
+            settings_obj["enabled_sources"] = source_flags
+            settings_obj["sources_bootstrap_completed"] = True
+            settings_obj["sources_force_enable_v3_completed"] = True
             changed = True
-        return changed
+        settings_obj[self.REQUIRED_VERSION_KEY] = self.REQUIRED_SCHEMA_VERSION
+        return changed or tag_was_missing
     
     def _save(self):
-        """Save settings to file"""
-        with self._lock:
-            try:
-                self._normalize_download_folder_in(self._settings)
-                Path(self._settings["download_folder"]).mkdir(parents=True, exist_ok=True)
-                with open(self.settings_file, 'w') as f:
-                    json.dump(self._settings, f, indent=2)
-            except Exception as e:
-                print(f"Error saving settings: {e}")
+        """Mark settings dirty and schedule a debounced flush; caller holds _lock"""
+        self._dirty = True
+        if self._flush_timer is None:
+            # The timer holds a weak reference so a pending flush does not pin the manager.
+            timer = threading.Timer(self._flush_interval, _flush_if_alive, args=(weakref.ref(self),))
+            timer.daemon = True
+            self._flush_timer = timer
+            timer.start()
+
+    def flush(self):
+        """Write pending settings changes to file immediately"""
+        with self._io_lock:
+            with self._lock:
+                timer = self._flush_timer
+                self._flush_timer = None
+                if timer is not None:
+                    timer.cancel()
+                if not self._dirty:
+                    return
+                self._dirty = False
+                # download_folder is sanitized on the way in by _load/set/update/reset.
+                try:
+                    download_folder = self._settings["download_folder"]
+                    payload = _dumps(self._settings)
+                except Exception:
+                    logger.exception("Error serializing settings")
+                    return
+            # Disk I/O happens outside _lock so readers and writers aren't blocked on it.
+            self._write_payload(download_folder, payload)
+
+    def _write_payload(self, download_folder: str, payload: bytes):
+        """Save settings to file; caller holds _io_lock"""
+        try:
+            self._ensure_download_folder(download_folder)
+            if payload == self._last_serialized:
+                return
+            # Write once to a sibling temp file, then swap in atomically.
+            tmp = self.settings_file.with_suffix('.json.tmp')
+            with open(tmp, 'wb', buffering=0) as f:
+                f.write(payload)
+            os.replace(tmp, self.settings_file)
+            self._last_serialized = payload
+        except Exception:
+            logger.exception("Error saving settings to %s", self.settings_file)
     
     def get(self, key: str, default=None) -> Any:
         """Get a setting value"""
         profile_id, user_id, scoped = self._active_settings_dict()
         if scoped is not None:
             # RD sharing: if enabled, read rd_* keys from user_settings.
-            if str(key).startswith("rd_") and user_id and str(scoped.get("rd_sharing_mode", "profile")) == "shared":
+            if self._is_rd_key(key) and user_id and str(scoped.get("rd_sharing_mode", "profile")) == "shared":
                 user_scoped = self._load_user_settings(int(user_id))
                 if key in user_scoped:
-                    return user_scoped.get(key, default)
+                    return _detached(user_scoped.get(key, default))
             value = scoped.get(key, default)
             if key == "download_folder":
                 return self._sanitize_download_folder(value)
-            return value
-        with self._lock:
-            value = self._settings.get(key, default)
-            if key == "download_folder":
-                return self._sanitize_download_folder(value)
-            return value
+            return _detached(value)
+        value = self._settings.get(key, default)
+        if key == "download_folder":
+            return self._sanitize_download_folder(value)
+        return _detached(value)
     
+    def get_many(self, keys: Iterable[str], defaults: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+        """Get several setting values, resolving the profile/user scope once"""
+        defaults = defaults or {}
+        profile_id, user_id, scoped = self._active_settings_dict()
+        if scoped is None:
+            source: Mapping[str, Any] = self._settings
+            user_scoped: Optional[Mapping[str, Any]] = None
+        else:
+            source = scoped
+            user_scoped = None
+            if user_id and str(scoped.get("rd_sharing_mode", "profile")) == "shared":
+                user_scoped = self._load_user_settings(int(user_id))
+        out: Dict[str, Any] = {}
+        for key in keys:
+            default = defaults.get(key)
+            if user_scoped is not None and self._is_rd_key(key) and key in user_scoped:
+                value = user_scoped.get(key, default)
+            else:
+                value = source.get(key, default)
+            if key == "download_folder":
+                value = self._sanitize_download_folder(value)
+            out[key] = _detached(value)
+        return out
+
     def set(self, key: str, value: Any):
         """Set a setting value and save"""
         if key == "download_folder":
             value = self._sanitize_download_folder(value)
+        value = _detached(value)
         profile_id, user_id, scoped = self._active_settings_dict()
         if scoped is not None and profile_id:
             store = self._store
             if store is None:
                 return
             # RD sharing: write rd_* keys into user_settings when shared.
-            if str(key).startswith("rd_") and user_id and str(scoped.get("rd_sharing_mode", "profile")) == "shared":
-                user_scoped = self._load_user_settings(int(user_id))
+            if self._is_rd_key(key) and user_id and str(scoped.get("rd_sharing_mode", "profile")) == "shared":
+                user_scoped = dict(self._load_user_settings(int(user_id)))
                 user_scoped[str(key)] = value
                 store.set_user_settings(int(user_id), user_scoped)
-                user_settings_cache.set(user_scoped)
+                user_settings_cache.set(self._remember_scoped(("user", int(user_id)), user_scoped))
                 return
+            scoped = dict(scoped)
             scoped[str(key)] = value
+            self._invalidate_required_check(scoped, (str(key),))
             scoped = self._ensure_required_source_urls_on(scoped)
             store.set_profile_settings(profile_id, scoped)
-            profile_settings_cache.set(scoped)
+            profile_settings_cache.set(self._remember_scoped(("profile", str(profile_id)), scoped))
+            return
+        key = str(key)
+        # Idempotent writes are common from UI handlers; skip the lock for them.
+        if self._settings.get(key, _MISSING) == value:
             return
         with self._lock:
-            self._settings[str(key)] = value
+            if self._settings.get(key, _MISSING) == value:
+                return
+            self._settings[key] = value
+            self._invalidate_required_check(self._settings, (key,))
             self._save()
     
     def update(self, settings_dict: Dict[str, Any]):
         """Update multiple settings at once"""
-        settings_dict = dict(settings_dict or {})
+        settings_dict = {k: _detached(v) for k, v in (settings_dict or {}).items()}
         if "download_folder" in settings_dict:
             settings_dict["download_folder"] = self._sanitize_download_folder(settings_dict.get("download_folder"))
         profile_id, user_id, scoped = self._active_settings_dict()
@@ -517,38 +758,75 @@ class SettingsManager:
             if store is None:
                 return
             # Split RD keys if shared.
-            sharing = user_id and str(scoped.get("rd_sharing_mode", "profile")) == "shared"
+            # Only touch user_settings when the batch actually carries RD keys.
+            sharing = (
+                user_id
+                and any(self._is_rd_key(k) for k in settings_dict)
+                and str(scoped.get("rd_sharing_mode", "profile")) == "shared"
+            )
             if sharing:
-                user_scoped = self._load_user_settings(int(user_id))
+                user_scoped = dict(self._load_user_settings(int(user_id)))
             else:
                 user_scoped = None
+            scoped = dict(scoped)
             for k, v in (settings_dict or {}).items():
-                if sharing and str(k).startswith("rd_") and user_scoped is not None:
+                if sharing and user_scoped is not None and self._is_rd_key(k):
                     user_scoped[str(k)] = v
                 else:
                     scoped[str(k)] = v
+            self._invalidate_required_check(scoped, settings_dict)
             scoped = self._ensure_required_source_urls_on(scoped)
             store.set_profile_settings(profile_id, scoped)
-            profile_settings_cache.set(scoped)
+            profile_settings_cache.set(self._remember_scoped(("profile", str(profile_id)), scoped))
             if sharing and user_scoped is not None:
                 store.set_user_settings(int(user_id), user_scoped)
-                user_settings_cache.set(user_scoped)
+                user_settings_cache.set(self._remember_scoped(("user", int(user_id)), user_scoped))
             return
         with self._lock:
-            self._settings.update(settings_dict)
+            current = self._settings
+            delta = {k: v for k, v in settings_dict.items() if current.get(k, _MISSING) != v}
+            if not delta:
+                return
+            current.update(delta)
+            self._invalidate_required_check(current, delta)
             self._save()
     
-    def get_all(self) -> Dict[str, Any]:
-        """Get all settings"""
+    def get_all(self) -> Mapping[str, Any]:
+        """Get all settings; profile-scoped results are read-only views"""
         profile_id, user_id, scoped = self._active_settings_dict()
         if scoped is not None:
-            out = dict(scoped)
             if user_id and str(scoped.get("rd_sharing_mode", "profile")) == "shared":
-                out.update(self._load_user_settings(int(user_id)))
-            return out
-        with self._lock:
-            return self._settings.copy()
+                return self._merged_shared_view(scoped, self._load_user_settings(int(user_id)))
+            return self._public_view(scoped)
+        out = self._settings.copy()
+        out.pop(self.REQUIRED_VERSION_KEY, None)
+        return out
+
+    def _public_view(self, scoped: Mapping[str, Any]) -> Mapping[str, Any]:
+        """The scoped view without the internal schema tag, cached by identity like the shared view.
+
+        Nested lists/dicts are copied once per cached view, so a caller editing them cannot
+        reach the process-wide cache.
+        """
+        slot = self._public_slot
+        if slot is not None and slot[0] is scoped:
+            return slot[1]
+        view = MappingProxyType({k: _detached(v) for k, v in scoped.items() if k != self.REQUIRED_VERSION_KEY})
+        self._public_slot = (scoped, view)
+        return view
     
+    def _merged_shared_view(self, scoped: Mapping[str, Any], user_scoped: Mapping[str, Any]) -> Mapping[str, Any]:
+        # Cached views are replaced, never mutated, on write; identity is a valid cache key.
+        slot = self._shared_view
+        if slot is not None and slot[0] is scoped and slot[1] is user_scoped:
+            return slot[2]
+        merged = dict(scoped)
+        merged.update(user_scoped)
+        merged.pop(self.REQUIRED_VERSION_KEY, None)
+        view = MappingProxyType({k: _detached(v) for k, v in merged.items()})
+        self._shared_view = (scoped, user_scoped, view)
+        return view
+
     def reset(self):
         """Reset to default settings"""
         profile_id, _, scoped = self._active_settings_dict()
@@ -556,11 +834,11 @@ class SettingsManager:
             store = self._store
             if store is None:
                 return
-            merged = self._ensure_required_source_urls_on(dict(self.DEFAULT_SETTINGS))
+            merged = self._ensure_required_source_urls_on(self._fresh_defaults())
             store.set_profile_settings(profile_id, merged)
-            profile_settings_cache.set(merged)
+            profile_settings_cache.set(self._remember_scoped(("profile", str(profile_id)), merged))
             return
         with self._lock:
-            self._settings = self.DEFAULT_SETTINGS.copy()
-            self._ensure_required_source_urls()
+            self._settings = self._fresh_defaults()
+            self._ensure_required_source_urls(self._settings)
             self._save()
@@ -4,15 +4,126 @@ Manages torrent search sources with concurrent search, caching, and hot reload
 """
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from ..models.search_result import SearchResult
 from .event_bus import EventBus, Events
+import heapq
+import logging
+import random
+import sys
 import threading
 import time
 from collections import OrderedDict
 import re
 from urllib.parse import urlparse
-from ..sources.base import BaseSource
+from ..sources.base import BaseSource, new_http_session
+
+logger = logging.getLogger(__name__)
+
+_RE_BRACKETS = re.compile(r"\[[^\]]+\]|\([^)]+\)")
+_RE_NONWORD = re.compile(r"[^a-z0-9.+]+")
+_RE_YEAR = re.compile(r"\b(20\d{2}(?:\.\d+)*)\b")
+_RE_V = re.compile(r"\bv(\d+(?:\.\d+){0,3})\b")
+_RE_DOT = re.compile(r"\b(\d+\.\d+(?:\.\d+)*)\b")
+_RE_YEAR_BARE = re.compile(r"\b20\d{2}\b")
+_RE_V_BARE = re.compile(r"\bv\d+(\.\d+)*\b")
+_VERSION_PATTERNS = (_RE_YEAR, _RE_V, _RE_DOT)
+_RE_SORT_VERSION = re.compile(r"v?(\d+)\.?(\d*)\.?(\d*)")
+# Known file hosts and their link-quality weight.
+_HOST_WEIGHTS = {
+    "rapidgator": 22,
+    "nitroflare": 20,
+    "katfile": 17,
+    "ddownload": 17,
+    "turbobit": 14,
+    "uploadgig": 14,
+    "mega.nz": 24,
+    "mediafire": 18,
+    "pixeldrain": 16,
+    "workupload": 12,
+}
+_HOST_RE = re.compile("|".join(map(re.escape, _HOST_WEIGHTS)))
+_DL_EXTS = (".zip", ".rar", ".7z", ".dmg", ".pkg", ".exe", ".msi", ".iso")
+# Minimum spacing between SEARCH_PROGRESS events; the final tick is always sent.
+_PROGRESS_INTERVAL_SECONDS = 0.05
+# Platform/vendor/release noise ignored when building cross-source grouping keys.
+_CONTENT_STOPWORDS = frozenset({
+    "x64", "x86", "win", "windows", "mac", "linux", "multilingual", "incl",
+    "keygen", "crack", "repack", "proper", "portable", "final", "build",
+    "adobe", "microsoft", "corel", "apple",
+})
+
+
+def _hashable(value):
+    """Freeze filter values (lists, dicts, sets) so they can be part of a cache key."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _hashable(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_hashable(v) for v in value)
+    return value
+
+
+def _split_link(link: str) -> Tuple[str, str, str]:
+    """Cheap (scheme, host, path) split of a lowercased URL for link scoring."""
+    scheme, sep, rest = link.partition("://")
+    if not sep or not (scheme.isascii() and scheme[:1].isalpha() and scheme.isalnum()):
+        # Not a plain scheme://host URL; let urlparse handle the odd cases.
+        parsed = urlparse(link)
+        return parsed.scheme, parsed.netloc, parsed.path
+    host, slash, path = rest.partition("/")
+    for mark in ("?", "#"):
+        if mark in host:
+            host = host.split(mark, 1)[0]
+            path = slash = ""
+    for mark in ("?", "#"):
+        path = path.split(mark, 1)[0]
+    if ";" in path:
+        # Like urlparse, drop ;params from the last segment only.
+        head, sep_, last = path.rpartition("/")
+        path = head + sep_ + last.split(";", 1)[0]
+    return scheme, host, slash + path
+
+
+def _result_sort_key(result: SearchResult) -> Tuple[int, int, int, int, int]:
+    """Sort key for _sort_results; sorted() evaluates it once per result."""
+    title = result.title.lower()
+
+    # Extract version number if present
+    # Patterns: v1.2.3, 2023, version 4.5, etc.
+    version_score = 0
+    version_match = _RE_SORT_VERSION.search(title)
+    if version_match:
+        # Convert version to comparable number
+        # v2024.1.0 = 2024010000
+        # v1.2.3 = 1020300
+        major, minor, patch = version_match.groups()
+        version_score = int(major) * 1000000 + int(minor or 0) * 1000 + int(patch or 0)
+
+    # Detect quality indicators in title
+    quality_bonus = 0
+    if "repack" in title or "proper" in title or "real" in title:
+        quality_bonus += 10
+    if "crack" in title or "keygen" in title:
+        quality_bonus += 5
+    if "1080p" in title or "4k" in title:
+        quality_bonus += 8
+
+    # Seeds first, then link quality, version, size and quality indicators;
+    # all negated so larger values sort first.
+    return (
+        -result.seeds,
+        -result.link_quality,
+        -version_score,
+        -result.size,
+        -quality_bonus,
+    )
+
+
+def make_cache_key(query: str, page: int, filters: Dict) -> Tuple:
+    """Normalized SearchCache key for a search request."""
+    return (query, page, _hashable(filters))
 
 
 class SearchCache:
@@ -21,34 +132,48 @@ class SearchCache:
     def __init__(self, max_size=100, ttl_seconds=300):
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
+        # key -> (monotonic expiry, results), oldest first.
         self._cache: OrderedDict = OrderedDict()
-        self._lock = threading.RLock()
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
     
-    def _make_key(self, query: str, page: int, filters: Dict) -> str:
+    def _make_key(self, query: str, page: int, filters: Dict) -> Tuple:
         """Create cache key from search parameters"""
-        filter_str = ",".join(f"{k}:{v}" for k, v in sorted(filters.items()))
-        return f"{query}|{page}|{filter_str}"
+        return make_cache_key(query, page, filters)
     
     def get(self, query: str, page: int, filters: Dict) -> Optional[List[SearchResult]]:
         """Get cached results if still valid"""
+        return self.get_by_key(self._make_key(query, page, filters))
+
+    def get_by_key(self, key: Tuple) -> Optional[List[SearchResult]]:
+        """Get cached results for a key built with make_cache_key"""
         with self._lock:
-            key = self._make_key(query, page, filters)
-            if key in self._cache:
-                timestamp, results = self._cache[key]
-                if time.time() - timestamp < self.ttl_seconds:
+            entry = self._cache.get(key)
+            if entry is not None:
+                expiry, results = entry
+                if time.monotonic() < expiry:
                     # Move to end (LRU)
                     self._cache.move_to_end(key)
                     return results
-                else:
-                    del self._cache[key]
+                del self._cache[key]
             return None
     
     def set(self, query: str, page: int, filters: Dict, results: List[SearchResult]):
         """Cache search results"""
+        self.set_by_key(self._make_key(query, page, filters), results)
+
+    def set_by_key(self, key: Tuple, results: List[SearchResult]):
+        """Cache search results under a key built with make_cache_key"""
         with self._lock:
-            key = self._make_key(query, page, filters)
-            self._cache[key] = (time.time(), results)
+            now = time.monotonic()
+            self._cache[key] = (now + self.ttl_seconds, results)
             self._cache.move_to_end(key)
+
+            # Periodically drop expired entries so stale results don't sit until LRU eviction.
+            if now >= self._next_sweep:
+                for stale_key in [k for k, (expiry, _) in self._cache.items() if expiry <= now]:
+                    del self._cache[stale_key]
+                self._next_sweep = now + self.ttl_seconds / 4
             
             # Evict oldest if over size
             while len(self._cache) > self.max_size:
@@ -60,7 +185,11 @@ class SearchCache:
             self._cache.clear()
 
 
-@dataclass
+# dataclass(slots=True) needs Python 3.10; older interpreters keep a per-instance __dict__.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class SourceHealth:
     attempts: int = 0
     successes: int = 0
@@ -82,10 +211,16 @@ class SourceManager:
         self.event_bus = event_bus
         self._sources: Dict[str, any] = {}
         self._enabled: Dict[str, bool] = {}
-        self._lock = threading.RLock()
+        self._lock = threading.Lock()
         self._cache = SearchCache()
-        self._executor = ThreadPoolExecutor(max_workers=10)
+        # One long-lived pool shared by all searches; grows with registered sources.
+        self._executor_size = 10
+        self._executor = ThreadPoolExecutor(max_workers=self._executor_size, thread_name_prefix="search-")
+        # Single thread for post-search bookkeeping so it never waits behind source work.
+        self._janitor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search-finalize-")
         self._health: Dict[str, SourceHealth] = {}
+        # Per-source bulkhead so one slow source cannot occupy every pool thread.
+        self._source_sems: Dict[str, threading.BoundedSemaphore] = {}
 
         reliability = reliability or {}
         self._max_retries = int(reliability.get("max_retries", 0))
@@ -97,6 +232,7 @@ class SourceManager:
         self._early_return_min_results = int(reliability.get("early_return_min_results", 1))
         # Keep HTTP discovery complete by default (do not fast-skip HTTP sources).
         self._prefer_http_completion = bool(reliability.get("prefer_http_completion", True))
+        self._source_max_inflight = max(1, int(reliability.get("source_max_inflight", 2)))
     
     def register(self, source):
         """Register a search source"""
@@ -106,11 +242,23 @@ class SourceManager:
             raise ValueError("Source must define non-empty 'name'.")
         if not callable(getattr(source, "search", None)):
             raise ValueError("Source must implement callable search(query, page).")
+        if getattr(source, "session", None) is None:
+            session = new_http_session()
+            if session is not None:
+                source.set_http_session(session)
         with self._lock:
             source_name = source.name
             self._sources[source_name] = source
             self._enabled[source_name] = True
             self._health.setdefault(source_name, SourceHealth())
+            self._source_sems.setdefault(source_name, threading.BoundedSemaphore(self._source_max_inflight))
+            wanted = min(32, 4 * len(self._sources))
+            if wanted > self._executor_size:
+                # Executors cannot grow; hand new work to a larger pool and let the old one drain.
+                old = self._executor
+                self._executor_size = wanted
+                self._executor = ThreadPoolExecutor(max_workers=wanted, thread_name_prefix="search-")
+                old.shutdown(wait=False)
     
     def unregister(self, source_name: str):
         """Unregister a source"""
@@ -119,6 +267,7 @@ class SourceManager:
                 del self._sources[source_name]
                 del self._enabled[source_name]
                 self._health.pop(source_name, None)
+                self._source_sems.pop(source_name, None)
     
     def enable_source(self, source_name: str, enabled: bool = True):
         """Enable or disable a source"""
@@ -171,7 +320,7 @@ class SourceManager:
                     "last_success_at": h.last_success_at,
                     "circuit_open": h.circuit_open and now < h.cooldown_until,
                     "cooldown_until": h.cooldown_until,
-                    "score": round(self._source_routing_score(name), 2),
+                    "score": round(self._source_routing_score(name, now), 2),
                 }
             return out
     
@@ -181,15 +330,17 @@ class SourceManager:
             for source_name, enabled in enabled_dict.items():
                 if source_name in self._enabled:
                     self._enabled[source_name] = enabled
-            for source in self._sources.values():
-                updater = getattr(source, "reload_from_settings", None)
-                if callable(updater):
-                    try:
-                        updater()
-                    except Exception:
-                        pass
-            self._cache.clear()
-            self.event_bus.emit(Events.SOURCES_RELOADED)
+            sources = list(self._sources.values())
+        # Source hooks and subscribers run unlocked; _lock is not re-entrant.
+        for source in sources:
+            updater = getattr(source, "reload_from_settings", None)
+            if callable(updater):
+                try:
+                    updater()
+                except Exception:
+                    pass
+        self._cache.clear()
+        self.event_bus.emit(Events.SOURCES_RELOADED)
     
     def search(
         self,
@@ -216,7 +367,8 @@ class SourceManager:
         search_timeout_seconds = max(1.0, search_timeout_seconds)
         
         # Check cache first
-        cached = self._cache.get(query, page, filters)
+        cache_key = make_cache_key(query, page, filters)
+        cached = self._cache.get_by_key(cache_key)
         if cached is not None:
             return cached
         
@@ -228,7 +380,8 @@ class SourceManager:
         if filter_sources:
             enabled_sources = [s for s in enabled_sources if s in filter_sources]
         # Source routing score influences default execution order.
-        enabled_sources = sorted(enabled_sources, key=self._source_routing_score, reverse=True)
+        scores = self._score_map(enabled_sources)
+        enabled_sources.sort(key=scores.__getitem__, reverse=True)
         
         if not enabled_sources:
             self.event_bus.emit(Events.SEARCH_COMPLETED, {"results": [], "count": 0})
@@ -238,17 +391,28 @@ class SourceManager:
         all_results = []
         source_warnings: Dict[str, str] = {}
         futures = {}
+        # Sources whose completion the fast-return path waits for (HTTP / OpenDirectory).
+        priority_futures = set()
         
+        # Resolve sources and circuit state in one lock pass; submit outside the lock.
         with self._lock:
+            now = time.time()
+            runnable = []
             for source_name in enabled_sources:
-                if source_name in self._sources:
-                    blocked_reason = self._source_block_reason(source_name)
-                    if blocked_reason:
-                        source_warnings[source_name] = blocked_reason
-                        continue
-                    source = self._sources[source_name]
-                    future = self._executor.submit(self._safe_search, source, query, page)
-                    futures[future] = source_name
+                source = self._sources.get(source_name)
+                if source is None:
+                    continue
+                blocked_reason = self._block_reason(self._health.get(source_name), now)
+                if blocked_reason:
+                    source_warnings[source_name] = blocked_reason
+                    continue
+                runnable.append((source_name, source))
+
+        for source_name, source in runnable:
+            future = self._executor.submit(self._safe_search, source, query, page)
+            futures[future] = source_name
+            if source_name.lower() in ("http", "opendirectory"):
+                priority_futures.add(future)
 
         if not futures:
             self.event_bus.emit(Events.SEARCH_COMPLETED, {
@@ -267,71 +431,83 @@ class SourceManager:
         pending = set(futures.keys())
         search_started = time.monotonic()
         deadline = search_started + search_timeout_seconds
+        early_return_at = search_started + max(0.0, self._early_return_seconds)
         fast_return_triggered = False
+        priority_pending = len(priority_futures)
+
+        def fast_return_ready() -> bool:
+            if not pending or wait_for_all_sources:
+                return False
+            if len(all_results) < max(1, self._early_return_min_results):
+                return False
+            if time.monotonic() < early_return_at:
+                return False
+            return not (self._prefer_http_completion and priority_pending)
+
+        last_progress_emit = 0.0
+
+        def emit_progress(source_name: str, warning: str) -> None:
+            nonlocal last_progress_emit
+            now = time.monotonic()
+            if completed < total and now - last_progress_emit < _PROGRESS_INTERVAL_SECONDS:
+                return
+            last_progress_emit = now
+            self.event_bus.emit(Events.SEARCH_PROGRESS, {
+                "completed": completed,
+                "total": total,
+                "source": source_name,
+                "warning": warning,
+            })
 
-        while pending:
+        while pending and not fast_return_triggered:
             now = time.monotonic()
             if now >= deadline:
                 break
-
-            # Poll in small slices so we can fast-return even if no new futures complete.
-            done, not_done = wait(
-                pending,
-                timeout=min(0.25, max(0.0, deadline - now)),
-                return_when=FIRST_COMPLETED
-            )
-            pending = set(not_done)
-
-            for future in done:
-                source_name = futures[future]
-                try:
-                    results, warning, attempts, latency_ms, ok = future.result()
-                    all_results.extend(results)
-                    if warning:
-                        source_warnings[source_name] = warning
-                    self._record_source_outcome(
-                        source_name=source_name,
-                        ok=ok,
-                        error_message=warning or "",
-                        latency_ms=latency_ms,
-                        attempts=attempts,
-                    )
-                except Exception as e:
-                    print(f"Search error in {source_name}: {e}")
-                    source_warnings[source_name] = str(e)
-                    self._record_source_outcome(
-                        source_name=source_name,
-                        ok=False,
-                        error_message=str(e),
-                        latency_ms=0.0,
-                        attempts=1,
-                    )
-
-                completed += 1
-                self.event_bus.emit(Events.SEARCH_PROGRESS, {
-                    "completed": completed,
-                    "total": total,
-                    "source": source_name,
-                    "warning": source_warnings.get(source_name, "")
-                })
-
-            elapsed = time.monotonic() - search_started
-            pending_source_names = {futures[f] for f in pending}
-            http_pending = any(name.lower() == "http" for name in pending_source_names)
-            od_pending = any(name.lower() == "opendirectory" for name in pending_source_names)
-            if (
-                pending
-                and len(all_results) >= max(1, self._early_return_min_results)
-                and elapsed >= max(0.0, self._early_return_seconds)
-                and not wait_for_all_sources
-                and not (self._prefer_http_completion and (http_pending or od_pending))
-            ):
+            # Sleep until a source finishes, the early-return window opens, or the deadline hits.
+            wake_at = deadline if now >= early_return_at else min(deadline, early_return_at)
+            try:
+                for future in as_completed(pending, timeout=max(0.0, wake_at - now)):
+                    pending.discard(future)
+                    if future in priority_futures:
+                        priority_pending -= 1
+                    source_name = futures[future]
+                    try:
+                        results, warning, attempts, latency_ms, ok = future.result()
+                        all_results.extend(results)
+                        if warning:
+                            source_warnings[source_name] = warning
+                        self._record_source_outcome(
+                            source_name=source_name,
+                            ok=ok,
+                            error_message=warning or "",
+                            latency_ms=latency_ms,
+                            attempts=attempts,
+                        )
+                    except Exception as e:
+                        logger.warning("Search error in %s: %s", source_name, e)
+                        source_warnings[source_name] = str(e)
+                        self._record_source_outcome(
+                            source_name=source_name,
+                            ok=False,
+                            error_message=str(e),
+                            latency_ms=0.0,
+                            attempts=1,
+                        )
+
+                    completed += 1
+                    emit_progress(source_name, source_warnings.get(source_name, ""))
+                    if fast_return_ready():
+                        fast_return_triggered = True
+                        break
+            except FuturesTimeoutError:
+                pass
+            if not fast_return_triggered and fast_return_ready():
                 fast_return_triggered = True
-                break
 
+        # Cancelling and recording unfinished sources happens off the caller's path.
+        unfinished = []
         for future in pending:
             source_name = futures[future]
-            future.cancel()
             if fast_return_triggered:
                 timeout_message = (
                     f"{source_name} skipped for fast results (slow source deferred)."
@@ -342,56 +518,66 @@ class SourceManager:
                     "results from this source were skipped."
                 )
             source_warnings[source_name] = timeout_message
-            self._record_source_outcome(
-                source_name=source_name,
-                ok=False,
-                error_message=timeout_message,
-                latency_ms=0.0,
-                attempts=1,
-            )
+            unfinished.append((future, source_name, timeout_message))
             completed += 1
-            self.event_bus.emit(Events.SEARCH_PROGRESS, {
-                "completed": completed,
-                "total": total,
-                "source": source_name,
-                "warning": timeout_message
-            })
+            emit_progress(source_name, timeout_message)
+        if unfinished:
+            # Cancel now so sources that never started cannot begin after the
+            # deadline; the janitor only does the health bookkeeping.
+            for future, _source_name, _message in unfinished:
+                future.cancel()
+            self._janitor.submit(self._finalize_pending, unfinished)
         
-        # Deduplicate by infohash
-        unique_results = self._deduplicate(all_results)
+        # Deduplicate by infohash, then aggregate similar items across sources into
+        # one unified entry. Filters apply to the aggregated seeds/size, so they run
+        # after aggregation, fused into a single pass ahead of the sort.
+        unified_results = self._aggregate_results(self._deduplicate(all_results))
+        filtered_results = self._apply_filters(unified_results, filters)
         
-        # Aggregate similar items across sources into one unified result entry.
-        unified_results = self._aggregate_results(unique_results)
-
-        # Apply filters
-        filtered = self._apply_filters(unified_results, filters)
-        
-        # Sort intelligently
-        sorted_results = self._sort_results(filtered)
-        
-        # Paginate
+        # Paginate; only the rows up to the end of this page need ordering.
         start_idx = (page - 1) * per_page
         end_idx = start_idx + per_page
-        paginated = sorted_results[start_idx:end_idx]
+        paginated = self._sort_results(filtered_results, limit=end_idx)[start_idx:end_idx]
         
         # Cache results
-        self._cache.set(query, page, filters, paginated)
+        self._cache.set_by_key(cache_key, paginated)
         
         self.event_bus.emit(Events.SEARCH_COMPLETED, {
             "results": paginated,
             "count": len(paginated),
-            "total": len(sorted_results),
+            "total": len(filtered_results),
             "source_warnings": source_warnings,
             "source_health": self.get_source_health_snapshot(),
         })
         
         return paginated
     
+    def _finalize_pending(self, unfinished: List[Tuple]) -> None:
+        """Record sources a search stopped waiting for as failed."""
+        for _future, source_name, timeout_message in unfinished:
+            self._record_source_outcome(
+                source_name=source_name,
+                ok=False,
+                error_message=timeout_message,
+                latency_ms=0.0,
+                attempts=1,
+            )
+
     def _safe_search(self, source, query: str, page: int) -> Tuple[List[SearchResult], Optional[str], int, float, bool]:
         """
         Safely execute source search with retries and backoff.
         Returns: results, warning, attempts, latency_ms, ok
         """
+        sem = self._source_sems.get(source.name)
+        if sem is not None and not sem.acquire(timeout=self._search_timeout_seconds):
+            return [], f"{source.name} is busy with other searches; skipped.", 1, 0.0, False
+        try:
+            return self._search_with_retries(source, query, page)
+        finally:
+            if sem is not None:
+                sem.release()
+
+    def _search_with_retries(self, source, query: str, page: int) -> Tuple[List[SearchResult], Optional[str], int, float, bool]:
         attempts = 0
         last_warning = ""
         last_latency_ms = 0.0
@@ -409,21 +595,26 @@ class SourceManager:
                         return [], None, attempts, last_latency_ms, True
                     last_warning = warning
                     if attempt < self._max_retries:
-                        time.sleep(self._retry_backoff_seconds * (2 ** attempt))
+                        time.sleep(self._retry_delay(attempt))
                         continue
                     return [], warning, attempts, last_latency_ms, False
                 return results, (warning or None), attempts, last_latency_ms, True
             except Exception as e:
                 last_latency_ms = (time.perf_counter() - start) * 1000.0
                 last_warning = str(e)
-                print(f"Source search error: {e}")
+                logger.warning("Source search error in %s: %s", source.name, e)
                 if attempt < self._max_retries:
-                    time.sleep(self._retry_backoff_seconds * (2 ** attempt))
+                    time.sleep(self._retry_delay(attempt))
                     continue
                 return [], str(e), attempts, last_latency_ms, False
 
         return [], (last_warning or None), attempts, last_latency_ms, False
 
+    def _retry_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff, capped so a retry cannot outlast the search."""
+        delay = random.uniform(0, self._retry_backoff_seconds * (2 ** attempt))
+        return min(delay, self._search_timeout_seconds / 2)
+
     def _is_nonfatal_empty_warning(self, source_name: str, warning: str) -> bool:
         normalized = (warning or "").strip().lower()
         if not normalized:
@@ -432,7 +623,13 @@ class SourceManager:
             return normalized.startswith("no open-directory file links found")
         return False
 
-    def _source_routing_score(self, source_name: str) -> float:
+    def _score_map(self, source_names) -> Dict[str, float]:
+        """Routing scores for source_names, computed once under a single lock hold."""
+        with self._lock:
+            now = time.time()
+            return {name: self._source_routing_score(name, now) for name in source_names}
+
+    def _source_routing_score(self, source_name: str, now: Optional[float] = None) -> float:
         """Higher is better; used to route queries across enabled sources."""
         h = self._health.get(source_name)
         if not h or h.attempts == 0:
@@ -440,14 +637,19 @@ class SourceManager:
         success_rate = h.successes / max(1, h.attempts)
         latency_penalty = min(h.last_latency_ms / 150.0, 25.0)
         failure_penalty = h.consecutive_failures * 8.0
-        circuit_penalty = 40.0 if (h.circuit_open and time.time() < h.cooldown_until) else 0.0
+        if now is None:
+            now = time.time()
+        circuit_penalty = 40.0 if (h.circuit_open and now < h.cooldown_until) else 0.0
         return (40.0 + success_rate * 60.0) - latency_penalty - failure_penalty - circuit_penalty
 
     def _source_block_reason(self, source_name: str) -> str:
-        h = self._health.get(source_name)
+        return self._block_reason(self._health.get(source_name), time.time())
+
+    @staticmethod
+    def _block_reason(h: Optional[SourceHealth], now: float) -> str:
+        """Circuit-breaker gate; caller holds the lock since this may half-open the circuit."""
         if not h:
             return ""
-        now = time.time()
         if h.circuit_open and now < h.cooldown_until:
             h.skipped_due_circuit += 1
             remain = int(max(1, h.cooldown_until - now))
@@ -510,19 +712,13 @@ class SourceManager:
     
     def _apply_filters(self, results: List[SearchResult], filters: Dict) -> List[SearchResult]:
         """Apply search filters"""
-        filtered = results
-        
-        # Min seeds filter
         min_seeds = filters.get("min_seeds", 0)
-        if min_seeds > 0:
-            filtered = [r for r in filtered if r.seeds >= min_seeds]
-        
         # Size range filter (in GB)
         size_min = filters.get("size_min_gb", 0) * 1_000_000_000
         size_max = filters.get("size_max_gb", 999) * 1_000_000_000
-        filtered = [r for r in filtered if size_min <= r.size <= size_max]
-        
-        return filtered
+        if min_seeds > 0:
+            return [r for r in results if r.seeds >= min_seeds and size_min <= r.size <= size_max]
+        return [r for r in results if size_min <= r.size <= size_max]
 
     def _aggregate_results(self, results: List[SearchResult]) -> List[SearchResult]:
         """
@@ -530,6 +726,10 @@ class SourceManager:
         """
         grouped: Dict[str, SearchResult] = {}
         group_meta: Dict[str, Dict] = {}
+        # version -> token -> group keys containing that token; narrows fuzzy matching.
+        token_index: Dict[str, Dict[str, set]] = {}
+        # Per-group url -> candidate map; link_candidates is materialized once at the end.
+        group_candidates: Dict[str, Dict[str, Dict]] = {}
         passthrough: List[SearchResult] = []
 
         for result in results:
@@ -543,34 +743,48 @@ class SourceManager:
 
             resolved_key = key
             if key not in grouped:
-                fuzzy_key = self._find_compatible_group_key(key, group_meta)
+                fuzzy_key = self._find_compatible_group_key(key, group_meta, token_index)
                 if fuzzy_key:
                     resolved_key = fuzzy_key
 
             if resolved_key not in grouped:
                 grouped[resolved_key] = result
                 stem, version = resolved_key.split("|", 1)
+                tokens = set(stem.split())
                 group_meta[resolved_key] = {
                     "version": version,
-                    "tokens": set(stem.split()),
+                    "tokens": tokens,
+                    "order": len(group_meta),
                 }
+                by_token = token_index.setdefault(version, {})
+                for token in tokens:
+                    by_token.setdefault(token, set()).add(resolved_key)
             else:
-                grouped[resolved_key] = self._merge_result(grouped[resolved_key], result)
+                candidates = group_candidates.get(resolved_key)
+                if candidates is None:
+                    candidates = group_candidates[resolved_key] = self._candidate_index(grouped[resolved_key])
+                grouped[resolved_key] = self._merge_result(grouped[resolved_key], result, candidates)
 
+        for resolved_key, candidates in group_candidates.items():
+            self._finalize_candidates(grouped[resolved_key], candidates)
         return list(grouped.values()) + passthrough
 
-    def _find_compatible_group_key(self, key: str, group_meta: Dict[str, Dict]) -> str:
+    def _find_compatible_group_key(self, key: str, group_meta: Dict[str, Dict], token_index: Dict[str, Dict[str, set]]) -> str:
         """Find an existing grouping key with same version and strong name overlap."""
         stem, version = key.split("|", 1)
         tokens = set(stem.split())
         if not tokens:
             return ""
-        for existing_key, meta in group_meta.items():
-            if meta.get("version") != version:
-                continue
-            existing_tokens = meta.get("tokens", set())
-            if not existing_tokens:
-                continue
+        by_token = token_index.get(version)
+        if not by_token:
+            return ""
+        # Only groups sharing at least one token can reach the similarity threshold.
+        candidates = set()
+        for token in tokens:
+            candidates.update(by_token.get(token, ()))
+        # Earliest-created group wins, matching a scan in insertion order.
+        for existing_key in sorted(candidates, key=lambda k: group_meta[k]["order"]):
+            existing_tokens = group_meta[existing_key]["tokens"]
             inter = len(tokens & existing_tokens)
             union = len(tokens | existing_tokens)
             similarity = inter / union if union else 0.0
@@ -578,35 +792,40 @@ class SourceManager:
                 return existing_key
         return ""
 
-    def _merge_result(self, base: SearchResult, incoming: SearchResult) -> SearchResult:
-        """Merge another result into the base unified entry."""
-        self._ensure_link_candidate(base, incoming)
+    def _merge_result(self, base: SearchResult, incoming: SearchResult, candidates: Optional[Dict[str, Dict]] = None) -> SearchResult:
+        """Merge another result into the base unified entry.
+
+        When ``candidates`` (url -> candidate for base) is given, link_candidates is
+        left for the caller to materialize with _finalize_candidates.
+        """
+        standalone = candidates is None
+        if standalone:
+            candidates = self._candidate_index(base)
+
+        url = (incoming.magnet or "").strip()
+        if url:
+            quality = self._link_quality(incoming)
+            existing = candidates.get(url)
+            if existing is not None:
+                existing["quality"] = max(existing.get("quality", 0), quality)
+            else:
+                candidates[url] = {
+                    "url": url,
+                    "source": incoming.source,
+                    "quality": quality,
+                    "seeds": incoming.seeds,
+                    "leeches": incoming.leeches,
+                    "size": incoming.size,
+                }
+        for candidate in incoming.link_candidates:
+            candidate_url = (candidate.get("url") or "").strip()
+            if candidate_url:
+                candidates.setdefault(candidate_url, candidate)
 
         for source_name in [base.source, incoming.source]:
             if source_name and source_name not in base.aggregated_sources:
                 base.aggregated_sources.append(source_name)
 
-        # Merge and de-dup link candidates.
-        seen = set()
-        merged_candidates = []
-        for candidate in base.link_candidates + incoming.link_candidates:
-            url = (candidate.get("url") or "").strip()
-            if not url:
-                continue
-            if url in seen:
-                continue
-            seen.add(url)
-            merged_candidates.append(candidate)
-
-        merged_candidates.sort(key=lambda c: c.get("quality", 0), reverse=True)
-        base.link_candidates = merged_candidates
-
-        # Best candidate becomes primary download link.
-        if merged_candidates:
-            best = merged_candidates[0]
-            base.magnet = best.get("url", base.magnet)
-            base.link_quality = int(best.get("quality", 0))
-
         # Prefer better availability for display/ranking.
         if incoming.seeds > base.seeds:
             base.seeds = incoming.seeds
@@ -623,8 +842,29 @@ class SourceManager:
         source_count = len(base.aggregated_sources)
         if source_count > 1:
             base.source = f"{base.aggregated_sources[0]} +{source_count - 1}"
+        if standalone:
+            self._finalize_candidates(base, candidates)
         return base
 
+    @staticmethod
+    def _candidate_index(result: SearchResult) -> Dict[str, Dict]:
+        index: Dict[str, Dict] = {}
+        for candidate in result.link_candidates:
+            url = (candidate.get("url") or "").strip()
+            if url:
+                index.setdefault(url, candidate)
+        return index
+
+    @staticmethod
+    def _finalize_candidates(base: SearchResult, candidates: Dict[str, Dict]) -> None:
+        """Sort merged candidates by quality; the best one becomes the primary link."""
+        ordered = sorted(candidates.values(), key=lambda c: c.get("quality", 0), reverse=True)
+        base.link_candidates = ordered
+        if ordered:
+            best = ordered[0]
+            base.magnet = best.get("url", base.magnet)
+            base.link_quality = int(best.get("quality", 0))
+
     def _ensure_link_candidate(self, target: SearchResult, source_result: SearchResult):
         """Ensure source_result link exists inside target.link_candidates."""
         if not target.aggregated_sources:
@@ -669,33 +909,18 @@ class SourceManager:
             return score
 
         # HTTP/direct links
-        parsed = urlparse(link)
-        host = (parsed.netloc or "").lower()
-        path = (parsed.path or "").lower()
+        scheme, host, path = _split_link(link)
 
-        if parsed.scheme == "https":
+        if scheme == "https":
             score += 25
-        if any(path.endswith(ext) for ext in [".zip", ".rar", ".7z", ".dmg", ".pkg", ".exe", ".msi", ".iso"]):
+        if path.endswith(_DL_EXTS):
             score += 30
         if "/file/" in path or "/download/" in path or "/dl/" in path:
             score += 20
 
-        host_weights = {
-            "rapidgator": 22,
-            "nitroflare": 20,
-            "katfile": 17,
-            "ddownload": 17,
-            "turbobit": 14,
-            "uploadgig": 14,
-            "mega.nz": 24,
-            "mediafire": 18,
-            "pixeldrain": 16,
-            "workupload": 12,
-        }
-        for key, weight in host_weights.items():
-            if key in host:
-                score += weight
-                break
+        m = _HOST_RE.search(host)
+        if m:
+            score += _HOST_WEIGHTS[m.group(0)]
 
         # Mild quality proxy by file size when available.
         if result.size > 0:
@@ -708,19 +933,14 @@ class SourceManager:
         Keeps version in key so 2023 and 2024 do not collapse.
         """
         title = (result.title or "").lower()
-        title = re.sub(r"\[[^\]]+\]|\([^)]+\)", " ", title)
-        title = re.sub(r"[^a-z0-9.+]+", " ", title).strip()
+        title = _RE_BRACKETS.sub(" ", title)
+        title = _RE_NONWORD.sub(" ", title).strip()
         if not title:
             return ""
 
         version = self._extract_version_key(title)
         tokens = [t for t in title.split() if t and not t.isdigit()]
-        stop = {
-            "x64", "x86", "win", "windows", "mac", "linux", "multilingual", "incl",
-            "keygen", "crack", "repack", "proper", "portable", "final", "build",
-            "adobe", "microsoft", "corel", "apple",
-        }
-        core = [t for t in tokens if t not in stop]
+        core = [t for t in tokens if t not in _CONTENT_STOPWORDS]
         if not core:
             core = tokens
         stem = " ".join(core[:6]).strip()
@@ -729,13 +949,8 @@ class SourceManager:
         return f"{stem}|{version or 'nover'}"
 
     def _extract_version_key(self, title: str) -> str:
-        patterns = [
-            r"\b(20\d{2}(?:\.\d+)*)\b",
-            r"\bv(\d+(?:\.\d+){0,3})\b",
-            r"\b(\d+\.\d+(?:\.\d+)*)\b",
-        ]
-        for pattern in patterns:
-            m = re.search(pattern, title)
+        for pattern in _VERSION_PATTERNS:
+            m = pattern.search(title)
             if m:
                 return m.group(1)
         return ""
@@ -743,13 +958,13 @@ class SourceManager:
     def _title_specificity_score(self, title: str) -> int:
         t = (title or "").lower()
         score = len(t)
-        if re.search(r"\b20\d{2}\b", t):
+        if _RE_YEAR_BARE.search(t):
             score += 30
-        if re.search(r"\bv\d+(\.\d+)*\b", t):
+        if _RE_V_BARE.search(t):
             score += 20
         return score
     
-    def _sort_results(self, results: List[SearchResult]) -> List[SearchResult]:
+    def _sort_results(self, results: List[SearchResult], limit: Optional[int] = None) -> List[SearchResult]:
         """
         Intelligent sorting with version awareness:
         1. Detect version numbers in titles
@@ -767,51 +982,16 @@ class SourceManager:
         1. Photoshop 2024 (newest version, good seeds)
         2. Photoshop 2023 (older version but high seeds)
         3. GIMP 2.10
+
+        With ``limit``, only the first ``limit`` results of that order are returned.
         """
-        import re
-        
         # Enhanced sorting: version-aware + seeds + size
-        def sort_key(result: SearchResult):
-            title = result.title.lower()
-            
-            # Extract version number if present
-            # Patterns: v1.2.3, 2023, version 4.5, etc.
-            version_match = re.search(r'v?(\d+)\.?(\d*)\.?(\d*)', title)
-            version_score = 0
-            
-            if version_match:
-                # Convert version to comparable number
-                # v2024.1.0 = 2024010000
-                # v1.2.3 = 1020300
-                major = int(version_match.group(1) or 0)
-                minor = int(version_match.group(2) or 0)
-                patch = int(version_match.group(3) or 0)
-                version_score = (major * 1000000) + (minor * 1000) + patch
-            
-            # Detect quality indicators in title
-            quality_bonus = 0
-            if any(term in title for term in ['repack', 'proper', 'real']):
-                quality_bonus += 10
-            if 'crack' in title or 'keygen' in title:
-                quality_bonus += 5
-            if '1080p' in title or '4k' in title:
-                quality_bonus += 8
-            
-            # Primary sort: seeds (most important for availability)
-            # Secondary: version (newer is better)
-            # Tertiary: size (larger usually means better quality)
-            # Quaternary: quality indicators
-            
-            return (
-                -result.seeds,  # Negative for descending (more seeds = better)
-                -getattr(result, "link_quality", 0),  # Better HTTP/torrent link candidate first
-                -version_score,  # Negative for descending (higher version = better)
-                -result.size,  # Negative for descending (larger = better)
-                -quality_bonus  # Negative for descending
-            )
-        
-        return sorted(results, key=sort_key)
+        if limit is not None and limit < len(results):
+            # Same order as sorted(...)[:limit] in O(n log limit).
+            return heapq.nsmallest(limit, results, key=_result_sort_key)
+        return sorted(results, key=_result_sort_key)
     
     def shutdown(self):
-        """Shutdown executor"""
+        """Shutdown executors"""
         self._executor.shutdown(wait=False)
+        self._janitor.shutdown(wait=False)
@@ -3,62 +3,97 @@ SQLite-backed store for users, sessions, profiles, and profile-scoped settings.
 
 Design goals:
 - Local-first (works in contained app and on a server).
-- No external Python dependencies (uses stdlib sqlite3 + PBKDF2).
+- No external Python dependencies (uses stdlib sqlite3 + scrypt).
 - Profile-scoped settings are stored as one JSON blob per profile.
 """
 
 from __future__ import annotations
 
+import functools
 import json
+import queue
 import secrets
 import sqlite3
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from pathlib import Path
-from threading import RLock
-from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import hashlib
 import hmac
 
 
+# (whole second, "YYYY-MM-DDTHH:MM:SS") for the last second formatted.
+_iso_second: Tuple[int, str] = (-1, "")
+
+
+def _utc_iso(ts: float) -> str:
+    """Fixed-width UTC timestamp with microseconds, e.g. 2024-01-02T03:04:05.000006Z."""
+    global _iso_second
+    sec = int(ts)
+    cached_sec, prefix = _iso_second
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _iso_second = (sec, prefix)
+    return "%s.%06dZ" % (prefix, int((ts - sec) * 1_000_000))
+
+
 def _utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    return _utc_iso(time.time())
 
 
-def _parse_iso(ts: str) -> float:
-    try:
-        if ts.endswith("Z"):
-            ts = ts[:-1] + "+00:00"
-        return datetime.fromisoformat(ts).timestamp()
-    except Exception:
-        return 0.0
+_SCRYPT_N = 2 ** 15
+_SCRYPT_R = 8
+_SCRYPT_P = 1
 
 
 def _pbkdf2_hash(password: str, salt: bytes, iters: int = 150_000) -> bytes:
     return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, int(iters))
 
 
+def _scrypt_hash(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    # 128 * r * n bytes of working memory; leave headroom over OpenSSL's 32 MiB default cap.
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=256 * r * n + (1 << 20), dklen=32
+    )
+
+
 def hash_password(password: str) -> str:
     salt = secrets.token_bytes(16)
-    iters = 150_000
-    digest = _pbkdf2_hash(password, salt, iters)
-    return f"pbkdf2_sha256${iters}${salt.hex()}${digest.hex()}"
+    digest = _scrypt_hash(password, salt, _SCRYPT_N, _SCRYPT_R, _SCRYPT_P)
+    return f"scrypt$n={_SCRYPT_N},r={_SCRYPT_R},p={_SCRYPT_P}${salt.hex()}${digest.hex()}"
+
+
+def password_needs_rehash(encoded: str) -> bool:
+    """True for hashes not in the current scrypt format (e.g. legacy PBKDF2)."""
+    return not encoded.startswith(f"scrypt$n={_SCRYPT_N},r={_SCRYPT_R},p={_SCRYPT_P}$")
 
 
 def verify_password(password: str, encoded: str) -> bool:
     try:
-        algo, iters_s, salt_hex, digest_hex = encoded.split("$", 3)
-        if algo != "pbkdf2_sha256":
-            return False
+        algo, params, salt_hex, digest_hex = encoded.split("$", 3)
         salt = bytes.fromhex(salt_hex)
         expected = bytes.fromhex(digest_hex)
-        got = _pbkdf2_hash(password, salt, int(iters_s))
+        if algo == "scrypt":
+            cost = dict(item.split("=", 1) for item in params.split(","))
+            got = _scrypt_hash(password, salt, int(cost["n"]), int(cost["r"]), int(cost["p"]))
+        elif algo == "pbkdf2_sha256":
+            got = _pbkdf2_hash(password, salt, int(params))
+        else:
+            return False
         return hmac.compare_digest(expected, got)
     except Exception:
         return False
 
 
+@functools.lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    """Hash checked when a username is unknown so authenticate costs the same either way."""
+    return hash_password(secrets.token_hex(8))
+
+
 @dataclass(frozen=True)
 class UserRow:
     id: int
@@ -75,39 +110,151 @@ class ProfileRow:
     theme_id: str
 
 
+_READER_POOL_SIZE = 4
+_SESSION_CACHE_SIZE = 4096
+
+# Child tables first to avoid FK issues. users is AUTOINCREMENT, so sqlite_sequence exists.
+_RESET_SCRIPT = """
+BEGIN IMMEDIATE;
+DELETE FROM sessions;
+DELETE FROM profile_settings;
+DELETE FROM user_settings;
+DELETE FROM profiles;
+DELETE FROM users;
+DELETE FROM sqlite_sequence WHERE name = 'users';
+COMMIT;
+"""
+
+# Per-connection tuning shared by the writer and the read pool.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout=30000;",
+    "PRAGMA cache_size=-65536;",  # 64 MiB page cache (negative = KiB)
+    "PRAGMA mmap_size=268435456;",  # 256 MiB
+    "PRAGMA temp_store=MEMORY;",
+)
+
+# Statements used on request paths. sqlite3 keeps a per-connection cache of
+# compiled statements keyed by SQL text, so these are parsed once per connection.
+_SQL_INSERT_USER = "INSERT INTO users(username,password_hash,role,created_at) VALUES (?,?,?,?)"
+_SQL_GET_USER_BY_NAME = "SELECT id, username, role, password_hash FROM users WHERE username = ?"
+_SQL_SET_PASSWORD_HASH = "UPDATE users SET password_hash = ? WHERE id = ?"
+_SQL_PURGE_EXPIRED_SESSIONS = "DELETE FROM sessions WHERE expires_at_unix <= ?"
+_SQL_INSERT_SESSION = (
+    "INSERT INTO sessions(token,user_id,profile_id,created_at,expires_at,expires_at_unix) VALUES (?,?,?,?,?,?)"
+)
+_SQL_DELETE_SESSION = "DELETE FROM sessions WHERE token = ?"
+_SQL_GET_SESSION = """
+SELECT s.token, s.profile_id, s.expires_at_unix, u.id as user_id, u.username, u.role
+FROM sessions s
+JOIN users u ON u.id = s.user_id
+WHERE s.token = ? AND s.expires_at_unix > ?
+"""
+_SQL_SET_SESSION_PROFILE = "UPDATE sessions SET profile_id = ? WHERE token = ?"
+_SQL_LIST_PROFILES = (
+    "SELECT id, user_id, name, avatar, theme_id FROM profiles WHERE user_id = ? ORDER BY created_at ASC"
+)
+_SQL_GET_PROFILE = "SELECT id, user_id, name, avatar, theme_id FROM profiles WHERE id = ?"
+_SQL_INSERT_PROFILE = "INSERT INTO profiles(id,user_id,name,avatar,theme_id,created_at) VALUES (?,?,?,?,?,?)"
+_SQL_GET_PROFILE_SETTINGS = "SELECT settings_json FROM profile_settings WHERE profile_id = ?"
+_SQL_GET_USER_SETTINGS = "SELECT settings_json FROM user_settings WHERE user_id = ?"
+_SQL_UPSERT_PROFILE_SETTINGS = """
+INSERT INTO profile_settings(profile_id,settings_json,updated_at)
+VALUES (?,?,?)
+ON CONFLICT(profile_id) DO UPDATE SET settings_json=excluded.settings_json, updated_at=excluded.updated_at
+"""
+_SQL_UPSERT_USER_SETTINGS = """
+INSERT INTO user_settings(user_id,settings_json,updated_at)
+VALUES (?,?,?)
+ON CONFLICT(user_id) DO UPDATE SET settings_json=excluded.settings_json, updated_at=excluded.updated_at
+"""
+
+
+def _apply_pragmas(conn: sqlite3.Connection) -> None:
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+
+
 class SqliteStore:
     def __init__(self, data_dir: Path):
-        self._lock = RLock()
+        # Serializes writes on self._conn; reads use the read-only pool below and never
+        # take it. Write paths do not nest, so a plain Lock suffices.
+        self._lock = Lock()
         self._db_path = Path(data_dir) / "pluggy.db"
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+        # Autocommit mode: write paths open their own BEGIN IMMEDIATE transactions.
+        self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False, isolation_level=None)
         self._conn.row_factory = sqlite3.Row
-        with self._conn:
-            self._conn.execute("PRAGMA journal_mode=WAL;")
-            self._conn.execute("PRAGMA synchronous=NORMAL;")
-            self._conn.execute("PRAGMA foreign_keys=ON;")
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        self._conn.execute("PRAGMA foreign_keys=ON;")
+        _apply_pragmas(self._conn)
         self._migrate()
+        # WAL lets these read-only connections run alongside the writer.
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(_READER_POOL_SIZE):
+            self._readers.put(self._open_reader())
+        # token -> (user, profile_id, expires_at epoch), LRU order. _session_gen bumps on
+        # every invalidation so a lookup racing a write never caches the stale row.
+        self._session_cache: "OrderedDict[str, Tuple[UserRow, Optional[str], float]]" = OrderedDict()
+        self._session_cache_lock = Lock()
+        self._session_gen = 0
+
+    def _invalidate_sessions(self, token: Optional[str] = None, profile_id: Optional[str] = None) -> None:
+        """Drop cached sessions by token, by profile, or all when neither is given."""
+        with self._session_cache_lock:
+            self._session_gen += 1
+            if token is not None:
+                self._session_cache.pop(token, None)
+            elif profile_id is not None:
+                for key in [k for k, v in self._session_cache.items() if v[1] == profile_id]:
+                    del self._session_cache[key]
+            else:
+                self._session_cache.clear()
+
+    def _open_reader(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(f"{self._db_path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        _apply_pragmas(conn)
+        conn.execute("PRAGMA query_only=ON;")
+        return conn
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection from the pool."""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
 
     @property
     def db_path(self) -> Path:
         return self._db_path
 
+    @contextmanager
+    def _immediate(self) -> Iterator[None]:
+        """Write transaction that takes SQLite's write lock up front (caller holds _lock)."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
     def reset_local_data(self) -> None:
         """Remove user/profile/session/settings rows while keeping schema intact."""
-        with self._lock, self._conn:
-            # Child tables first to avoid FK issues.
-            for table in ("sessions", "profile_settings", "user_settings", "profiles", "users"):
-                self._conn.execute(f"DELETE FROM {table}")
+        with self._lock:
             try:
-                self._conn.execute(
-                    "DELETE FROM sqlite_sequence WHERE name IN ('users')"
-                )
-            except Exception:
-                # sqlite_sequence may not exist yet if AUTOINCREMENT was never used.
-                pass
+                self._conn.executescript(_RESET_SCRIPT)
+            except BaseException:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
+        self._invalidate_sessions()
 
     def _migrate(self) -> None:
-        with self._lock, self._conn:
+        with self._lock, self._immediate():
             self._conn.execute(
                 "CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)"
             )
@@ -172,11 +319,27 @@ class SqliteStore:
                 )
                 """
             )
+            # list_profiles filters by user and orders by creation; the user delete
+            # cascade looks sessions up by user. user_settings is keyed by user_id.
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_profiles_user_created ON profiles(user_id, created_at)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_sessions_user ON sessions(user_id)")
+
+            version = int(self._conn.execute("SELECT version FROM schema_version").fetchone()["version"])
+            if version < 2:
+                # v2: integer session expiry so lookups filter in SQL instead of parsing ISO text.
+                self._conn.execute("ALTER TABLE sessions ADD COLUMN expires_at_unix INTEGER")
+                self._conn.execute(
+                    "UPDATE sessions SET expires_at_unix = CAST(strftime('%s', expires_at) AS INTEGER)"
+                )
+                self._conn.execute("CREATE INDEX IF NOT EXISTS ix_sessions_exp ON sessions(expires_at_unix)")
+                self._conn.execute("UPDATE schema_version SET version = 2")
 
     # ---- Users ----
     def count_users(self) -> int:
-        with self._lock:
-            row = self._conn.execute("SELECT COUNT(1) AS n FROM users").fetchone()
+        with self._reader() as conn:
+            row = conn.execute("SELECT COUNT(1) AS n FROM users").fetchone()
             return int(row["n"] if row else 0)
 
     def create_user(self, username: str, password: str, role: str = "user") -> UserRow:
@@ -187,9 +350,9 @@ class SqliteStore:
             raise ValueError("password is required")
         safe_role = "admin" if role == "admin" else "user"
         pw_hash = hash_password(password)
-        with self._lock, self._conn:
+        with self._lock, self._immediate():
             cur = self._conn.execute(
-                "INSERT INTO users(username,password_hash,role,created_at) VALUES (?,?,?,?)",
+                _SQL_INSERT_USER,
                 (normalized, pw_hash, safe_role, _utc_now_iso()),
             )
             user_id = int(cur.lastrowid)
@@ -199,66 +362,83 @@ class SqliteStore:
         normalized = (username or "").strip().lower()
         if not normalized or not password:
             return None
-        with self._lock:
-            row = self._conn.execute(
-                "SELECT id, username, role, password_hash FROM users WHERE username = ?",
+        with self._reader() as conn:
+            row = conn.execute(
+                _SQL_GET_USER_BY_NAME,
                 (normalized,),
             ).fetchone()
         if not row:
+            verify_password(password, _dummy_hash())
             return None
-        if not verify_password(password, str(row["password_hash"])):
+        encoded = str(row["password_hash"])
+        if not verify_password(password, encoded):
             return None
+        if password_needs_rehash(encoded):
+            # Upgrade legacy hashes while the plaintext is at hand; hash before taking the writer.
+            upgraded = hash_password(password)
+            with self._lock, self._immediate():
+                self._conn.execute(_SQL_SET_PASSWORD_HASH, (upgraded, int(row["id"])))
         return UserRow(id=int(row["id"]), username=str(row["username"]), role=str(row["role"] or "user"))
 
     # ---- Sessions ----
     def create_session(self, user_id: int, ttl_seconds: int = 60 * 60 * 24 * 7) -> str:
         token = secrets.token_urlsafe(32)
-        now = _utc_now_iso()
-        exp = datetime.fromtimestamp(time.time() + int(ttl_seconds), tz=timezone.utc).isoformat().replace("+00:00", "Z")
-        with self._lock, self._conn:
+        issued = time.time()
+        now = _utc_iso(issued)
+        exp_unix = int(issued + int(ttl_seconds))
+        exp = _utc_iso(exp_unix)
+        with self._lock, self._immediate():
+            # Expired rows are never returned by get_session; clear them out here.
+            self._conn.execute(_SQL_PURGE_EXPIRED_SESSIONS, (int(issued),))
             self._conn.execute(
-                "INSERT INTO sessions(token,user_id,profile_id,created_at,expires_at) VALUES (?,?,?,?,?)",
-                (token, int(user_id), None, now, exp),
+                _SQL_INSERT_SESSION,
+                (token, int(user_id), None, now, exp, exp_unix),
             )
         return token
 
     def delete_session(self, token: str) -> None:
         if not token:
             return
-        with self._lock, self._conn:
-            self._conn.execute("DELETE FROM sessions WHERE token = ?", (token,))
+        with self._lock, self._immediate():
+            self._conn.execute(_SQL_DELETE_SESSION, (token,))
+        self._invalidate_sessions(token=token)
 
     def get_session(self, token: str) -> Optional[Tuple[UserRow, Optional[str]]]:
         if not token:
             return None
-        with self._lock:
-            row = self._conn.execute(
-                """
-                SELECT s.token, s.profile_id, s.expires_at, u.id as user_id, u.username, u.role
-                FROM sessions s
-                JOIN users u ON u.id = s.user_id
-                WHERE s.token = ?
-                """,
-                (token,),
-            ).fetchone()
+        with self._session_cache_lock:
+            cached = self._session_cache.get(token)
+            if cached is not None:
+                self._session_cache.move_to_end(token)
+            gen = self._session_gen
+        if cached is not None:
+            user, profile_id, expires_at = cached
+            if expires_at > time.time():
+                return user, profile_id
+        with self._reader() as conn:
+            row = conn.execute(_SQL_GET_SESSION, (token, int(time.time()))).fetchone()
         if not row:
             return None
-        if _parse_iso(str(row["expires_at"])) < time.time():
-            self.delete_session(token)
-            return None
+        expires_at = int(row["expires_at_unix"])
         user = UserRow(id=int(row["user_id"]), username=str(row["username"]), role=str(row["role"] or "user"))
         profile_id = str(row["profile_id"]) if row["profile_id"] else None
+        with self._session_cache_lock:
+            if gen == self._session_gen:
+                self._session_cache[token] = (user, profile_id, expires_at)
+                if len(self._session_cache) > _SESSION_CACHE_SIZE:
+                    self._session_cache.popitem(last=False)
         return user, profile_id
 
     def set_session_profile(self, token: str, profile_id: Optional[str]) -> None:
-        with self._lock, self._conn:
-            self._conn.execute("UPDATE sessions SET profile_id = ? WHERE token = ?", (profile_id, token))
+        with self._lock, self._immediate():
+            self._conn.execute(_SQL_SET_SESSION_PROFILE, (profile_id, token))
+        self._invalidate_sessions(token=token)
 
     # ---- Profiles ----
     def list_profiles(self, user_id: int) -> List[ProfileRow]:
-        with self._lock:
-            rows = self._conn.execute(
-                "SELECT id, user_id, name, avatar, theme_id FROM profiles WHERE user_id = ? ORDER BY created_at ASC",
+        with self._reader() as conn:
+            rows = conn.execute(
+                _SQL_LIST_PROFILES,
                 (int(user_id),),
             ).fetchall()
         out: List[ProfileRow] = []
@@ -280,19 +460,39 @@ class SqliteStore:
             raise ValueError("Profile limit reached (8).")
         safe_name = (name or "").strip() or f"Profile {len(existing) + 1}"
         profile_id = f"pf_{secrets.token_hex(8)}"
-        with self._lock, self._conn:
+        with self._lock, self._immediate():
             self._conn.execute(
-                "INSERT INTO profiles(id,user_id,name,avatar,theme_id,created_at) VALUES (?,?,?,?,?,?)",
+                _SQL_INSERT_PROFILE,
                 (profile_id, int(user_id), safe_name, "", "", _utc_now_iso()),
             )
         return ProfileRow(id=profile_id, user_id=int(user_id), name=safe_name, avatar="", theme_id="")
 
+    def create_profiles_bulk(self, user_id: int, names: List[str]) -> List[ProfileRow]:
+        """Create several profiles for one user in a single transaction."""
+        uid = int(user_id)
+        with self._lock, self._immediate():
+            row = self._conn.execute("SELECT COUNT(1) AS n FROM profiles WHERE user_id = ?", (uid,)).fetchone()
+            count = int(row["n"] if row else 0)
+            if count + len(names) > 8:
+                raise ValueError("Profile limit reached (8).")
+            created: List[ProfileRow] = []
+            for name in names:
+                count += 1
+                safe_name = (name or "").strip() or f"Profile {count}"
+                created.append(ProfileRow(id=f"pf_{secrets.token_hex(8)}", user_id=uid, name=safe_name, avatar="", theme_id=""))
+            now = _utc_now_iso()
+            self._conn.executemany(
+                _SQL_INSERT_PROFILE,
+                [(p.id, uid, p.name, "", "", now) for p in created],
+            )
+        return created
+
     def get_profile(self, profile_id: str) -> Optional[ProfileRow]:
         if not profile_id:
             return None
-        with self._lock:
-            r = self._conn.execute(
-                "SELECT id, user_id, name, avatar, theme_id FROM profiles WHERE id = ?",
+        with self._reader() as conn:
+            r = conn.execute(
+                _SQL_GET_PROFILE,
                 (profile_id,),
             ).fetchone()
         if not r:
@@ -309,7 +509,7 @@ class SqliteStore:
         if not profile_id:
             return
         safe = (theme_id or "").strip()
-        with self._lock, self._conn:
+        with self._lock, self._immediate():
             self._conn.execute("UPDATE profiles SET theme_id = ? WHERE id = ?", (safe, profile_id))
 
     def update_profile(self, profile_id: str, *, name: Optional[str] = None, avatar: Optional[str] = None, theme_id: Optional[str] = None) -> None:
@@ -329,22 +529,21 @@ class SqliteStore:
         if not sets:
             return
         values.append(profile_id)
-        with self._lock, self._conn:
+        with self._lock, self._immediate():
             self._conn.execute(f"UPDATE profiles SET {', '.join(sets)} WHERE id = ?", tuple(values))
 
     def delete_profile(self, profile_id: str) -> None:
         if not profile_id:
             return
-        with self._lock, self._conn:
+        with self._lock, self._immediate():
             self._conn.execute("DELETE FROM profiles WHERE id = ?", (profile_id,))
+        # Sessions pointing at the profile were reset to NULL by the foreign key.
+        self._invalidate_sessions(profile_id=profile_id)
 
     # ---- Profile/User Settings ----
     def get_profile_settings(self, profile_id: str) -> Optional[Dict[str, Any]]:
-        with self._lock:
-            r = self._conn.execute(
-                "SELECT settings_json FROM profile_settings WHERE profile_id = ?",
-                (profile_id,),
-            ).fetchone()
+        with self._reader() as conn:
+            r = conn.execute(_SQL_GET_PROFILE_SETTINGS, (profile_id,)).fetchone()
         if not r:
             return None
         try:
@@ -352,24 +551,55 @@ class SqliteStore:
         except Exception:
             return None
 
+    def get_profile_setting(self, profile_id: str, key: str, default: Any = None) -> Any:
+        """Read one top-level key, extracted by SQLite instead of decoding the whole blob."""
+        if '"' in key:
+            # JSON path labels cannot carry quotes; fall back to the full document.
+            return (self.get_profile_settings(profile_id) or {}).get(key, default)
+        path = f'$."{key}"'
+        with self._reader() as conn:
+            r = conn.execute(
+                "SELECT json_type(settings_json, ?) AS kind, json_extract(settings_json, ?) AS value "
+                "FROM profile_settings WHERE profile_id = ?",
+                (path, path, profile_id),
+            ).fetchone()
+        if not r or r["kind"] is None:
+            return default
+        kind, value = r["kind"], r["value"]
+        if kind in ("object", "array"):
+            return json.loads(value)
+        if kind in ("true", "false"):
+            return bool(value)
+        return value
+
     def set_profile_settings(self, profile_id: str, settings: Dict[str, Any]) -> None:
         payload = json.dumps(settings, sort_keys=True)
-        with self._lock, self._conn:
+        with self._lock, self._immediate():
+            self._conn.execute(_SQL_UPSERT_PROFILE_SETTINGS, (profile_id, payload, _utc_now_iso()))
+
+    def set_profile_settings_bulk(self, settings_by_profile: Dict[str, Dict[str, Any]]) -> None:
+        """Upsert settings for many profiles in one statement and one transaction."""
+        if not settings_by_profile:
+            return
+        now = _utc_now_iso()
+        rows = json.dumps([
+            {"id": profile_id, "settings": json.dumps(settings, sort_keys=True), "updated_at": now}
+            for profile_id, settings in settings_by_profile.items()
+        ])
+        with self._lock, self._immediate():
             self._conn.execute(
                 """
                 INSERT INTO profile_settings(profile_id,settings_json,updated_at)
-                VALUES (?,?,?)
+                SELECT json_extract(value, '$.id'), json_extract(value, '$.settings'), json_extract(value, '$.updated_at')
+                FROM json_each(?) WHERE true
                 ON CONFLICT(profile_id) DO UPDATE SET settings_json=excluded.settings_json, updated_at=excluded.updated_at
                 """,
-                (profile_id, payload, _utc_now_iso()),
+                (rows,),
             )
 
     def get_user_settings(self, user_id: int) -> Optional[Dict[str, Any]]:
-        with self._lock:
-            r = self._conn.execute(
-                "SELECT settings_json FROM user_settings WHERE user_id = ?",
-                (int(user_id),),
-            ).fetchone()
+        with self._reader() as conn:
+            r = conn.execute(_SQL_GET_USER_SETTINGS, (int(user_id),)).fetchone()
         if not r:
             return None
         try:
@@ -379,12 +609,25 @@ class SqliteStore:
 
     def set_user_settings(self, user_id: int, settings: Dict[str, Any]) -> None:
         payload = json.dumps(settings, sort_keys=True)
-        with self._lock, self._conn:
+        with self._lock, self._immediate():
+            self._conn.execute(_SQL_UPSERT_USER_SETTINGS, (int(user_id), payload, _utc_now_iso()))
+
+    def set_user_settings_bulk(self, settings_by_user: Dict[int, Dict[str, Any]]) -> None:
+        """Upsert settings for many users in one statement and one transaction."""
+        if not settings_by_user:
+            return
+        now = _utc_now_iso()
+        rows = json.dumps([
+            {"id": int(user_id), "settings": json.dumps(settings, sort_keys=True), "updated_at": now}
+            for user_id, settings in settings_by_user.items()
+        ])
+        with self._lock, self._immediate():
             self._conn.execute(
                 """
                 INSERT INTO user_settings(user_id,settings_json,updated_at)
-                VALUES (?,?,?)
+                SELECT json_extract(value, '$.id'), json_extract(value, '$.settings'), json_extract(value, '$.updated_at')
+                FROM json_each(?) WHERE true
                 ON CONFLICT(user_id) DO UPDATE SET settings_json=excluded.settings_json, updated_at=excluded.updated_at
                 """,
-                (int(user_id), payload, _utc_now_iso()),
+                (rows,),
             )
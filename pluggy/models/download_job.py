@@ -3,9 +3,9 @@ Download Job Model
 Tracks download state with pause/resume/cancel capabilities
 """
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Optional, Tuple
 from pathlib import Path
-import threading
+import sys
 import time
 from enum import Enum
 
@@ -21,7 +21,11 @@ class JobStatus(Enum):
     ERROR = "error"
 
 
-@dataclass
+# slots=True is only accepted on Python 3.10+.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class DownloadJob:
     """Represents a download job with progress tracking"""
     job_id: str
@@ -39,40 +43,43 @@ class DownloadJob:
     error: Optional[str] = None
     status_detail: str = ""
     
-    # Control events
-    _pause_event: threading.Event = field(default_factory=threading.Event, repr=False)
-    _cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    # Control flags; plain bools so the per-chunk checks don't take an Event's lock
+    _paused: bool = field(default=False, repr=False)
+    _cancelled: bool = field(default=False, repr=False)
     
     # Timing
     start_time: float = field(default_factory=time.time)
     end_time: Optional[float] = None
     
+    # (speed_kbps, text) memo for speed_formatted; swapped as one tuple so readers never mix pairs
+    _speed_text: Tuple[float, str] = field(default=(-1.0, ""), repr=False, compare=False)
+    
     def pause(self):
         """Pause the download"""
         if self.status == JobStatus.DOWNLOADING:
-            self._pause_event.set()
+            self._paused = True
             self.status = JobStatus.PAUSED
     
     def resume(self):
         """Resume the download"""
         if self.status == JobStatus.PAUSED:
-            self._pause_event.clear()
+            self._paused = False
             self.status = JobStatus.DOWNLOADING
     
     def cancel(self):
         """Cancel the download"""
-        self._cancel_event.set()
+        self._cancelled = True
         self.status = JobStatus.CANCELLED
     
     @property
     def is_paused(self) -> bool:
         """Check if paused"""
-        return self._pause_event.is_set()
+        return self._paused
     
     @property
     def is_cancelled(self) -> bool:
         """Check if cancelled"""
-        return self._cancel_event.is_set()
+        return self._cancelled
     
     @property
     def elapsed_time(self) -> float:
@@ -93,10 +100,15 @@ class DownloadJob:
     @property
     def speed_formatted(self) -> str:
         """Get formatted speed string"""
-        if self.speed_kbps < 1024:
-            return f"{self.speed_kbps:.1f} KB/s"
-        else:
-            return f"{self.speed_kbps / 1024:.1f} MB/s"
+        speed = self.speed_kbps
+        cached_speed, text = self._speed_text
+        if speed != cached_speed:
+            if speed < 1024:
+                text = f"{speed:.1f} KB/s"
+            else:
+                text = f"{speed / 1024:.1f} MB/s"
+            self._speed_text = (speed, text)
+        return text
 
     @property
     def status_display(self) -> str:
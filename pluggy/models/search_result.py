@@ -3,11 +3,45 @@ Search Result Model
 Represents a torrent search result with deduplication support
 """
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterable, List, Optional
 import re
+import sys
 
+_INFOHASH_RE = re.compile(r'btih:([a-fA-F0-9]{40})')
+_SIZE_RE = re.compile(r'([\d.]+)\s*([KMGT]I?B)')
+# Conversion factors (binary: KiB, MiB, GiB vs decimal: KB, MB, GB)
+_SIZE_MULTIPLIERS = {
+    'B': 1,
+    'KB': 1000, 'KIB': 1024,
+    'MB': 1000**2, 'MIB': 1024**2,
+    'GB': 1000**3, 'GIB': 1024**3,
+    'TB': 1000**4, 'TIB': 1024**4,
+}
+# (upper bound, divisor, unit) for format_size.
+_SIZE_UNITS = tuple(
+    (1024 ** (i + 1), 1024 ** i, unit) for i, unit in enumerate(['B', 'KB', 'MB', 'GB', 'TB'])
+)
 
-@dataclass
+
+def _parse_size(size_str: str) -> int:
+    """Bytes for "<number> <unit>" text such as "1.5 GB" or "700MiB"; 0 if unparseable."""
+    s = size_str.strip().upper()
+    # Most feeds send exactly "<digits/dots> <unit>": split and look the unit up directly.
+    number, _, unit = s.partition(' ')
+    multiplier = _SIZE_MULTIPLIERS.get(unit)
+    if multiplier is not None and unit != 'B' and number.replace('.', '').isdecimal():
+        return int(float(number) * multiplier)
+    match = _SIZE_RE.match(s)
+    if not match:
+        return 0
+    return int(float(match.group(1)) * _SIZE_MULTIPLIERS[match.group(2)])
+
+
+# Result feeds hold many of these; drop the per-instance __dict__ where supported.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class SearchResult:
     """Torrent search result"""
     title: str
@@ -24,10 +58,16 @@ class SearchResult:
     aggregated_sources: list = field(default_factory=list)
     link_quality: int = 0
     
+    def __post_init__(self):
+        # The same torrent arrives from several sources; share one infohash string so
+        # dedup dict/set lookups match on identity instead of comparing 40 hex chars.
+        if self.infohash and type(self.infohash) is str:
+            self.infohash = sys.intern(self.infohash)
+    
     @staticmethod
     def extract_infohash(magnet: str) -> str:
         """Extract infohash from magnet link"""
-        match = re.search(r'btih:([a-fA-F0-9]{40})', magnet)
+        match = _INFOHASH_RE.search(magnet)
         if match:
             return match.group(1).upper()
         return ""
@@ -40,36 +80,21 @@ class SearchResult:
         """
         if isinstance(size_str, int):
             return size_str
-        
-        size_str = size_str.strip().upper()
-        
-        # Extract number and unit
-        match = re.match(r'([\d.]+)\s*([KMGT]I?B)', size_str)
-        if not match:
-            return 0
-        
-        value = float(match.group(1))
-        unit = match.group(2)
-        
-        # Conversion factors (binary: KiB, MiB, GiB vs decimal: KB, MB, GB)
-        multipliers = {
-            'B': 1,
-            'KB': 1000, 'KIB': 1024,
-            'MB': 1000**2, 'MIB': 1024**2,
-            'GB': 1000**3, 'GIB': 1024**3,
-            'TB': 1000**4, 'TIB': 1024**4,
-        }
-        
-        return int(value * multipliers.get(unit, 1))
+        return _parse_size(size_str)
+    
+    @staticmethod
+    def normalize_sizes(size_strs: Iterable) -> List[int]:
+        """Batch form of normalize_size for a whole feed of rows"""
+        parse = _parse_size
+        return [size_str if isinstance(size_str, int) else parse(size_str) for size_str in size_strs]
     
     @staticmethod
     def format_size(bytes_size: int) -> str:
         """Format bytes to human readable size"""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if bytes_size < 1024.0:
-                return f"{bytes_size:.2f} {unit}"
-            bytes_size /= 1024.0
-        return f"{bytes_size:.2f} PB"
+        for limit, divisor, unit in _SIZE_UNITS:
+            if bytes_size < limit:
+                return f"{bytes_size / divisor:.2f} {unit}"
+        return f"{bytes_size / 1024**5:.2f} PB"
     
     def __hash__(self):
         """Hash based on infohash for deduplication"""
@@ -2,13 +2,67 @@
 RealDebrid Client
 Handles device OAuth flow, token management, and magnet resolution
 """
+import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dataclasses import replace
+import heapq
+import logging
+import random
+import tempfile
 import threading
 import time
-from typing import Optional, Dict, List, Callable
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Dict, List, Callable, Sequence, Tuple
 from ..core.event_bus import EventBus, Events
 from ..core.request_context import SessionContext, get_session, set_session
 
+logger = logging.getLogger(__name__)
+
+
+try:
+    import orjson
+except ImportError:  # optional; torrents/info for a large torrent is the only sizeable payload
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json(response: "requests.Response") -> Any:
+    """Decode a response body once, straight from its bytes."""
+    return _loads(response.content)
+
+
+# Everything an authenticated call or a token refresh reads, fetched in one scope lookup.
+_AUTH_KEYS = (
+    "rd_access_token",
+    "rd_refresh_token",
+    "rd_client_id",
+    "rd_client_secret",
+    "rd_request_timeout_seconds",
+    "rd_access_token_expires_at",
+)
+# Refresh this many seconds before the access token expires instead of waiting for a 401.
+_TOKEN_REFRESH_MARGIN = 60.0
+# After a failed refresh, calls use the current token for this long before trying again.
+_REFRESH_RETRY_SECONDS = 60.0
+
+
+def _token_expires_at(token_data: Dict[str, Any]) -> float:
+    try:
+        return time.time() + float(token_data.get("expires_in") or 3600)
+    except Exception:
+        return time.time() + 3600.0
+
+
+def _coerce_timeout(value: Any) -> float:
+    try:
+        return float(value or 12.0)
+    except Exception:
+        return 12.0
+
 
 class RealDebridClient:
     """RealDebrid API client with OAuth support"""
@@ -16,35 +70,104 @@ class RealDebridClient:
     BASE_URL = "https://api.real-debrid.com/rest/1.0"
     OAUTH_URL = "https://api.real-debrid.com/oauth/v2"
     PUBLIC_CLIENT_ID = "X245A4XAIBGVM"
+    # Delays between torrent-info polls; the last value repeats.
+    POLL_SCHEDULE = (1.0, 1.5, 2.0, 3.0, 5.0)
+    # Up to this many seconds of random delay on each poll, so concurrent jobs drift apart.
+    POLL_JITTER = 0.25
+    AVAILABILITY_CACHE_SIZE = 4096
+    # .torrent files are metadata; anything bigger than this is not one.
+    MAX_TORRENT_FILE_BYTES = 32 * 1024 * 1024
+    TORRENT_SPOOL_BYTES = 4 * 1024 * 1024
 	    
     def __init__(self, settings_manager, event_bus: EventBus):
         self.settings = settings_manager
         self.event_bus = event_bus
 	        
-        self._polling_thread: Optional[threading.Thread] = None
-        self._stop_polling = threading.Event()
-        self._auth_lock = threading.RLock()
+        # Pending device-auth polls as (due, seq, job), served by one lazily started thread.
+        self._poll_jobs: List[Tuple[float, int, tuple]] = []
+        self._poll_seq = 0
+        # Bumped by stop_polling so a poll already in flight does not reschedule itself.
+        self._poll_epoch = 0
+        self._poll_cond = threading.Condition()
+        self._poll_worker: Optional[threading.Thread] = None
+        # The scheduler thread only waits; exchanges run here so one slow account's HTTP
+        # calls do not hold up everyone else's polls.
+        self._poll_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rd-device-exchange")
+        self._auth_lock = threading.Lock()
+        # Device codes whose tokens were saved, newest last; guarded by _auth_lock.
+        self._completed_device_codes: "deque[str]" = deque(maxlen=64)
+        # Single-flights proactive refreshes so concurrent calls (e.g. parallel unrestricts)
+        # do not each spend the refresh token.
+        self._refresh_lock = threading.Lock()
+        # refresh token -> monotonic time of its last failed refresh.
+        self._refresh_failed_at: Dict[str, float] = {}
+        self._session = self._new_session()
+        # infohash -> (checked_at, available), LRU order. Availability is per hash, not
+        # per account, so one cache serves every profile.
+        self._avail_cache: "OrderedDict[str, Tuple[float, bool]]" = OrderedDict()
+        self._avail_lock = threading.Lock()
+
+    @staticmethod
+    def _new_session() -> requests.Session:
+        """Keep-alive session shared by every call, so polls and per-link calls skip TLS setup."""
+        session = requests.Session()
+        session.headers["User-Agent"] = "Pluggy/1.0"
+        # Transient gateway/rate-limit replies are retried at the transport level, for reads
+        # only: the magnet/torrent adds (POST/PUT) and unrestricts would create duplicates.
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self):
+        """Cancel device-auth polls and close pooled connections."""
+        self.stop_polling()
+        self._poll_pool.shutdown(wait=False, cancel_futures=True)
+        self._session.close()
 
     def _timeout(self) -> float:
-        try:
-            return float(self.settings.get("rd_request_timeout_seconds", 12.0) or 12.0)
-        except Exception:
-            return 12.0
+        return _coerce_timeout(self.settings.get("rd_request_timeout_seconds", 12.0))
+
+    def _auth_settings(self) -> Dict[str, Any]:
+        """Token, client credentials and timeout from a single settings read.
+
+        Settings are scoped per user/profile, so these are re-read per call rather than
+        kept on the client, which is shared by every session.
+        """
+        raw = self.settings.get_many(_AUTH_KEYS)
+        return {
+            "access_token": str(raw["rd_access_token"] or ""),
+            "refresh_token": str(raw["rd_refresh_token"] or ""),
+            "client_id": str(raw["rd_client_id"] or self.PUBLIC_CLIENT_ID),
+            "client_secret": str(raw["rd_client_secret"] or ""),
+            "timeout": _coerce_timeout(raw["rd_request_timeout_seconds"]),
+            "expires_at": float(raw["rd_access_token_expires_at"] or 0.0),
+        }
 
     def _public_client_id(self) -> str:
         return str(self.settings.get("rd_public_client_id", self.PUBLIC_CLIENT_ID) or self.PUBLIC_CLIENT_ID)
 
-    def _client_id(self) -> str:
-        return str(self.settings.get("rd_client_id", self.PUBLIC_CLIENT_ID) or self.PUBLIC_CLIENT_ID)
+    def _unrestrict_concurrency(self) -> int:
+        try:
+            return max(1, int(self.settings.get("rd_unrestrict_concurrency", 8) or 8))
+        except Exception:
+            return 8
 
-    def _client_secret(self) -> str:
-        return str(self.settings.get("rd_client_secret", "") or "")
+    def _availability_ttl(self) -> float:
+        try:
+            return max(0.0, float(self.settings.get("rd_availability_ttl_seconds", 300.0)))
+        except Exception:
+            return 300.0
 
     def _access_token(self) -> str:
         return str(self.settings.get("rd_access_token", "") or "")
-
-    def _refresh_token(self) -> str:
-        return str(self.settings.get("rd_refresh_token", "") or "")
 	    
     def is_authenticated(self) -> bool:
         """Check if user is authenticated"""
@@ -58,22 +181,19 @@ class RealDebridClient:
             dict with device_code, user_code, verification_url, expires_in
         """
         self.event_bus.emit(Events.RD_AUTH_STARTED)
-        ctx = get_session()
-        ctx_snapshot = SessionContext(
-            user_id=ctx.user_id,
-            username=ctx.username,
-            role=ctx.role or "user",
-            profile_id=ctx.profile_id,
-        )
+        # SessionContext is frozen, so the current one can be shared as-is.
+        ctx_snapshot = get_session()
+        if not ctx_snapshot.role:
+            ctx_snapshot = replace(ctx_snapshot, role="user")
 	        
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{self.OAUTH_URL}/device/code",
                 params={"client_id": self._public_client_id(), "new_credentials": "yes"},
                 timeout=self._timeout(),
             )
             response.raise_for_status()
-            data = response.json()
+            data = _json(response)
             
             # Save device code for polling
             self.settings.set("rd_device_code", data["device_code"])
@@ -95,42 +215,65 @@ class RealDebridClient:
             raise
     
     def _start_polling(self, device_code: str, interval: int, expires_in: int, ctx_snapshot: Optional[SessionContext] = None):
-        """Start background polling for device authorization"""
-        self._stop_polling.clear()
-	        
-        def poll():
-            # Propagate request context to this background thread so settings are
-            # written to the correct profile/user scope.
-            if ctx_snapshot is not None:
-                set_session(ctx_snapshot)
-            started = time.time()
-            max_wait = max(60, int(expires_in or 1800) + 5)
-            while not self._stop_polling.is_set():
-                if time.time() - started > max_wait:
-                    self.event_bus.emit(Events.RD_AUTH_FAILED, {
-                        "error": "Authorization timed out. Please retry."
-                    })
-                    break
-                try:
-                    result = self._attempt_device_exchange(device_code)
-                    if result.get("status") == "success":
-                        self.event_bus.emit(Events.RD_AUTH_SUCCESS, result.get("token_data", {}))
-                        break
-                    if result.get("status") == "failed":
-                        self.event_bus.emit(Events.RD_AUTH_FAILED, {"error": result.get("error", "Authorization failed.")})
-                        break
-                
-                except Exception as e:
-                    print(f"Polling error: {e}")
-                
-                time.sleep(interval)
-        
-        self._polling_thread = threading.Thread(target=poll, daemon=True)
-        self._polling_thread.start()
+        """Schedule background polling for device authorization"""
+        max_wait = max(60, int(expires_in or 1800) + 5)
+        with self._poll_cond:
+            if self._poll_worker is None:
+                self._poll_worker = threading.Thread(target=self._poll_loop, name="rd-device-auth", daemon=True)
+                self._poll_worker.start()
+            epoch = self._poll_epoch
+        # The first check runs right away.
+        self._schedule_poll(0.0, (device_code, max(1, int(interval)), time.time() + max_wait, ctx_snapshot, epoch))
+
+    def _schedule_poll(self, delay: float, job: tuple):
+        with self._poll_cond:
+            if job[-1] != self._poll_epoch:
+                return
+            self._poll_seq += 1
+            heapq.heappush(self._poll_jobs, (time.time() + delay, self._poll_seq, job))
+            self._poll_cond.notify()
+
+    def _poll_loop(self):
+        """One thread tracks every pending device authorization and hands due polls to the pool."""
+        while True:
+            with self._poll_cond:
+                while not self._poll_jobs or self._poll_jobs[0][0] > time.time():
+                    timeout = self._poll_jobs[0][0] - time.time() if self._poll_jobs else None
+                    self._poll_cond.wait(timeout)
+                _, _, job = heapq.heappop(self._poll_jobs)
+            try:
+                self._poll_pool.submit(self._poll_once, *job)
+            except RuntimeError:  # pool shut down by close()
+                return
+
+    def _poll_once(self, device_code: str, interval: int, deadline: float, ctx_snapshot: Optional[SessionContext], epoch: int):
+        if epoch != self._poll_epoch:
+            return
+        # Settings are written to the profile/user scope that started the flow; pool threads
+        # are shared, so always replace whatever the previous job left behind.
+        set_session(ctx_snapshot or SessionContext())
+        if time.time() > deadline:
+            self.event_bus.emit(Events.RD_AUTH_FAILED, {
+                "error": "Authorization timed out. Please retry."
+            })
+            return
+        try:
+            result = self._attempt_device_exchange(device_code)
+            if result.get("status") == "success":
+                self.event_bus.emit(Events.RD_AUTH_SUCCESS, result.get("token_data", {}))
+                return
+            if result.get("status") == "failed":
+                self.event_bus.emit(Events.RD_AUTH_FAILED, {"error": result.get("error", "Authorization failed.")})
+                return
+        except Exception:
+            logger.exception("RealDebrid device authorization poll failed")
+        self._schedule_poll(interval, (device_code, interval, deadline, ctx_snapshot, epoch))
     
     def stop_polling(self):
-        """Stop the polling thread"""
-        self._stop_polling.set()
+        """Cancel all pending device-authorization polls"""
+        with self._poll_cond:
+            self._poll_epoch += 1
+            self._poll_jobs.clear()
 
     def check_device_auth_now(self) -> Dict[str, str]:
         """
@@ -164,66 +307,86 @@ class RealDebridClient:
 
     def _attempt_device_exchange(self, device_code: str) -> Dict[str, str]:
         """Try completing device auth once; does not emit events."""
-        with self._auth_lock:
-            response = requests.get(
-                f"{self.OAUTH_URL}/device/credentials",
-                params={"client_id": self._public_client_id(), "code": device_code},
-                timeout=self._timeout(),
-            )
+        response = self._session.get(
+            f"{self.OAUTH_URL}/device/credentials",
+            params={"client_id": self._public_client_id(), "code": device_code},
+            timeout=self._timeout(),
+        )
 
-            if response.status_code in (204, 403):
-                return {"status": "pending", "error": "Waiting for you to authorize in browser."}
-            if response.status_code != 200:
-                try:
-                    payload = response.json()
-                    err = payload.get("error") or payload.get("error_message") or payload.get("error_code")
-                except Exception:
-                    err = response.text.strip()[:200]
-                return {"status": "failed", "error": f"Credentials step failed ({response.status_code}): {err}"}
-
-            cred_data = response.json()
-            bound_client_id = cred_data.get("client_id", "")
-            bound_client_secret = cred_data.get("client_secret", "")
-            if not bound_client_id or not bound_client_secret:
-                return {"status": "failed", "error": "RealDebrid did not return client credentials."}
-
-            token_resp = requests.post(
-                f"{self.OAUTH_URL}/token",
-                data={
-                    "client_id": bound_client_id,
-                    "client_secret": bound_client_secret,
-                    "code": device_code,
-                    "grant_type": "http://oauth.net/grant_type/device/1.0",
-                },
-                timeout=self._timeout(),
-            )
-            if token_resp.status_code >= 400:
-                try:
-                    payload = token_resp.json()
-                    err = payload.get("error") or payload.get("error_description") or payload.get("error_code")
-                except Exception:
-                    err = token_resp.text.strip()[:200]
-                return {"status": "failed", "error": f"Token exchange failed ({token_resp.status_code}): {err}"}
-
-            token_data = token_resp.json()
-            access_token = token_data.get("access_token", "")
-            refresh_token = token_data.get("refresh_token", "")
-            if not access_token or not refresh_token:
-                return {"status": "failed", "error": "Missing access/refresh token in response."}
-
-            self._save_tokens(access_token, refresh_token)
+        if response.status_code in (204, 403):
+            return {"status": "pending", "error": "Waiting for you to authorize in browser."}
+        if response.status_code != 200:
+            try:
+                payload = _json(response)
+                err = payload.get("error") or payload.get("error_message") or payload.get("error_code")
+            except Exception:
+                err = response.text.strip()[:200]
+            return self._exchange_failed(device_code, f"Credentials step failed ({response.status_code}): {err}")
+
+        cred_data = _json(response)
+        bound_client_id = cred_data.get("client_id", "")
+        bound_client_secret = cred_data.get("client_secret", "")
+        if not bound_client_id or not bound_client_secret:
+            return {"status": "failed", "error": "RealDebrid did not return client credentials."}
+
+        token_resp = self._session.post(
+            f"{self.OAUTH_URL}/token",
+            data={
+                "client_id": bound_client_id,
+                "client_secret": bound_client_secret,
+                "code": device_code,
+                "grant_type": "http://oauth.net/grant_type/device/1.0",
+            },
+            timeout=self._timeout(),
+        )
+        if token_resp.status_code >= 400:
+            try:
+                payload = _json(token_resp)
+                err = payload.get("error") or payload.get("error_description") or payload.get("error_code")
+            except Exception:
+                err = token_resp.text.strip()[:200]
+            return self._exchange_failed(device_code, f"Token exchange failed ({token_resp.status_code}): {err}")
+
+        token_data = _json(token_resp)
+        access_token = token_data.get("access_token", "")
+        refresh_token = token_data.get("refresh_token", "")
+        if not access_token or not refresh_token:
+            return {"status": "failed", "error": "Missing access/refresh token in response."}
+
+        # Network calls above run unlocked; only the settings write is serialized, so the
+        # polling thread and check_device_auth_now cannot both store tokens for one code.
+        with self._auth_lock:
+            if device_code in self._completed_device_codes:
+                # The other caller finished this code first and already saved its tokens.
+                return {"status": "success", "token_data": token_data}
             self.settings.update({
+                "rd_access_token": access_token,
+                "rd_refresh_token": refresh_token,
+                "rd_access_token_expires_at": _token_expires_at(token_data),
                 "rd_client_id": bound_client_id,
                 "rd_client_secret": bound_client_secret,
                 "rd_device_code": "",
             })
-            return {"status": "success", "token_data": token_data}
+            self._completed_device_codes.append(device_code)
+        return {"status": "success", "token_data": token_data}
 	    
-    def _save_tokens(self, access_token: str, refresh_token: str):
+    def _exchange_failed(self, device_code: str, error: str) -> Dict[str, str]:
+        """Result for a rejected exchange, unless a concurrent exchange already used the code.
+
+        The poller and check_device_auth_now may both exchange one device code; RealDebrid
+        rejects whichever call comes second, which must not be reported as a failed login.
+        """
+        with self._auth_lock:
+            if device_code in self._completed_device_codes:
+                return {"status": "success", "token_data": {}}
+        return {"status": "failed", "error": error}
+
+    def _save_tokens(self, access_token: str, refresh_token: str, expires_at: float = 0.0):
         """Save tokens to settings"""
         self.settings.update({
             "rd_access_token": access_token,
-            "rd_refresh_token": refresh_token
+            "rd_refresh_token": refresh_token,
+            "rd_access_token_expires_at": expires_at,
         })
     
     def refresh_access_token(self) -> bool:
@@ -233,16 +396,17 @@ class RealDebridClient:
         Returns:
             bool indicating success
         """
-        refresh_token = self._refresh_token()
+        auth = self._auth_settings()
+        refresh_token = auth["refresh_token"]
         if not refresh_token:
             return False
 	        
         try:
-            client_secret = self._client_secret()
-            client_id = self._client_id()
+            client_secret = auth["client_secret"]
+            client_id = auth["client_id"]
             if not client_secret:
                 return False
-            response = requests.post(
+            response = self._session.post(
                 f"{self.OAUTH_URL}/token",
                 data={
                     "client_id": client_id,
@@ -250,14 +414,15 @@ class RealDebridClient:
                     "code": refresh_token,
                     "grant_type": "http://oauth.net/grant_type/device/1.0"
                 },
-                timeout=self._timeout(),
+                timeout=auth["timeout"],
             )
             response.raise_for_status()
-            data = response.json()
+            data = _json(response)
             
             self._save_tokens(
                 data.get("access_token", ""),
-                data.get("refresh_token", "")
+                data.get("refresh_token", ""),
+                _token_expires_at(data),
             )
             
             self.event_bus.emit(Events.RD_TOKEN_REFRESHED)
@@ -271,34 +436,69 @@ class RealDebridClient:
         """Clear authentication"""
         self.settings.update({
             "rd_access_token": "",
-            "rd_refresh_token": ""
+            "rd_refresh_token": "",
+            "rd_access_token_expires_at": 0.0,
         })
     
+    def _refresh_token_locked(self, stale_token: str) -> Dict[str, Any]:
+        """Replace ``stale_token`` once across concurrent callers; returns the current auth settings.
+
+        Nothing is sent if another caller already replaced the token while this one waited
+        for the lock, or if refreshing the same refresh token failed in the last
+        _REFRESH_RETRY_SECONDS.
+        """
+        with self._refresh_lock:
+            auth = self._auth_settings()
+            if auth["access_token"] != stale_token:
+                return auth
+            refresh_token = auth["refresh_token"]
+            failed_at = self._refresh_failed_at.get(refresh_token)
+            if failed_at is not None and time.monotonic() - failed_at < _REFRESH_RETRY_SECONDS:
+                return auth
+            if not self.refresh_access_token():
+                self._refresh_failed_at[refresh_token] = time.monotonic()
+                return auth
+            self._refresh_failed_at.pop(refresh_token, None)
+            return self._auth_settings()
+
     def _api_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
         """
         Make authenticated API request with auto token refresh
         """
-        access_token = self._access_token()
+        auth = self._auth_settings()
+        if auth["access_token"] and 0 < auth["expires_at"] - _TOKEN_REFRESH_MARGIN < time.time():
+            auth = self._refresh_token_locked(auth["access_token"])
+        access_token = auth["access_token"]
         if not access_token:
             raise Exception("Not authenticated")
 	        
         headers = kwargs.pop("headers", {})
         headers["Authorization"] = f"Bearer {access_token}"
-        timeout = kwargs.pop("timeout", self._timeout())
+        timeout = kwargs.pop("timeout", auth["timeout"])
 	        
         url = f"{self.BASE_URL}/{endpoint}"
-        response = requests.request(method, url, headers=headers, timeout=timeout, **kwargs)
+        response = self._session.request(method, url, headers=headers, timeout=timeout, **kwargs)
 	        
-        # Handle token expiration
+        # Expired despite the proactive refresh (clock skew, revoked token): refresh and retry once.
         if response.status_code == 401:
-            if self.refresh_access_token():
-                # Retry with new token
-                headers["Authorization"] = f"Bearer {self._access_token()}"
-                response = requests.request(method, url, headers=headers, timeout=timeout, **kwargs)
+            fresh_token = self._refresh_token_locked(access_token)["access_token"]
+            if fresh_token and fresh_token != access_token:
+                # Retry with new token; uploads are file objects the first attempt consumed.
+                for part in (kwargs.get("files") or {}).values():
+                    fileobj = part[1] if isinstance(part, tuple) else part
+                    if hasattr(fileobj, "seek"):
+                        fileobj.seek(0)
+                headers["Authorization"] = f"Bearer {fresh_token}"
+                response = self._session.request(method, url, headers=headers, timeout=timeout, **kwargs)
 	        
         return response
     
-    def resolve_magnet(self, magnet: str, status_callback: Optional[Callable[[str], None]] = None) -> List[str]:
+    def resolve_magnet(
+        self,
+        magnet: str,
+        status_callback: Optional[Callable[[str], None]] = None,
+        poll_schedule: Optional[Sequence[float]] = None,
+    ) -> List[str]:
         """
         Resolve magnet link to direct download URLs
         
@@ -318,7 +518,7 @@ class RealDebridClient:
                 data={"magnet": magnet}
             )
             response.raise_for_status()
-            torrent_data = response.json()
+            torrent_data = _json(response)
             torrent_id = torrent_data.get("id")
             
             if not torrent_id:
@@ -335,57 +535,39 @@ class RealDebridClient:
             response.raise_for_status()
 
             # Poll for RealDebrid processing and link availability.
-            info = self._wait_for_links(torrent_id, status_callback=status_callback)
+            info = self._wait_for_links(torrent_id, status_callback=status_callback, poll_schedule=poll_schedule)
             links = info.get("links", [])
             if not links:
                 raise Exception("No download links available")
             
-            # Unrestrict links
-            urls = []
-            for link in links:
-                if status_callback:
-                    status_callback("Unrestricting links...")
-                response = self._api_request(
-                    "POST",
-                    "unrestrict/link",
-                    data={"link": link}
-                )
-                response.raise_for_status()
-                unrestrict_data = response.json()
-                download_url = unrestrict_data.get("download")
-                if download_url:
-                    urls.append(download_url)
-            
-            return urls
+            if status_callback:
+                status_callback("Unrestricting links...")
+            return self._unrestrict_links(links)
         
         except Exception as e:
             print(f"Magnet resolution error: {e}")
             raise
 
-    def resolve_torrent_url(self, torrent_url: str, status_callback: Optional[Callable[[str], None]] = None) -> List[str]:
+    def resolve_torrent_url(
+        self,
+        torrent_url: str,
+        status_callback: Optional[Callable[[str], None]] = None,
+        poll_schedule: Optional[Sequence[float]] = None,
+    ) -> List[str]:
         """
         Resolve a torrent file URL (.torrent or tracker dl endpoint) to direct download URLs.
         """
         try:
-            response = requests.get(
-                torrent_url,
-                timeout=30,
-                headers={"User-Agent": "Mozilla/5.0"}
-            )
-            response.raise_for_status()
-            content = response.content
-            if not content:
-                raise Exception("Empty torrent file response")
-
-            if status_callback:
-                status_callback("Uploading torrent file to RealDebrid...")
-            add_resp = self._api_request(
-                "PUT",
-                "torrents/addTorrent",
-                files={"file": ("upload.torrent", content, "application/x-bittorrent")}
-            )
+            with self._fetch_torrent_file(torrent_url) as torrent_file:
+                if status_callback:
+                    status_callback("Uploading torrent file to RealDebrid...")
+                add_resp = self._api_request(
+                    "PUT",
+                    "torrents/addTorrent",
+                    files={"file": ("upload.torrent", torrent_file, "application/x-bittorrent")}
+                )
             add_resp.raise_for_status()
-            torrent_data = add_resp.json()
+            torrent_data = _json(add_resp)
             torrent_id = torrent_data.get("id")
             if not torrent_id:
                 raise Exception("Failed to add torrent file")
@@ -399,48 +581,97 @@ class RealDebridClient:
             )
             select_resp.raise_for_status()
 
-            info = self._wait_for_links(torrent_id, status_callback=status_callback)
+            info = self._wait_for_links(torrent_id, status_callback=status_callback, poll_schedule=poll_schedule)
             links = info.get("links", [])
             if not links:
                 raise Exception("No links available from torrent")
 
-            out = []
-            for link in links:
-                if status_callback:
-                    status_callback("Unrestricting links...")
-                u_resp = self._api_request(
-                    "POST",
-                    "unrestrict/link",
-                    data={"link": link}
-                )
-                u_resp.raise_for_status()
-                direct = u_resp.json().get("download")
-                if direct:
-                    out.append(direct)
-            return out
+            if status_callback:
+                status_callback("Unrestricting links...")
+            return self._unrestrict_links(links)
         except Exception as e:
             print(f"Torrent URL resolution error: {e}")
             raise
 
-    def _wait_for_links(self, torrent_id: str, status_callback: Optional[Callable[[str], None]] = None) -> Dict:
+    def _fetch_torrent_file(self, torrent_url: str) -> "tempfile.SpooledTemporaryFile":
+        """Stream a .torrent into a spooled temp file (memory, then disk past TORRENT_SPOOL_BYTES)."""
+        spool = tempfile.SpooledTemporaryFile(max_size=self.TORRENT_SPOOL_BYTES)
+        try:
+            with self._session.get(
+                torrent_url,
+                timeout=30,
+                headers={"User-Agent": "Mozilla/5.0"},
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    spool.write(chunk)
+                    if spool.tell() > self.MAX_TORRENT_FILE_BYTES:
+                        raise Exception("Torrent file response is too large")
+            if not spool.tell():
+                raise Exception("Empty torrent file response")
+            spool.seek(0)
+            return spool
+        except BaseException:
+            spool.close()
+            raise
+
+    def _unrestrict_one(self, link: str) -> Optional[str]:
+        response = self._api_request(
+            "POST",
+            "unrestrict/link",
+            data={"link": link}
+        )
+        response.raise_for_status()
+        return _json(response).get("download") or None
+
+    def _unrestrict_links(self, links: Sequence[str]) -> List[str]:
+        """Unrestrict links concurrently; direct URLs come back in link order."""
+        workers = min(self._unrestrict_concurrency(), len(links))
+        if workers <= 1:
+            urls = [self._unrestrict_one(link) for link in links]
+        else:
+            # Settings (and so the token) are scoped by request context; carry it to the workers.
+            ctx_snapshot = get_session()
+
+            def unrestrict(link: str) -> Optional[str]:
+                set_session(ctx_snapshot)
+                return self._unrestrict_one(link)
+
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rd-unrestrict") as pool:
+                urls = list(pool.map(unrestrict, links))
+        return [url for url in urls if url]
+
+    def _wait_for_links(
+        self,
+        torrent_id: str,
+        status_callback: Optional[Callable[[str], None]] = None,
+        poll_schedule: Optional[Sequence[float]] = None,
+    ) -> Dict:
         """
         Poll torrent info until links are available or timeout.
+        Polls quickly at first and backs off along poll_schedule, starting over
+        whenever the torrent status changes.
         """
         timeout_seconds = 180
-        poll_interval = 2.0
+        schedule = [max(0.1, float(v)) for v in (poll_schedule or self.POLL_SCHEDULE)] or [2.0]
+        attempt = 0
         start = time.time()
         last_status = ""
         while time.time() - start < timeout_seconds:
             response = self._api_request("GET", f"torrents/info/{torrent_id}")
             response.raise_for_status()
-            info = response.json()
+            info = _json(response)
             status = str(info.get("status", "") or "").strip()
             links = info.get("links", []) or []
             progress = info.get("progress", 0)
 
-            if status != last_status and status_callback:
-                status_callback(f"RealDebrid: {status or 'processing'} ({progress}%)")
+            if status != last_status:
+                if status_callback:
+                    status_callback(f"RealDebrid: {status or 'processing'} ({progress}%)")
                 last_status = status
+                # A new phase (e.g. queued -> downloading) tends to move again soon.
+                attempt = 0
 
             if links:
                 return info
@@ -448,7 +679,9 @@ class RealDebridClient:
             if status in {"error", "magnet_error", "virus", "dead"}:
                 raise Exception(f"RealDebrid status: {status}")
 
-            time.sleep(poll_interval)
+            delay = schedule[min(attempt, len(schedule) - 1)] + random.uniform(0.0, self.POLL_JITTER)
+            time.sleep(min(delay, max(0.0, timeout_seconds - (time.time() - start))))
+            attempt += 1
 
         raise Exception("Timed out waiting for RealDebrid to prepare links.")
 
@@ -460,7 +693,7 @@ class RealDebridClient:
             params={"page": max(1, page), "limit": max(1, min(limit, 500))}
         )
         response.raise_for_status()
-        data = response.json()
+        data = _json(response)
         if isinstance(data, list):
             return data
         return []
@@ -469,7 +702,7 @@ class RealDebridClient:
         """Fetch torrent info by id."""
         response = self._api_request("GET", f"torrents/info/{torrent_id}")
         response.raise_for_status()
-        return response.json()
+        return _json(response)
 
     def check_instant_availability(self, infohash: str) -> bool:
         """
@@ -479,19 +712,32 @@ class RealDebridClient:
         hash_clean = (infohash or "").strip().lower()
         if not hash_clean:
             return False
+        ttl = self._availability_ttl()
+        now = time.time()
+        with self._avail_lock:
+            cached = self._avail_cache.get(hash_clean)
+            if cached is not None and now - cached[0] < ttl:
+                self._avail_cache.move_to_end(hash_clean)
+                return cached[1]
         response = self._api_request("GET", f"torrents/instantAvailability/{hash_clean}")
         response.raise_for_status()
-        data = response.json()
+        data = _json(response)
         # Response keyed by hash, value is dict of hosters when available.
-        if not isinstance(data, dict):
-            return False
-        node = data.get(hash_clean) or data.get(hash_clean.upper()) or {}
-        if isinstance(node, dict):
-            return any(bool(v) for v in node.values())
-        return False
+        available = False
+        if isinstance(data, dict):
+            node = data.get(hash_clean) or data.get(hash_clean.upper()) or {}
+            if isinstance(node, dict):
+                available = any(bool(v) for v in node.values())
+        if ttl > 0:
+            with self._avail_lock:
+                self._avail_cache[hash_clean] = (now, available)
+                self._avail_cache.move_to_end(hash_clean)
+                if len(self._avail_cache) > self.AVAILABILITY_CACHE_SIZE:
+                    self._avail_cache.popitem(last=False)
+        return available
     
     def get_user_info(self) -> Dict:
         """Get user account information"""
         response = self._api_request("GET", "user")
         response.raise_for_status()
-        return response.json()
+        return _json(response)
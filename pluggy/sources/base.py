@@ -10,6 +10,20 @@ from typing import Any, Dict, List
 from ..models.search_result import SearchResult
 
 
+def new_http_session() -> Any:
+    """Pooled requests.Session for one source, or None if requests is unavailable."""
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+    except Exception:
+        return None
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 class BaseSource(ABC):
     """
     Stable source contract for plugin and built-in implementations.
@@ -17,6 +31,9 @@ class BaseSource(ABC):
     api_version = 1
     name = "UnnamedSource"
     last_error = ""
+    # HTTP should go through this session so keep-alive connections are reused
+    # across searches. Sources without one get a pooled session at register().
+    session: Any = None
 
     @abstractmethod
     def search(self, query: str, page: int = 1) -> List[SearchResult]:
@@ -27,6 +44,10 @@ class BaseSource(ABC):
         """Optional hook called when source settings are reloaded."""
         return None
 
+    def set_http_session(self, session: Any) -> None:
+        """Optional hook to adopt a session provided by the host."""
+        self.session = session
+
     def healthcheck(self) -> Dict[str, Any]:
         """Optional lightweight health payload for dashboards."""
         return {
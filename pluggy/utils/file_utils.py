@@ -2,10 +2,16 @@
 File Utilities
 Cross-platform file operations with safe filename handling
 """
+import errno
+import os
 import re
+import shutil
 from pathlib import Path
 from typing import Union
 
+PARTIAL_SUFFIX = ".part"
+SENDFILE_CHUNK = 16 << 20
+
 
 def sanitize_filename(filename: str, max_length: int = 255) -> str:
     """
@@ -97,6 +103,69 @@ def get_unique_filename(directory: Path, filename: str) -> Path:
         counter += 1
 
 
+def partial_download_path(path: Union[str, Path]) -> Path:
+    """
+    Get the in-progress sibling path used while a file is downloading
+    
+    Args:
+        path: Final file path
+    
+    Returns:
+        Path with the partial-download suffix appended
+    """
+    path = Path(path)
+    return path.with_name(path.name + PARTIAL_SUFFIX)
+
+
+def _copy_file_contents(src_fd: int, dst_fd: int) -> None:
+    """Copy kernel-side with sendfile where the platform allows file targets."""
+    if hasattr(os, "sendfile"):
+        offset = 0
+        try:
+            while True:
+                sent = os.sendfile(dst_fd, src_fd, offset, SENDFILE_CHUNK)
+                if sent == 0:
+                    return
+                offset += sent
+        except OSError:
+            # e.g. macOS only sends to sockets; finish the rest in userspace.
+            os.lseek(src_fd, offset, os.SEEK_SET)
+            os.lseek(dst_fd, offset, os.SEEK_SET)
+    with os.fdopen(os.dup(src_fd), 'rb') as src, os.fdopen(os.dup(dst_fd), 'wb') as dst:
+        shutil.copyfileobj(src, dst, SENDFILE_CHUNK)
+
+
+def atomic_finalize(tmp_path: Union[str, Path], final_path: Union[str, Path]) -> Path:
+    """
+    Move a finished temporary file into place atomically
+    
+    Uses a rename when both paths share a filesystem; otherwise copies into a
+    staging file next to the target (via sendfile when possible) and renames that.
+    
+    Args:
+        tmp_path: Completed temporary file
+        final_path: Destination path
+    
+    Returns:
+        Destination Path
+    """
+    tmp_path = Path(tmp_path)
+    final_path = Path(final_path)
+    try:
+        os.replace(tmp_path, final_path)
+        return final_path
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+
+    staging = final_path.with_name(final_path.name + ".tmp")
+    with open(tmp_path, 'rb') as src, open(staging, 'wb') as dst:
+        _copy_file_contents(src.fileno(), dst.fileno())
+    os.replace(staging, final_path)
+    os.remove(tmp_path)
+    return final_path
+
+
 def format_size_bytes(size_bytes: int) -> str:
     """
     Format byte size to human-readable string
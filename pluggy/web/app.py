@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 from collections import deque
+from contextlib import asynccontextmanager
 from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
 from datetime import datetime, timezone
 from pathlib import Path
 from threading import RLock
 from time import monotonic
 from typing import Any, Dict, List, Optional
+import functools
 import threading
 import time
 import uuid
@@ -184,8 +186,9 @@ def _matches_filter_group(requested: set[str], token_map: Dict[str, set[str]], t
     return False
 
 
-def _search_sort_key(result: SearchResult, sort_by: str):
-    trust = _infer_trust(result)
+def _search_sort_key(result: SearchResult, sort_by: str, trust: Optional[int] = None):
+    if trust is None:
+        trust = _infer_trust(result)
     if sort_by == "seeds":
         return (max(0, result.seeds), max(0, result.size), trust)
     if sort_by == "size":
@@ -216,6 +219,8 @@ def _filter_and_sort_results(
     safety_mode = (safety or "balanced").strip().lower()
 
     filtered: List[SearchResult] = []
+    # Trust is needed again by the sort key; compute it once per result.
+    trust_by_id: Dict[int, int] = {}
     for result in baseline:
         pool = _result_token_pool(result)
         trust = _infer_trust(result)
@@ -229,6 +234,7 @@ def _filter_and_sort_results(
             continue
         if not _matches_filter_group(format_req, FORMAT_TOKENS, pool):
             continue
+        trust_by_id[id(result)] = trust
         filtered.append(result)
 
     query_tokens = [t for t in re.split(r"\W+", (query or "").lower()) if len(t) >= 2]
@@ -248,8 +254,8 @@ def _filter_and_sort_results(
 
     reverse = sort_by not in {"title"}
     if sort_by == "title":
-        return sorted(filtered, key=lambda r: (_search_sort_key(r, sort_by), -query_boost(r)))
-    return sorted(filtered, key=lambda r: (query_boost(r), _search_sort_key(r, sort_by)), reverse=reverse)
+        return sorted(filtered, key=lambda r: (_search_sort_key(r, sort_by, trust_by_id[id(r)]), -query_boost(r)))
+    return sorted(filtered, key=lambda r: (query_boost(r), _search_sort_key(r, sort_by, trust_by_id[id(r)])), reverse=reverse)
 
 
 def _custom_link_to_result(link: Dict[str, Any], query: str) -> Optional[SearchResult]:
@@ -412,9 +418,10 @@ class SearchResultRegistry:
 
 
 def _pick_best_link(result: SearchResult) -> str:
-    candidates = sorted(result.link_candidates or [], key=lambda c: int(c.get("quality", 0)), reverse=True)
+    candidates = result.link_candidates
     if candidates:
-        return str(candidates[0].get("url") or "").strip()
+        best = max(candidates, key=lambda c: int(c.get("quality", 0)))
+        return str(best.get("url") or "").strip()
     return (result.magnet or "").strip()
 
 
@@ -432,6 +439,8 @@ def _size_bytes_to_text(value: int) -> str:
     return f"{amount:.2f} PB"
 
 
+# Title scores are pure and titles repeat across searches, so memoize them.
+@functools.lru_cache(maxsize=4096)
 def _software_score(title: str) -> int:
     low = (title or "").lower()
     score = 0
@@ -447,6 +456,7 @@ def _software_score(title: str) -> int:
     return score
 
 
+@functools.lru_cache(maxsize=4096)
 def _media_noise_score(title: str) -> int:
     low = (title or "").lower()
     score = 0
@@ -690,7 +700,14 @@ def create_app(runtime: Optional[PluggyRuntime] = None) -> FastAPI:
                 }
             )
 
-    app = FastAPI(title="Pluggy API", version="1.3.0")
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI):
+        yield
+        # Download workers are pooled (non-daemon) threads; cancel them so the process can exit.
+        runtime.download_manager.shutdown()
+        runtime.settings.flush()
+
+    app = FastAPI(title="Pluggy API", version="1.3.0", lifespan=lifespan)
     app.middleware("http")(session_context_middleware)
 
     @app.get("/health")
@@ -828,7 +845,8 @@ def create_app(runtime: Optional[PluggyRuntime] = None) -> FastAPI:
         ctx = _require_user(request)
         profile = runtime.store.create_profile(int(ctx.user_id or 0), body.name)
         # Initialize profile settings on creation so first run is consistent.
-        runtime.store.set_profile_settings(profile.id, runtime.settings._ensure_required_source_urls_on(dict(runtime.settings.DEFAULT_SETTINGS)))
+        runtime.store.set_profile_settings(profile.id, runtime.settings._ensure_required_source_urls_on(runtime.settings._fresh_defaults()))
+        runtime.settings.invalidate_profile(profile.id)
         return {"ok": True, "profile": {"id": profile.id, "name": profile.name, "avatar": profile.avatar, "themeId": profile.theme_id}}
 
     @app.post("/api/profiles/select")
@@ -895,6 +913,7 @@ def create_app(runtime: Optional[PluggyRuntime] = None) -> FastAPI:
         if not profile or profile.user_id != int(ctx.user_id or 0):
             raise HTTPException(status_code=404, detail="Profile not found.")
         runtime.store.delete_profile(profile_id)
+        runtime.settings.invalidate_profile(profile_id)
         record_audit("profile.deleted", {"id": profile_id})
         return {"ok": True}
 
@@ -1197,7 +1216,8 @@ def create_app(runtime: Optional[PluggyRuntime] = None) -> FastAPI:
                 if internal["enabled_sources"]:
                     allowed = set(str(x) for x in internal["enabled_sources"])
                     enabled = [s for s in enabled if s in allowed]
-                enabled = sorted(enabled, key=runtime.source_manager._source_routing_score, reverse=True)
+                scores = runtime.source_manager._score_map(enabled)
+                enabled = sorted(enabled, key=scores.__getitem__, reverse=True)
                 internal["executor"] = ThreadPoolExecutor(max_workers=max(2, min(8, len(enabled) or 2)))
 
                 with search_jobs_lock:
@@ -1823,6 +1843,7 @@ def create_app(runtime: Optional[PluggyRuntime] = None) -> FastAPI:
 
         selected_backend = runtime.download_manager.get_download_backend()
         for name, backend in runtime.download_manager._backends.items():
+            backend.refresh()
             available = backend.is_available()
             report["backends"].append(
                 {
@@ -1870,6 +1891,7 @@ def create_app(runtime: Optional[PluggyRuntime] = None) -> FastAPI:
 
         def _exit_soon():
             time.sleep(0.35)
+            runtime.settings.flush()
             os._exit(0)  # intentional hard exit for local-contained app
 
         threading.Thread(target=_exit_soon, daemon=True).start()
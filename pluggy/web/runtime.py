@@ -42,15 +42,27 @@ def build_runtime() -> PluggyRuntime:
     settings = SettingsManager(store=store)
     event_bus = EventBus()
     realdebrid = RealDebridClient(settings, event_bus)
+    cfg = settings.get_many((
+        "source_max_retries",
+        "source_retry_backoff_seconds",
+        "source_circuit_failure_threshold",
+        "source_circuit_cooldown_seconds",
+        "source_search_timeout_seconds",
+        "source_early_return_seconds",
+        "source_early_return_min_results",
+        "source_prefer_http_completion",
+        "source_max_inflight",
+    ), {"source_prefer_http_completion": True})
     reliability = {
-        "max_retries": int(settings.get("source_max_retries", 1) or 1),
-        "retry_backoff_seconds": float(settings.get("source_retry_backoff_seconds", 0.6) or 0.6),
-        "circuit_failure_threshold": int(settings.get("source_circuit_failure_threshold", 4) or 4),
-        "circuit_cooldown_seconds": float(settings.get("source_circuit_cooldown_seconds", 90.0) or 90.0),
-        "search_timeout_seconds": float(settings.get("source_search_timeout_seconds", 18.0) or 18.0),
-        "early_return_seconds": float(settings.get("source_early_return_seconds", 8.0) or 8.0),
-        "early_return_min_results": int(settings.get("source_early_return_min_results", 6) or 6),
-        "prefer_http_completion": bool(settings.get("source_prefer_http_completion", True)),
+        "max_retries": int(cfg["source_max_retries"] or 1),
+        "retry_backoff_seconds": float(cfg["source_retry_backoff_seconds"] or 0.6),
+        "circuit_failure_threshold": int(cfg["source_circuit_failure_threshold"] or 4),
+        "circuit_cooldown_seconds": float(cfg["source_circuit_cooldown_seconds"] or 90.0),
+        "search_timeout_seconds": float(cfg["source_search_timeout_seconds"] or 18.0),
+        "early_return_seconds": float(cfg["source_early_return_seconds"] or 8.0),
+        "early_return_min_results": int(cfg["source_early_return_min_results"] or 6),
+        "prefer_http_completion": bool(cfg["source_prefer_http_completion"]),
+        "source_max_inflight": int(cfg["source_max_inflight"] or 2),
     }
     source_manager = SourceManager(event_bus, reliability=reliability)
     download_manager = DownloadManager(realdebrid, event_bus, settings=settings)
@@ -5,11 +5,14 @@ import threading
 import time
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
+from pluggy.core import download_backends
+from pluggy.core.download_backends import NativeRequestsBackend
 from pluggy.core.download_manager import DownloadManager
 from pluggy.core.event_bus import EventBus
 from pluggy.core.settings_manager import SettingsManager
-from pluggy.models.download_job import JobStatus
+from pluggy.models.download_job import DownloadJob, JobStatus
 from pluggy.services.realdebrid_client import RealDebridClient
 
 
@@ -27,6 +30,38 @@ class BytesHandler(http.server.BaseHTTPRequestHandler):
         return
 
 
+class RangeHandler(http.server.BaseHTTPRequestHandler):
+    payload = bytes(range(256)) * 1024
+    range_requests = []
+
+    def _send_headers(self):
+        body = self.payload
+        status = 200
+        range_header = self.headers.get("Range", "")
+        if range_header.startswith("bytes="):
+            first, _, last = range_header[len("bytes="):].partition("-")
+            first = int(first)
+            last = int(last) if last else len(self.payload) - 1
+            body = self.payload[first:last + 1]
+            status = 206
+            self.range_requests.append((first, last))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        return body
+
+    def do_HEAD(self):
+        self._send_headers()
+
+    def do_GET(self):
+        self.wfile.write(self._send_headers())
+
+    def log_message(self, format, *args):
+        return
+
+
 class FakeUnavailableBackend:
     name = "aria2"
     def is_available(self):
@@ -65,6 +100,32 @@ class TestDownloadBackendAndRetry(unittest.TestCase):
 
             httpd.shutdown()
 
+    def test_native_segmented_download_reassembles_ranges(self):
+        with socketserver.ThreadingTCPServer(("127.0.0.1", 0), RangeHandler) as httpd:
+            port = httpd.server_address[1]
+            t = threading.Thread(target=httpd.serve_forever, daemon=True)
+            t.start()
+            RangeHandler.range_requests = []
+
+            with tempfile.TemporaryDirectory() as td, patch.object(download_backends, "SEGMENTED_MIN_SIZE", 1024):
+                out = Path(td) / "segmented.bin"
+                job = DownloadJob(job_id="seg", title="seg", output_path=out)
+                result = NativeRequestsBackend().download(
+                    job=job,
+                    url=f"http://127.0.0.1:{port}/seg.bin",
+                    emit_progress=lambda j: None,
+                    is_cancelled=lambda: False,
+                    is_paused=lambda: False,
+                    chunk_size=16384,
+                    segments=4,
+                )
+                self.assertTrue(result.completed)
+                self.assertEqual(out.read_bytes(), RangeHandler.payload)
+                self.assertEqual(len(RangeHandler.range_requests), 4)
+                self.assertEqual(job.downloaded_bytes, len(RangeHandler.payload))
+
+            httpd.shutdown()
+
     def test_retry_download_creates_new_job_from_error(self):
         settings = SettingsManager()
         bus = EventBus()
@@ -6,9 +6,10 @@ import time
 import unittest
 from pathlib import Path
 
-from pluggy.core.download_manager import DownloadManager
+from pluggy.core.download_manager import DownloadManager, ResizableSemaphore
 from pluggy.core.event_bus import EventBus, Events
 from pluggy.core.settings_manager import SettingsManager
+from pluggy.models.download_job import DownloadJob
 from pluggy.services.realdebrid_client import RealDebridClient
 
 
@@ -65,6 +66,69 @@ class TestDownloadManagerBasic(unittest.TestCase):
             self.assertIn(Events.DOWNLOAD_COMPLETED, events)
             self.assertIn(Events.DOWNLOAD_DELETED, events)
 
+    def test_progress_subscriber_can_cancel_and_shutdown_stops_emitter(self):
+        bus = EventBus()
+        dm = DownloadManager(RealDebridClient(SettingsManager(), bus), bus, max_concurrent=1)
+        events = []
+        bus.subscribe(Events.DOWNLOAD_CANCELLED, lambda d: events.append(Events.DOWNLOAD_CANCELLED))
+
+        def on_progress(data):
+            events.append(Events.DOWNLOAD_PROGRESS)
+            dm.cancel_download(data["job"].job_id)
+
+        bus.subscribe(Events.DOWNLOAD_PROGRESS, on_progress)
+        first = DownloadJob(job_id="j1", title="t", output_path=Path("unused.bin"))
+        second = DownloadJob(job_id="j2", title="t", output_path=Path("unused.bin"))
+        dm.jobs = {first.job_id: first, second.job_id: second}
+        dm._queue_progress(first)
+        time.sleep(0.2)
+        # The emitter survived the subscriber's cancel and still delivers progress.
+        dm._queue_progress(second)
+        time.sleep(0.2)
+        self.assertEqual(events, [Events.DOWNLOAD_PROGRESS, Events.DOWNLOAD_CANCELLED] * 2)
+
+        # Progress queued for a job that has since finished is never delivered.
+        dm._queue_progress(first)
+        time.sleep(0.1)
+        self.assertEqual(len(events), 4)
+
+        dm.shutdown()
+        dm._progress_thread.join(1.0)
+        self.assertFalse(dm._progress_thread.is_alive())
+
+    def test_shutdown_cancels_queued_jobs_with_events(self):
+        bus = EventBus()
+        dm = DownloadManager(RealDebridClient(SettingsManager(), bus), bus, max_concurrent=1)
+        cancelled = []
+        bus.subscribe(Events.DOWNLOAD_CANCELLED, lambda d: cancelled.append(d["job"].job_id))
+        dm._semaphore.acquire()  # keep every job waiting for a slot
+        with tempfile.TemporaryDirectory() as td:
+            jobs = [
+                dm.queue_download(title=f"q{i}", output_path=Path(td) / f"q{i}.bin", direct_url="http://127.0.0.1:9/x")
+                for i in range(3)
+            ]
+            dm.shutdown()
+            dm._semaphore.release()
+        self.assertEqual(sorted(cancelled), sorted(job.job_id for job in jobs))
+        self.assertTrue(all(job.status.value == "cancelled" for job in jobs))
+
+    def test_resizable_semaphore_shrink_does_not_leak_slots(self):
+        sem = ResizableSemaphore(2)
+        sem.acquire()
+        sem.acquire()
+        sem.resize(1)
+        acquired = threading.Event()
+
+        def waiter():
+            sem.acquire()
+            acquired.set()
+
+        threading.Thread(target=waiter, daemon=True).start()
+        sem.release()
+        self.assertFalse(acquired.wait(0.2))
+        sem.release()
+        self.assertTrue(acquired.wait(1.0))
+
 
 if __name__ == "__main__":
     unittest.main()
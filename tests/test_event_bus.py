@@ -0,0 +1,48 @@
+import unittest
+
+from pluggy.core.event_bus import EventBus
+
+
+class TestEventBus(unittest.TestCase):
+    def test_subscribers_are_immutable_tuples(self):
+        bus = EventBus()
+        cb = lambda data: None
+        bus.subscribe("evt", cb)
+        bus.subscribe("evt", cb)
+        self.assertEqual(bus._subscribers["evt"], (cb,))
+        bus.unsubscribe("evt", cb)
+        self.assertNotIn("evt", bus._subscribers)
+
+    def test_reentrant_changes_during_emit_apply_to_next_emit(self):
+        bus = EventBus()
+        calls = []
+
+        def late(data):
+            calls.append(("late", data))
+
+        def first(data):
+            calls.append(("first", data))
+            bus.unsubscribe("evt", first)
+            bus.subscribe("evt", late)
+
+        bus.subscribe("evt", first)
+        bus.emit("evt", 1)
+        bus.emit("evt", 2)
+        self.assertEqual(calls, [("first", 1), ("late", 2)])
+
+    def test_failing_handler_does_not_stop_dispatch(self):
+        bus = EventBus()
+        seen = []
+
+        def broken(data):
+            raise RuntimeError("boom")
+
+        bus.subscribe("evt", broken)
+        bus.subscribe("evt", seen.append)
+        with self.assertLogs("pluggy.core.event_bus", level="ERROR"):
+            bus.emit("evt", "payload")
+        self.assertEqual(seen, ["payload"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,6 @@
+import json
+import threading
+import time
 import unittest
 from unittest.mock import patch, Mock
 
@@ -11,12 +14,17 @@ class _Settings:
             "rd_client_id": "X245A4XAIBGVM",
             "rd_access_token": "token",
             "rd_refresh_token": "",
+            "rd_access_token_expires_at": 0.0,
             "rd_request_timeout_seconds": 9.0,
         }
 
     def get(self, key, default=None):
         return self.data.get(key, default)
 
+    def get_many(self, keys, defaults=None):
+        defaults = defaults or {}
+        return {key: self.data.get(key, defaults.get(key)) for key in keys}
+
     def set(self, key, value):
         self.data[key] = value
 
@@ -28,7 +36,7 @@ class TestRealDebridTimeouts(unittest.TestCase):
     def test_api_request_uses_default_timeout(self):
         client = RealDebridClient(_Settings(), EventBus())
         mock_response = Mock(status_code=200)
-        with patch("requests.request", return_value=mock_response) as req:
+        with patch.object(client._session, "request", return_value=mock_response) as req:
             client._api_request("GET", "user")
             self.assertTrue(req.called)
             kwargs = req.call_args.kwargs
@@ -37,11 +45,141 @@ class TestRealDebridTimeouts(unittest.TestCase):
     def test_api_request_honors_explicit_timeout(self):
         client = RealDebridClient(_Settings(), EventBus())
         mock_response = Mock(status_code=200)
-        with patch("requests.request", return_value=mock_response) as req:
+        with patch.object(client._session, "request", return_value=mock_response) as req:
             client._api_request("GET", "user", timeout=3.0)
             kwargs = req.call_args.kwargs
             self.assertEqual(kwargs.get("timeout"), 3.0)
 
+    def test_unrestrict_links_keeps_link_order(self):
+        client = RealDebridClient(_Settings(), EventBus())
+
+        def fake_request(method, endpoint, **kwargs):
+            link = kwargs["data"]["link"]
+            download = "" if link == "l2" else f"https://dl/{link}"
+            return Mock(status_code=200, content=json.dumps({"download": download}).encode())
+
+        with patch.object(client, "_api_request", side_effect=fake_request):
+            urls = client._unrestrict_links(["l0", "l1", "l2", "l3"])
+        self.assertEqual(urls, ["https://dl/l0", "https://dl/l1", "https://dl/l3"])
+
+    def test_instant_availability_is_cached(self):
+        client = RealDebridClient(_Settings(), EventBus())
+        payload = {"abc": {"rd": [{"1": {}}]}}
+        mock_response = Mock(status_code=200, content=json.dumps(payload).encode())
+        with patch.object(client, "_api_request", return_value=mock_response) as req:
+            self.assertTrue(client.check_instant_availability("ABC"))
+            self.assertTrue(client.check_instant_availability("abc"))
+        self.assertEqual(req.call_count, 1)
+
+    def test_exchange_rejected_after_concurrent_success_reports_success(self):
+        settings = _Settings()
+        settings.data["rd_device_code"] = "dev"
+        client = RealDebridClient(settings, EventBus())
+        credentials = Mock(status_code=200, content=json.dumps({"client_id": "cid", "client_secret": "sec"}).encode())
+        tokens = Mock(status_code=200, content=json.dumps({"access_token": "a", "refresh_token": "r"}).encode())
+        rejected = Mock(status_code=400, content=json.dumps({"error": "invalid_grant"}).encode())
+        with patch.object(client._session, "get", return_value=credentials), \
+                patch.object(client._session, "post", return_value=tokens):
+            self.assertEqual(client._attempt_device_exchange("dev")["status"], "success")
+        with patch.object(client._session, "get", return_value=rejected):
+            # The other caller's exchange of the same code is rejected by RealDebrid.
+            self.assertEqual(client._attempt_device_exchange("dev")["status"], "success")
+
+    def test_rejected_stale_code_fails_even_when_already_linked(self):
+        settings = _Settings()
+        # Already linked, and device auth was restarted with a newer code.
+        settings.data["rd_device_code"] = "newer"
+        client = RealDebridClient(settings, EventBus())
+        rejected = Mock(status_code=400, content=json.dumps({"error": "expired_token"}).encode())
+        with patch.object(client._session, "get", return_value=rejected):
+            self.assertEqual(client._attempt_device_exchange("older")["status"], "failed")
+
+    def _expiring_client(self):
+        settings = _Settings()
+        settings.data.update({
+            "rd_refresh_token": "refresh",
+            "rd_client_secret": "secret",
+            "rd_access_token_expires_at": time.time() + 5,
+        })
+        return settings, RealDebridClient(settings, EventBus())
+
+    def test_token_about_to_expire_is_refreshed_before_the_request(self):
+        settings, client = self._expiring_client()
+
+        def refresh():
+            settings.update({"rd_access_token": "fresh", "rd_access_token_expires_at": time.time() + 3600})
+            return True
+
+        with patch.object(client, "refresh_access_token", side_effect=refresh) as refresher, \
+                patch.object(client._session, "request", return_value=Mock(status_code=200)) as req:
+            client._api_request("GET", "user")
+            client._api_request("GET", "user")
+        self.assertEqual(refresher.call_count, 1)
+        self.assertEqual(req.call_args.kwargs["headers"]["Authorization"], "Bearer fresh")
+
+    def test_failed_refresh_is_not_retried_on_every_call(self):
+        settings, client = self._expiring_client()
+        with patch.object(client, "refresh_access_token", return_value=False) as refresher, \
+                patch.object(client._session, "request", return_value=Mock(status_code=200)) as req:
+            client._api_request("GET", "user")
+            client._api_request("GET", "user")
+        self.assertEqual(refresher.call_count, 1)
+        self.assertEqual(req.call_count, 2)
+        self.assertEqual(req.call_args.kwargs["headers"]["Authorization"], "Bearer token")
+
+    def test_unauthorized_reply_skips_refresh_when_token_already_replaced(self):
+        settings = _Settings()
+        client = RealDebridClient(settings, EventBus())
+
+        def request(method, url, headers=None, **kwargs):
+            if headers["Authorization"] == "Bearer token":
+                # A concurrent call refreshed while this one was in flight.
+                settings.data["rd_access_token"] = "fresh"
+                return Mock(status_code=401)
+            return Mock(status_code=200)
+
+        with patch.object(client, "refresh_access_token") as refresher, \
+                patch.object(client._session, "request", side_effect=request):
+            response = client._api_request("GET", "user")
+        self.assertEqual(response.status_code, 200)
+        refresher.assert_not_called()
+
+    def test_stop_polling_cancels_scheduled_poll(self):
+        client = RealDebridClient(_Settings(), EventBus())
+        self.addCleanup(client.close)
+        polled = threading.Event()
+
+        def exchange(device_code):
+            polled.set()
+            return {"status": "pending"}
+
+        with patch.object(client, "_attempt_device_exchange", side_effect=exchange) as attempt:
+            client._start_polling("dev", interval=1, expires_in=60)
+            self.assertTrue(polled.wait(2.0))
+            time.sleep(0.1)  # let the first poll schedule its follow-up
+            client.stop_polling()
+            time.sleep(1.3)
+        self.assertEqual(attempt.call_count, 1)
+
+    def test_slow_exchange_does_not_delay_other_polls(self):
+        client = RealDebridClient(_Settings(), EventBus())
+        self.addCleanup(client.close)
+        release = threading.Event()
+        fast_done = threading.Event()
+
+        def exchange(device_code):
+            if device_code == "slow":
+                release.wait(5.0)
+            else:
+                fast_done.set()
+            return {"status": "failed", "error": "stop"}
+
+        with patch.object(client, "_attempt_device_exchange", side_effect=exchange):
+            client._start_polling("slow", interval=1, expires_in=60)
+            client._start_polling("fast", interval=1, expires_in=60)
+            self.assertTrue(fast_done.wait(2.0))
+            release.set()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,241 @@
+import contextvars
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pluggy.core.request_context import SessionContext, set_session
+from pluggy.core.settings_manager import SettingsManager
+
+
+class _FakeStore:
+    def __init__(self):
+        self.profiles = {}
+        self.profile_reads = 0
+
+    def get_profile_settings(self, profile_id):
+        self.profile_reads += 1
+        return dict(self.profiles.get(profile_id) or {})
+
+    def set_profile_settings(self, profile_id, data):
+        self.profiles[profile_id] = dict(data)
+
+    def get_user_settings(self, user_id):
+        return {}
+
+    def set_user_settings(self, user_id, data):
+        pass
+
+
+class TestSettingsManager(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self._tmp.name)
+        self.download_dir = self.data_dir / "downloads"
+        env = patch.dict(os.environ, {"PLUGGY_DATA_DIR": str(self.data_dir)})
+        env.start()
+        self.addCleanup(env.stop)
+        self.addCleanup(self._tmp.cleanup)
+
+    def _manager(self) -> SettingsManager:
+        settings = SettingsManager()
+        self.addCleanup(settings.close)
+        settings.set("download_folder", str(self.download_dir))
+        settings.flush()
+        return settings
+
+    def _on_disk(self, settings: SettingsManager) -> dict:
+        return json.loads(settings.settings_file.read_text())
+
+    def test_set_is_debounced_until_flush(self):
+        settings = self._manager()
+        settings.set("pagination_size", 55)
+        settings.set("min_seeds", 7)
+        self.assertNotEqual(self._on_disk(settings).get("pagination_size"), 55)
+
+        settings.flush()
+        on_disk = self._on_disk(settings)
+        self.assertEqual(on_disk["pagination_size"], 55)
+        self.assertEqual(on_disk["min_seeds"], 7)
+
+    def test_debounce_timer_flushes_in_background(self):
+        settings = self._manager()
+        settings._flush_interval = 0.05
+        settings.set("pagination_size", 33)
+        timer = settings._flush_timer
+        self.assertIsNotNone(timer)
+        timer.join(1.0)
+        self.assertEqual(self._on_disk(settings)["pagination_size"], 33)
+
+    def test_close_flushes_and_cancels_pending_timer(self):
+        settings = self._manager()
+        settings.set("pagination_size", 44)
+        timer = settings._flush_timer
+        settings.close()
+        self.assertIsNone(settings._flush_timer)
+        self.assertTrue(timer.finished.is_set())
+        self.assertEqual(self._on_disk(settings)["pagination_size"], 44)
+
+    def test_in_place_edit_of_get_result_is_saved(self):
+        settings = self._manager()
+        enabled = settings.get("enabled_sources")
+        enabled["PirateBay"] = not enabled.get("PirateBay", False)
+        settings.set("enabled_sources", enabled)
+        settings.flush()
+        reloaded = SettingsManager()
+        self.addCleanup(reloaded.close)
+        self.assertEqual(reloaded.get("enabled_sources")["PirateBay"], enabled["PirateBay"])
+
+    def test_update_saves_nested_values_edited_in_place(self):
+        settings = self._manager()
+        values = settings.get_many(("od_seed_urls",))
+        values["od_seed_urls"].append("https://first.invalid/")
+        settings.update(values)
+        settings.flush()
+        # Edit the batch that was already passed in, then send it again.
+        values["od_seed_urls"].append("https://second.invalid/")
+        settings.update(values)
+        settings.flush()
+        self.assertIn("https://second.invalid/", self._on_disk(settings)["od_seed_urls"])
+
+    def test_flush_replaces_file_atomically(self):
+        settings = self._manager()
+        settings.set("ui_theme_pack", "caf\u00e9")
+        settings.flush()
+        self.assertEqual(self._on_disk(settings)["ui_theme_pack"], "caf\u00e9")
+        self.assertFalse(settings.settings_file.with_suffix(".json.tmp").exists())
+
+    def test_unchanged_values_skip_disk_writes(self):
+        settings = self._manager()
+        settings.set("pagination_size", settings.get("pagination_size"))
+        self.assertFalse(settings._dirty)
+        settings.update({"pagination_size": settings.get("pagination_size"), "min_seeds": settings.get("min_seeds")})
+        self.assertFalse(settings._dirty)
+
+        settings.set("pagination_size", 21)
+        settings.set("pagination_size", 20)
+        with patch("pluggy.core.settings_manager.os.replace") as replace:
+            settings.flush()
+        replace.assert_not_called()
+
+    def test_required_urls_merge_keeps_order_and_dedups(self):
+        settings = self._manager()
+        settings._settings["piratebay_api_endpoints"] = [" https://mirror.example ", "https://apibay.org", "", "https://mirror.example"]
+        changed = settings._merge_required_url_list(settings._settings, "piratebay_api_endpoints", settings.REQUIRED_PIRATEBAY_APIS)
+        self.assertTrue(changed)
+        self.assertEqual(settings._settings["piratebay_api_endpoints"], ["https://mirror.example", "https://apibay.org"])
+        self.assertFalse(settings._merge_required_url_list(settings._settings, "piratebay_api_endpoints", settings.REQUIRED_PIRATEBAY_APIS))
+
+    def test_required_check_short_circuits_until_relevant_key_changes(self):
+        settings = self._manager()
+        self.assertEqual(settings._settings[settings.REQUIRED_VERSION_KEY], settings.REQUIRED_SCHEMA_VERSION)
+        self.assertFalse(settings._ensure_required_source_urls(settings._settings))
+
+        settings.set("od_max_depth", 1)
+        self.assertNotIn(settings.REQUIRED_VERSION_KEY, settings._settings)
+        settings.flush()
+        reloaded = SettingsManager()
+        self.addCleanup(reloaded.close)
+        self.assertEqual(reloaded.get("od_max_depth"), 2)
+
+    def test_required_check_reports_no_change_for_stale_tag(self):
+        settings = self._manager()
+        data = dict(settings._settings)
+        data[settings.REQUIRED_VERSION_KEY] = settings.REQUIRED_SCHEMA_VERSION - 1
+        self.assertFalse(settings._ensure_required_source_urls(data))
+        data.pop(settings.REQUIRED_VERSION_KEY)
+        self.assertTrue(settings._ensure_required_source_urls(data))
+
+    def test_get_all_hides_schema_tag(self):
+        settings = self._manager()
+        self.assertNotIn(settings.REQUIRED_VERSION_KEY, settings.get_all())
+
+    def test_profile_settings_are_cached_across_requests(self):
+        store = _FakeStore()
+        settings = SettingsManager(store=store)
+        self.addCleanup(settings.close)
+        settings.set("download_folder", str(self.download_dir))
+        settings.flush()
+
+        def request(fn):
+            def run():
+                set_session(SessionContext(user_id=1, profile_id="p1"))
+                return fn()
+            return contextvars.copy_context().run(run)
+
+        request(lambda: settings.get("download_backend"))
+        request(lambda: settings.get("download_backend"))
+        self.assertEqual(store.profile_reads, 1)
+
+        request(lambda: settings.set("download_backend", "aria2"))
+        self.assertEqual(request(lambda: settings.get("download_backend")), "aria2")
+        self.assertEqual(store.profile_reads, 1)
+
+        store.profiles["p1"]["download_backend"] = "native"
+        settings.invalidate_profile("p1")
+        self.assertEqual(request(lambda: settings.get("download_backend")), "native")
+        self.assertEqual(store.profile_reads, 2)
+
+        first = request(settings.get_all)
+        self.assertIs(request(settings.get_all), first)
+        self.assertNotIn(settings.REQUIRED_VERSION_KEY, first)
+        with self.assertRaises(TypeError):
+            first["download_backend"] = "aria2"
+
+    def test_profile_cache_is_not_edited_through_returned_values(self):
+        store = _FakeStore()
+        settings = SettingsManager(store=store)
+        self.addCleanup(settings.close)
+
+        def request(fn):
+            def run():
+                set_session(SessionContext(user_id=1, profile_id="p1"))
+                return fn()
+            return contextvars.copy_context().run(run)
+
+        before = request(lambda: settings.get("enabled_sources"))
+        request(settings.get_all)["enabled_sources"]["PirateBay"] = "edited"
+
+        def failing_toggle():
+            enabled = settings.get("enabled_sources")
+            enabled["PirateBay"] = not before.get("PirateBay", False)
+            with patch.object(store, "set_profile_settings", side_effect=RuntimeError("db down")):
+                settings.set("enabled_sources", enabled)
+
+        with self.assertRaises(RuntimeError):
+            request(failing_toggle)
+        self.assertEqual(request(lambda: settings.get("enabled_sources")), before)
+        self.assertEqual(store.profiles["p1"]["enabled_sources"], before)
+
+    def test_instances_do_not_share_mutable_defaults(self):
+        settings = self._manager()
+        for key in SettingsManager._MUTABLE_DEFAULT_KEYS:
+            self.assertIsNot(settings._settings[key], SettingsManager.DEFAULT_SETTINGS[key])
+        before = list(SettingsManager.DEFAULT_SETTINGS["od_seed_urls"])
+        settings._settings["od_seed_urls"].append("https://example.invalid/")
+        self.assertEqual(SettingsManager.DEFAULT_SETTINGS["od_seed_urls"], before)
+
+    def test_suhr_seeds_are_rewritten_to_http_and_deduped(self):
+        settings = self._manager()
+        data = {"od_seed_urls": ["HTTPS://suhr.ir/a/", "http://suhr.ir/a/", "https://other.example/"]}
+        self.assertTrue(settings._ensure_required_source_urls(data))
+        seeds = data["od_seed_urls"]
+        self.assertEqual(seeds.count("http://suhr.ir/a/"), 1)
+        self.assertNotIn("HTTPS://suhr.ir/a/", seeds)
+        self.assertIn("https://other.example/", seeds)
+
+    def test_get_many_matches_individual_gets(self):
+        settings = self._manager()
+        keys = ("download_backend", "download_folder", "missing_key")
+        values = settings.get_many(keys, {"missing_key": 7})
+        self.assertEqual(values, {
+            "download_backend": settings.get("download_backend"),
+            "download_folder": settings.get("download_folder"),
+            "missing_key": 7,
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
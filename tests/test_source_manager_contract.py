@@ -1,6 +1,6 @@
 import unittest
 
-from pluggy.core.event_bus import EventBus
+from pluggy.core.event_bus import EventBus, Events
 from pluggy.core.source_manager import SourceManager
 from pluggy.models.search_result import SearchResult
 from pluggy.sources.base import BaseSource
@@ -21,6 +21,10 @@ class DummySource(BaseSource):
         )]
 
 
+class OtherDummySource(DummySource):
+    name = "OtherDummy"
+
+
 class TestSourceManagerContract(unittest.TestCase):
     def test_register_requires_basesource(self):
         sm = SourceManager(EventBus())
@@ -41,6 +45,26 @@ class TestSourceManagerContract(unittest.TestCase):
         self.assertEqual(results[0].source, "Dummy")
         self.assertTrue(len(results[0].link_candidates) >= 1)
 
+    def test_progress_always_ends_with_final_tick(self):
+        bus = EventBus()
+        sm = SourceManager(bus)
+        sm.register(DummySource())
+        sm.register(OtherDummySource())
+        ticks = []
+        bus.subscribe(Events.SEARCH_PROGRESS, ticks.append)
+        sm.search("hello", page=1, per_page=10, filters={"wait_for_all_sources": True})
+        self.assertTrue(1 <= len(ticks) <= 2)
+        self.assertEqual(ticks[-1]["completed"], 2)
+        self.assertEqual(ticks[-1]["total"], 2)
+
+    def test_register_keeps_source_owned_session(self):
+        sm = SourceManager(EventBus())
+        src = DummySource()
+        own = object()
+        src.session = own
+        sm.register(src)
+        self.assertIs(src.session, own)
+
 
 if __name__ == "__main__":
     unittest.main()
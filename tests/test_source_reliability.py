@@ -1,3 +1,5 @@
+import threading
+import time
 import unittest
 
 from pluggy.core.event_bus import EventBus, Events
@@ -38,6 +40,25 @@ class AlwaysFailSource(BaseSource):
         raise RuntimeError("hard fail")
 
 
+class BlockingSource(BaseSource):
+    name = "Blocking"
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def search(self, query: str, page: int = 1):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        self.release.wait(5)
+        with self.lock:
+            self.active -= 1
+        return []
+
+
 class TestSourceReliability(unittest.TestCase):
     def test_retry_recovers_transient_failure(self):
         sm = SourceManager(EventBus(), reliability={
@@ -78,6 +99,27 @@ class TestSourceReliability(unittest.TestCase):
         self.assertIn("AlwaysFail", warnings)
         self.assertIn("Circuit open", warnings["AlwaysFail"])
 
+    def test_source_inflight_is_bounded(self):
+        sm = SourceManager(EventBus(), reliability={
+            "search_timeout_seconds": 5.0,
+            "source_max_inflight": 2,
+        })
+        src = BlockingSource()
+        sm.register(src)
+        calls = [sm._executor.submit(sm._safe_search, src, f"q{i}", 1) for i in range(4)]
+        try:
+            for _ in range(50):
+                if src.active >= 2:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(src.active, 2)
+        finally:
+            src.release.set()
+        for call in calls:
+            self.assertTrue(call.result(timeout=5)[4])
+        self.assertEqual(src.peak, 2)
+        sm.shutdown()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,8 @@
+import threading
 import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
 
 from pluggy.core.event_bus import EventBus, Events
 from pluggy.core.source_manager import SourceManager
@@ -30,6 +33,19 @@ class FastSource(BaseSource):
         )]
 
 
+class BlockingSource(BaseSource):
+    def __init__(self, name, release, calls):
+        super().__init__()
+        self.name = name
+        self._release = release
+        self._calls = calls
+
+    def search(self, query: str, page: int = 1):
+        self._calls.append(self.name)
+        self._release.wait(5.0)
+        return []
+
+
 class TestSourceTimeout(unittest.TestCase):
     def test_search_returns_when_one_source_hangs(self):
         bus = EventBus()
@@ -57,6 +73,28 @@ class TestSourceTimeout(unittest.TestCase):
         self.assertIn("SlowSource", warnings)
         self.assertIn("timed out", warnings["SlowSource"].lower())
 
+    def test_sources_not_started_by_deadline_never_run(self):
+        sm = SourceManager(EventBus(), reliability={
+            "max_retries": 0,
+            "retry_backoff_seconds": 0.0,
+            "search_timeout_seconds": 0.3,
+        })
+        release = threading.Event()
+        calls = []
+        sm.register(BlockingSource("BlockA", release, calls))
+        sm.register(BlockingSource("BlockB", release, calls))
+        sm._executor.shutdown(wait=False)
+        sm._executor = ThreadPoolExecutor(max_workers=1)
+        # Bookkeeping is deferred; cancellation must not depend on it.
+        sm._janitor = MagicMock()
+
+        sm.search("demo", page=1, per_page=10, filters={"enabled_sources": ["BlockA", "BlockB"]})
+        release.set()
+        sm._executor.shutdown(wait=True)
+
+        self.assertEqual(len(calls), 1)
+        sm._janitor.submit.assert_called_once()
+
 
 if __name__ == "__main__":
     unittest.main()